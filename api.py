@@ -4,15 +4,38 @@ FastAPI application for Google Shopping scraper.
 Returns JSON data instead of saving to file.
 """
 
+import asyncio
+import json
 import logging
 import sys
-from datetime import datetime
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, closing
+from datetime import datetime, timedelta
 from typing import List, Optional
 
 from fastapi import FastAPI, HTTPException, Query
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 
-from google_shopping_scraper.scraper import GoogleShoppingScraper
+from google_shopping_scraper.cache import ResultCache
+from google_shopping_scraper.chromedriver import ChromeDriverNotFoundError
+from google_shopping_scraper.conf import google_shopping_scraper_settings
+from google_shopping_scraper.metrics import scraper_metrics
+from google_shopping_scraper.pool import (
+    BrowserPool,
+    BrowserPoolClosedError,
+    BrowserPoolTimeoutError,
+)
+from google_shopping_scraper.scraper import (
+    BlockedPageError,
+    ConsentFormAcceptError,
+    DriverGetShoppingDataError,
+    DriverInitializationError,
+    GoogleShoppingScraper,
+)
 
 
 # Pydantic models for API responses
@@ -31,23 +54,38 @@ class ShoppingResponse(BaseModel):
     scraped_at: str
     total_items: int
     items: List[ShoppingItem]
+    cached: bool = False
+    cache_age_seconds: Optional[float] = None
 
 
-# FastAPI app
-app = FastAPI(
-    title="Google Shopping Scraper API",
-    description="API for scraping Google Shopping data and returning JSON results",
-    version="1.0.0"
-)
+# Global pool of warm browser sessions for reuse between requests
+_browser_pool = None
+_browser_pool_lock = threading.Lock()  # Scrape workers and the warm-up thread create the pool concurrently
+_pool_warm_up = None  # Future of the background warm-up of the pool on startup
+_pool_health_checks = None  # Task periodically replacing crashed idle sessions of the pool
 
-# Global scraper instance for browser session reuse
-_global_scraper = None
+# Worker threads for blocking Selenium scrapes, so the event loop stays responsive
+_scrape_executor = None
+_pending_scrapes = 0  # Running + queued scrapes, only touched from the event loop
+
+
+# Cache of scrape results keyed by normalized query and scrape options
+_result_cache = ResultCache()
+_refresh_tasks = set()  # Running stale-while-revalidate refresh tasks
+_refresh_keys = set()  # Cache keys currently being refreshed
+
+# In-flight scrapes by cache key, shared by concurrent requests for the same query
+_inflight_scrapes = {}
+
+
+class ScrapeQueueFullError(BaseException):
+    message = "Too many scrape requests in progress, try again later."
 
 
 def setup_logging():
     """Setup logging configuration"""
     import os
-    
+
     # Create debug directory if it doesn't exist
     debug_dir = "debug"
     if not os.path.exists(debug_dir):
@@ -64,6 +102,265 @@ def setup_logging():
     return logging.getLogger(__name__)
 
 
+def get_browser_pool() -> BrowserPool:
+    """Returns the global browser pool, creating it if needed"""
+    global _browser_pool
+    
+    pool = _browser_pool
+    if pool is None:
+        with _browser_pool_lock:
+            if _browser_pool is None:
+                _browser_pool = BrowserPool(logger=logging.getLogger(__name__))
+            pool = _browser_pool
+    return pool
+
+
+def release_browser_pool() -> Optional[BrowserPool]:
+    """Detaches the global browser pool so that the next request creates a new one. Returns the detached pool."""
+    global _browser_pool
+    
+    with _browser_pool_lock:
+        pool, _browser_pool = _browser_pool, None
+    return pool
+
+
+def use_browser_pool(keep_browser: bool, headless: bool, logger: logging.Logger) -> bool:
+    """Whether a scrape runs on a pooled session, which only serves scrapes with the browser options of the pool"""
+    if not keep_browser:
+        return False
+    if headless != get_browser_pool().headless:
+        logger.info("Pooled browser sessions do not match the requested headless mode, launching a dedicated browser")
+        return False
+    return True
+
+
+def get_scrape_executor() -> ThreadPoolExecutor:
+    """Returns the global scrape executor, creating it if needed"""
+    global _scrape_executor
+    
+    if _scrape_executor is None:
+        _scrape_executor = ThreadPoolExecutor(
+            max_workers=google_shopping_scraper_settings.api_max_workers,
+            thread_name_prefix="scrape",
+        )
+    return _scrape_executor
+
+
+def scrape_queue_full() -> bool:
+    """Whether all scrape workers are busy and the queue limit is reached"""
+    settings = google_shopping_scraper_settings
+    return _pending_scrapes >= settings.api_max_workers + settings.api_max_queued
+
+
+async def run_in_scrape_executor(func, *args):
+    """
+    Runs a blocking scrape function on the scrape executor.
+
+    Raises:
+        ScrapeQueueFullError: If all workers are busy and the queue limit is reached.
+    """
+    global _pending_scrapes
+    
+    if scrape_queue_full():
+        raise ScrapeQueueFullError
+    
+    _pending_scrapes += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_scrape_executor(), func, *args)
+    finally:
+        _pending_scrapes -= 1
+
+
+def scrape_items(query: str, headless: bool, fast: bool, keep_browser: bool, max_items: int, max_pages: int, logger: logging.Logger):
+    """Blocking scrape of a query, run on a worker thread"""
+    if use_browser_pool(keep_browser, headless, logger):
+        # Check out a warm browser session from the pool
+        with get_browser_pool().session() as scraper:
+            scraper.fast_mode = fast
+            return scraper.get_shopping_data_for_query(query, headless=headless, max_items=max_items, max_pages=max_pages)
+    
+    # Create new scraper instance for this request
+    scraper = GoogleShoppingScraper(logger=logger, fast_mode=fast, keep_browser_open=False)
+    return scraper.get_shopping_data_for_query(query, headless=headless, max_items=max_items, max_pages=max_pages)
+
+
+def stream_items(query: str, headless: bool, fast: bool, keep_browser: bool, max_items: int, max_pages: int, logger: logging.Logger, on_item, stop: threading.Event):
+    """Blocking streaming scrape of a query, run on a worker thread. Stops scrolling once stop is set."""
+    def consume(scraper: GoogleShoppingScraper):
+        items = []
+        # Closing the generator stops the scrape and releases the browser before it goes back to the pool
+        with closing(scraper.iter_shopping_data(query, headless=headless, max_items=max_items, max_pages=max_pages)) as item_iter:
+            for item in item_iter:
+                items.append(item)
+                on_item(item)
+                if stop.is_set():
+                    logger.info(f"Stream consumer went away, stopping scrape for query '{query}'")
+                    break
+        return items
+    
+    if use_browser_pool(keep_browser, headless, logger):
+        with get_browser_pool().session() as scraper:
+            scraper.fast_mode = fast
+            return consume(scraper)
+    
+    return consume(GoogleShoppingScraper(logger=logger, fast_mode=fast, keep_browser_open=False))
+
+
+async def coalesced_scrape(cache_key, query: str, headless: bool, fast: bool, keep_browser: bool, max_items: int, max_pages: int, logger: logging.Logger):
+    """Scrape a query, joining an identical scrape that is already in flight instead of starting another"""
+    future = _inflight_scrapes.get(cache_key)
+    if future is not None:
+        logger.info(f"Joining in-flight scrape for query: '{query}'")
+    else:
+        future = asyncio.ensure_future(
+            run_in_scrape_executor(scrape_items, query, headless, fast, keep_browser, max_items, max_pages, logger)
+        )
+        _inflight_scrapes[cache_key] = future
+        
+        def forget(done_future):
+            if _inflight_scrapes.get(cache_key) is done_future:
+                del _inflight_scrapes[cache_key]
+        
+        future.add_done_callback(forget)
+    
+    # Shield the shared scrape so one disconnecting client does not cancel it for the others
+    return await asyncio.shield(future)
+
+
+def build_response(query: str, items, cache_age: Optional[float] = None) -> ShoppingResponse:
+    """Convert scraped items to the API response format"""
+    items_data = []
+    for item in items:
+        item_dict = ShoppingItem(
+            title=item.title,
+            price=item.price,
+            delivery_price=item.delivery_price,
+            review=item.review,
+            url=item.url,
+            image_url=item.image_url,
+            saved_image_path=item.saved_image_path
+        )
+        items_data.append(item_dict)
+    
+    scraped_at = datetime.now()
+    if cache_age is not None:
+        scraped_at -= timedelta(seconds=cache_age)
+    
+    return ShoppingResponse(
+        query=query,
+        scraped_at=scraped_at.isoformat(),
+        total_items=len(items_data),
+        items=items_data,
+        cached=cache_age is not None,
+        cache_age_seconds=round(cache_age, 3) if cache_age is not None else None
+    )
+
+
+def encode_stream_record(record: dict, stream_format: str) -> str:
+    """Encode a stream record as an NDJSON line or a Server-Sent Event"""
+    data = json.dumps(record, ensure_ascii=False)
+    if stream_format == "sse":
+        return f"event: {record['type']}\ndata: {data}\n\n"
+    return f"{data}\n"
+
+
+def schedule_cache_refresh(cache_key, query: str, headless: bool, fast: bool, keep_browser: bool, max_items: int, max_pages: int, logger: logging.Logger) -> None:
+    """Refresh a stale cache entry in the background, at most once per key at a time"""
+    if cache_key in _refresh_keys:
+        return
+    
+    async def refresh():
+        try:
+            items = await coalesced_scrape(cache_key, query, headless, fast, keep_browser, max_items, max_pages, logger)
+            if items:
+                _result_cache.set(cache_key, items)
+                logger.info(f"Refreshed cached results for query: '{query}'")
+        except (ScrapeQueueFullError, BrowserPoolTimeoutError, BrowserPoolClosedError, BlockedPageError, ChromeDriverNotFoundError,
+                ConsentFormAcceptError, DriverInitializationError, DriverGetShoppingDataError) as e:
+            logger.warning(f"Background refresh failed for query '{query}': {e.message}")
+        except Exception as e:
+            logger.warning(f"Background refresh failed for query '{query}': {e}")
+        finally:
+            _refresh_keys.discard(cache_key)
+    
+    _refresh_keys.add(cache_key)
+    task = asyncio.create_task(refresh())
+    _refresh_tasks.add(task)
+    task.add_done_callback(_refresh_tasks.discard)
+
+
+def warm_up_browser_pool(logger: logging.Logger) -> None:
+    """Pre-launches the consent-ready sessions of the browser pool, run on a worker thread"""
+    try:
+        get_browser_pool().start()
+    except ChromeDriverNotFoundError as e:
+        logger.warning(f"Could not pre-launch browser pool, sessions will be launched on demand: {e.message}")
+    except Exception as e:
+        logger.warning(f"Could not pre-launch browser pool, sessions will be launched on demand: {e}")
+
+
+async def health_check_browser_pool(interval: float, logger: logging.Logger) -> None:
+    """Replaces crashed idle sessions of the browser pool every interval seconds, until cancelled"""
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(interval)
+        pool = _browser_pool
+        if pool is None:
+            continue
+        try:
+            # Probing and relaunching browsers blocks, so it runs on a worker thread
+            await loop.run_in_executor(None, pool.health_check)
+        except (ChromeDriverNotFoundError, ConsentFormAcceptError, DriverInitializationError) as e:
+            logger.warning(f"Browser pool health check failed: {e.message}")
+        except Exception as e:
+            logger.warning(f"Browser pool health check failed: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Pre-launch warm browser sessions in the background on startup, keep replacing crashed ones
+    and close them on shutdown
+    """
+    global _scrape_executor, _pool_warm_up, _pool_health_checks
+    
+    logger = setup_logging()
+    # Launching Chrome blocks for seconds, so the pool is warmed on a worker thread while requests are served
+    _pool_warm_up = asyncio.get_running_loop().run_in_executor(None, warm_up_browser_pool, logger)
+    interval = google_shopping_scraper_settings.pool_health_check_interval
+    if interval > 0:
+        _pool_health_checks = asyncio.create_task(health_check_browser_pool(interval, logger))
+    
+    yield
+    
+    if _pool_health_checks:
+        _pool_health_checks.cancel()
+        try:
+            await _pool_health_checks
+        except asyncio.CancelledError:
+            pass
+        _pool_health_checks = None
+    # A closed pool stops warming up once the session being launched is ready, and then closes it.
+    # The pool is only detached after the warm-up, so that the warm-up cannot create another one.
+    get_browser_pool().close()
+    await _pool_warm_up
+    _pool_warm_up = None
+    release_browser_pool()
+    if _scrape_executor:
+        _scrape_executor.shutdown(wait=False, cancel_futures=True)
+        _scrape_executor = None
+
+
+# FastAPI app
+app = FastAPI(
+    title="Google Shopping Scraper API",
+    description="API for scraping Google Shopping data and returning JSON results",
+    version="1.0.0",
+    lifespan=lifespan
+)
+
+
 @app.get("/")
 async def root():
     """Root endpoint with API information"""
@@ -72,6 +369,10 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "/scrape": "POST - Scrape Google Shopping for a query",
+            "/scrape/stream": "GET - Stream items as NDJSON or Server-Sent Events while scraping",
+            "/pool": "GET - Browser session pool occupancy",
+            "/cache": "GET - Result cache statistics, DELETE - Clear the result cache",
+            "/metrics": "GET - Prometheus metrics for scrape phases",
             "/docs": "GET - API documentation"
         }
     }
@@ -82,7 +383,10 @@ async def scrape_google_shopping(
     query: str = Query(..., description="Search query for Google Shopping"),
     headless: bool = Query(True, description="Run browser in headless mode"),
     fast: bool = Query(False, description="Enable fast mode for quicker scraping"),
-    keep_browser: bool = Query(False, description="Keep browser open between requests")
+    keep_browser: bool = Query(True, description="Use a warm browser session from the pool"),
+    use_cache: bool = Query(True, description="Serve recent results for the same query from the cache"),
+    max_items: int = Query(google_shopping_scraper_settings.max_items, ge=1, le=200, description="Maximum number of items to return"),
+    max_pages: int = Query(google_shopping_scraper_settings.max_pages, ge=1, le=10, description="Maximum number of results pages to follow")
 ):
     """
     Scrape Google Shopping for the given query and return JSON results.
@@ -91,7 +395,11 @@ async def scrape_google_shopping(
         query: Search query for Google Shopping
         headless: Whether to run browser in headless mode (default: True)
         fast: Whether to enable fast mode for quicker scraping (default: False)
-        keep_browser: Whether to keep browser open between requests (default: False)
+        keep_browser: Whether to use a warm browser session from the pool instead of launching a new browser (default: True).
+            Pooled sessions are headless, so headed requests (headless=False) always launch their own browser.
+        use_cache: Whether to serve recent results for the same query from the cache (default: True)
+        max_items: Maximum number of items to return (default: from settings)
+        max_pages: Maximum number of results pages to follow with start= pagination (default: from settings)
     
     Returns:
         JSON response with scraped shopping data
@@ -102,79 +410,207 @@ async def scrape_google_shopping(
     logger.info(f"Headless mode: {headless}")
     logger.info(f"Fast mode: {fast}")
     logger.info(f"Keep browser open: {keep_browser}")
+    logger.info(f"Max items: {max_items}, max pages: {max_pages}")
+    
+    cache_key = ResultCache.make_key(query, google_shopping_scraper_settings.region, fast, headless, max_items, max_pages)
+    
+    if use_cache:
+        entry = _result_cache.get(cache_key)
+        if entry is not None:
+            if _result_cache.is_stale(entry):
+                logger.info(f"Serving stale cached results for query '{query}' while refreshing")
+                schedule_cache_refresh(cache_key, query, headless, fast, keep_browser, max_items, max_pages, logger)
+            else:
+                logger.info(f"Serving cached results for query '{query}'")
+            return build_response(query, entry.items, cache_age=entry.age)
     
     try:
-        # Use global scraper instance if keep_browser is enabled
-        global _global_scraper
-        
-        if keep_browser:
-            if _global_scraper is None:
-                logger.info("Creating global scraper instance with browser session management")
-                _global_scraper = GoogleShoppingScraper(logger=logger, fast_mode=fast, keep_browser_open=True)
-            scraper = _global_scraper
-        else:
-            # Create new scraper instance for this request
-            scraper = GoogleShoppingScraper(logger=logger, fast_mode=fast, keep_browser_open=False)
-        
-        # Scrape data
-        items = scraper.get_shopping_data_for_query(query, headless=headless)
+        # Scrape data on a worker thread, sharing it with concurrent requests for the same query
+        items = await coalesced_scrape(cache_key, query, headless, fast, keep_browser, max_items, max_pages, logger)
         
         if not items:
             logger.warning("No items found!")
-            return ShoppingResponse(
-                query=query,
-                scraped_at=datetime.now().isoformat(),
-                total_items=0,
-                items=[]
-            )
-        
-        # Convert to API response format
-        items_data = []
-        for item in items:
-            item_dict = ShoppingItem(
-                title=item.title,
-                price=item.price,
-                delivery_price=item.delivery_price,
-                review=item.review,
-                url=item.url,
-                image_url=item.image_url,
-                saved_image_path=item.saved_image_path
-            )
-            items_data.append(item_dict)
+            return build_response(query, [])
         
-        # Create response data
-        response_data = ShoppingResponse(
-            query=query,
-            scraped_at=datetime.now().isoformat(),
-            total_items=len(items_data),
-            items=items_data
-        )
+        # Empty results are not cached as they usually mean the scrape was blocked
+        _result_cache.set(cache_key, items)
         
         logger.info(f"Successfully scraped {len(items)} items for API response")
         
-        return response_data
+        return build_response(query, items)
         
+    except ScrapeQueueFullError:
+        logger.error("Scrape queue is full, rejecting request")
+        raise HTTPException(status_code=503, detail=ScrapeQueueFullError.message)
+    except BrowserPoolTimeoutError:
+        logger.error("No browser session available in the pool")
+        raise HTTPException(status_code=503, detail=BrowserPoolTimeoutError.message)
+    except BrowserPoolClosedError:
+        logger.error("Browser pool was closed during the request")
+        raise HTTPException(status_code=503, detail=BrowserPoolClosedError.message)
+    except BlockedPageError:
+        logger.error("Google blocked the scrape with a CAPTCHA page")
+        raise HTTPException(status_code=503, detail=BlockedPageError.message)
+    except (ChromeDriverNotFoundError, ConsentFormAcceptError, DriverInitializationError, DriverGetShoppingDataError) as e:
+        logger.error(f"Error during scraping: {e.message}")
+        raise HTTPException(status_code=500, detail=f"Error during scraping: {e.message}")
     except Exception as e:
         logger.error(f"Error during scraping: {e}")
         raise HTTPException(status_code=500, detail=f"Error during scraping: {str(e)}")
 
 
+@app.get("/scrape/stream")
+async def stream_google_shopping(
+    query: str = Query(..., description="Search query for Google Shopping"),
+    headless: bool = Query(True, description="Run browser in headless mode"),
+    fast: bool = Query(False, description="Enable fast mode for quicker scraping"),
+    keep_browser: bool = Query(True, description="Use a warm browser session from the pool"),
+    use_cache: bool = Query(True, description="Serve recent results for the same query from the cache"),
+    max_items: int = Query(google_shopping_scraper_settings.max_items, ge=1, le=200, description="Maximum number of items to stream"),
+    max_pages: int = Query(google_shopping_scraper_settings.max_pages, ge=1, le=10, description="Maximum number of results pages to follow"),
+    format: str = Query("ndjson", pattern="^(ndjson|sse)$", description="Stream format: ndjson or sse")
+):
+    """
+    Scrape Google Shopping for the given query, streaming each item as soon as it is extracted.
+    
+    Emits one {"type": "item"} record per product and ends with a {"type": "summary"} record,
+    or an {"type": "error"} record if the scrape failed after streaming started.
+    
+    Scrapes run on a warm session from the pool by default (keep_browser=True). Pooled sessions are
+    headless, so headed requests (headless=False) always launch their own browser.
+    """
+    logger = setup_logging()
+    logger.info(f"API stream request - Starting Google Shopping scraper for query: '{query}'")
+    
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    cache_key = ResultCache.make_key(query, google_shopping_scraper_settings.region, fast, headless, max_items, max_pages)
+    started = time.monotonic()
+    
+    def item_record(rank: int, item) -> dict:
+        return {"type": "item", "rank": rank, "item": ShoppingItem(**item.model_dump()).model_dump()}
+    
+    def summary_record(total_items: int, cache_age: Optional[float] = None) -> dict:
+        return {
+            "type": "summary",
+            "query": query,
+            "scraped_at": datetime.now().isoformat(),
+            "total_items": total_items,
+            "duration_seconds": round(time.monotonic() - started, 3),
+            "cached": cache_age is not None,
+            "cache_age_seconds": round(cache_age, 3) if cache_age is not None else None,
+        }
+    
+    if use_cache:
+        entry = _result_cache.get(cache_key)
+        if entry is not None and not _result_cache.is_stale(entry):
+            logger.info(f"Streaming cached results for query '{query}'")
+            
+            async def cached_records():
+                for rank, item in enumerate(entry.items, 1):
+                    yield encode_stream_record(item_record(rank, item), format)
+                yield encode_stream_record(summary_record(len(entry.items), entry.age), format)
+            
+            return StreamingResponse(cached_records(), media_type=media_type)
+    
+    if scrape_queue_full():
+        logger.error("Scrape queue is full, rejecting request")
+        raise HTTPException(status_code=503, detail=ScrapeQueueFullError.message)
+    
+    # Items are handed from the worker thread to the event loop as they are extracted
+    loop = asyncio.get_running_loop()
+    item_queue = asyncio.Queue()
+    
+    def on_item(item):
+        loop.call_soon_threadsafe(item_queue.put_nowait, item)
+    
+    def on_done(future):
+        # Mark the exception as retrieved in case the client disconnected early
+        if not future.cancelled():
+            future.exception()
+        item_queue.put_nowait(None)
+    
+    stop = threading.Event()
+    scrape = asyncio.ensure_future(
+        run_in_scrape_executor(stream_items, query, headless, fast, keep_browser, max_items, max_pages, logger, on_item, stop)
+    )
+    scrape.add_done_callback(on_done)
+    
+    async def records():
+        streamed = 0
+        try:
+            while True:
+                item = await item_queue.get()
+                if item is None:
+                    break
+                streamed += 1
+                yield encode_stream_record(item_record(streamed, item), format)
+        finally:
+            # Stops the scrape early if the client disconnected
+            stop.set()
+        
+        try:
+            items = scrape.result()
+        except (ScrapeQueueFullError, BrowserPoolTimeoutError, BrowserPoolClosedError, BlockedPageError) as e:
+            yield encode_stream_record({"type": "error", "status_code": 503, "detail": e.message}, format)
+            return
+        except (ChromeDriverNotFoundError, ConsentFormAcceptError, DriverInitializationError, DriverGetShoppingDataError) as e:
+            logger.error(f"Error during scraping: {e.message}")
+            yield encode_stream_record({"type": "error", "status_code": 500, "detail": f"Error during scraping: {e.message}"}, format)
+            return
+        except Exception as e:
+            logger.error(f"Error during scraping: {e}")
+            yield encode_stream_record({"type": "error", "status_code": 500, "detail": f"Error during scraping: {str(e)}"}, format)
+            return
+        
+        if items:
+            _result_cache.set(cache_key, items)
+        logger.info(f"Successfully streamed {streamed} items for query '{query}'")
+        yield encode_stream_record(summary_record(streamed), format)
+    
+    return StreamingResponse(records(), media_type=media_type)
+
+
 @app.post("/cleanup")
 async def cleanup_browser():
     """
-    Cleanup the global browser session.
+    Cleanup the pooled browser sessions.
     Useful when you're done with scraping and want to free resources.
     """
-    global _global_scraper
-    
-    if _global_scraper:
-        _global_scraper.close_browser()
-        _global_scraper = None
-        return {"message": "Browser session cleaned up successfully"}
+    pool = release_browser_pool()
+    if pool:
+        pool.close()
+        return {"message": "Browser sessions cleaned up successfully"}
     else:
         return {"message": "No active browser session to cleanup"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Per-phase scrape latency histograms and scrape counters in Prometheus text format"""
+    return PlainTextResponse(scraper_metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/cache")
+async def result_cache_stats():
+    """Returns hit/miss counters and occupancy of the result cache"""
+    return _result_cache.stats()
+
+
+@app.delete("/cache")
+async def clear_result_cache():
+    """Removes all cached results"""
+    _result_cache.clear()
+    return {"message": "Result cache cleared"}
+
+
+@app.get("/pool")
+async def browser_pool_stats():
+    """Returns the occupancy of the browser session pool"""
+    if _browser_pool is None:
+        return {"message": "Browser pool not started"}
+    return _browser_pool.stats()
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Offline extraction benchmark over recorded Google Shopping pages.
+
+Replays saved result pages (as written by the scraper's debug snapshots) from a local HTTP server
+through every extraction path and reports latency, WebDriver round trips and items/sec as JSON.
+"""
+
+import argparse
+import glob
+import json
+import logging
+import os
+import platform
+import re
+import sys
+import threading
+import time
+
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from google_shopping_scraper.conf import google_shopping_scraper_settings
+from google_shopping_scraper.metrics import percentile
+from google_shopping_scraper.scraper import GoogleShoppingScraper
+from google_shopping_scraper.snapshots import SNAPSHOT_PREFIX
+
+
+# Extraction paths: name -> (extraction mode of the scraper, method extracting from a loaded page)
+EXTRACTION_PATHS = {
+    "webdriver": ("webdriver", lambda scraper, driver: scraper._smart_scroll_and_extract(driver)),
+    "javascript": ("javascript", lambda scraper, driver: scraper._smart_scroll_and_extract(driver)),
+    "html": ("html", lambda scraper, driver: scraper._extract_items_from_page_source(driver)),
+    "fallback_webdriver": ("webdriver", lambda scraper, driver: scraper._fallback_extract_with_webdriver(driver)),
+    "fallback_javascript": ("javascript", lambda scraper, driver: scraper._fallback_extract_with_script(driver)),
+}
+
+SCRIPT_PATTERN = re.compile(r"<script\b[^>]*>.*?</script>", re.IGNORECASE | re.DOTALL)
+
+
+def setup_logging(verbose):
+    """Setup logging configuration"""
+    logging.basicConfig(
+        level=logging.INFO if verbose else logging.WARNING,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[logging.StreamHandler(sys.stderr)]
+    )
+    return logging.getLogger(__name__)
+
+
+def load_corpus(patterns, keep_scripts):
+    """Load recorded pages as {query: html}, naming each query after its snapshot file"""
+    corpus = {}
+    for pattern in patterns:
+        for path in sorted(glob.glob(pattern)) or [pattern]:
+            name = os.path.splitext(os.path.basename(path))[0]
+            query = name.removeprefix(SNAPSHOT_PREFIX).replace('_', ' ')
+            with open(path, encoding='utf-8') as f:
+                html = f.read()
+            # Snapshots are already rendered, replaying Google's scripts would only mutate or navigate away
+            corpus[query] = html if keep_scripts else SCRIPT_PATTERN.sub("", html)
+    return corpus
+
+
+def start_corpus_server(corpus, port):
+    """Serve the corpus on localhost, answering /search?q=<query> with the recorded page"""
+    pages = {query: html.encode('utf-8') for query, html in corpus.items()}
+
+    class CorpusHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            query = parse_qs(urlparse(self.path).query).get('q', [''])[0]
+            body = pages.get(query)
+            if body is None:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', port), CorpusHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class RoundTripCounter:
+    """Counts WebDriver commands, every one of which is a round trip to chromedriver"""
+
+    def __init__(self, driver):
+        self.count = 0
+        execute = driver.execute
+
+        def counting_execute(driver_command, params=None):
+            self.count += 1
+            return execute(driver_command, params)
+
+        # Element commands are also sent through the driver's execute
+        driver.execute = counting_execute
+
+
+def run_extraction(scraper, driver, counter, query, path, extract):
+    """Load a recorded page and time one extraction path on it"""
+    start = time.perf_counter()
+    driver.get(google_shopping_scraper_settings.get_shopping_url(query))
+    scraper._wait_for_readiness(driver)
+    load_seconds = time.perf_counter() - start
+
+    counter.count = 0
+    start = time.perf_counter()
+    items = list(extract(scraper, driver))
+    seconds = time.perf_counter() - start
+    return {
+        "path": path,
+        "query": query,
+        "load_seconds": round(load_seconds, 4),
+        "seconds": round(seconds, 4),
+        "round_trips": counter.count,
+        "items": len(items),
+        "items_per_second": round(len(items) / seconds, 2) if seconds > 0 else None,
+    }
+
+
+def run_query(scraper, counter, query, path):
+    """Time a whole query, from navigation to extracted items, with zero pacing"""
+    counter.count = 0
+    start = time.perf_counter()
+    items = scraper.get_shopping_data_for_query(query, max_retries=1)
+    seconds = time.perf_counter() - start
+    return {
+        "path": path,
+        "query": query,
+        "load_seconds": None,
+        "seconds": round(seconds, 4),
+        "round_trips": counter.count,
+        "items": len(items),
+        "items_per_second": round(len(items) / seconds, 2) if seconds > 0 else None,
+    }
+
+
+def summarize(runs):
+    """Aggregate runs per extraction path"""
+    summary = {}
+    for path in dict.fromkeys(run["path"] for run in runs):
+        path_runs = [run for run in runs if run["path"] == path]
+        seconds = sorted(run["seconds"] for run in path_runs)
+        items = sum(run["items"] for run in path_runs)
+        summary[path] = {
+            "runs": len(path_runs),
+            "items": items,
+            "mean_seconds": round(sum(seconds) / len(seconds), 4),
+            "p50_seconds": percentile(seconds, 0.5),
+            "p95_seconds": percentile(seconds, 0.95),
+            "mean_round_trips": round(sum(run["round_trips"] for run in path_runs) / len(path_runs), 1),
+            "items_per_second": round(items / sum(seconds), 2) if sum(seconds) > 0 else None,
+        }
+    return summary
+
+
+def compare(summary, baseline_path, max_regression):
+    """Print the change against a baseline result file and return whether any path regressed too much"""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)["summary"]
+
+    regressed = False
+    print(f"\n=== COMPARISON WITH {baseline_path} ===", file=sys.stderr)
+    for path, stats in summary.items():
+        base = baseline.get(path)
+        if base is None:
+            continue
+        for metric in ("p50_seconds", "mean_round_trips"):
+            if not base[metric]:
+                continue
+            change = stats[metric] / base[metric] - 1
+            flag = ""
+            if change > max_regression:
+                flag = "  REGRESSION"
+                regressed = True
+            print(f"{path:<22} {metric:<17} {base[metric]:>10} -> {stats[metric]:>10} ({change:+.1%}){flag}", file=sys.stderr)
+    return regressed
+
+
+def main():
+    """Main function to run the benchmark"""
+    parser = argparse.ArgumentParser(description='Benchmark the extraction paths over recorded Google Shopping pages')
+    parser.add_argument('pages', nargs='*', default=[os.path.join('debug', f'{SNAPSHOT_PREFIX}*.html')], help='Recorded HTML pages or glob patterns (default: debug snapshots)')
+    parser.add_argument('--paths', nargs='+', choices=list(EXTRACTION_PATHS), default=list(EXTRACTION_PATHS), help='Extraction paths to benchmark (default: all)')
+    parser.add_argument('--end-to-end', action='store_true', help='Also time whole queries per extraction mode, including consent and rendering waits')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per page and path (default: 3)')
+    parser.add_argument('--port', type=int, default=0, help='Port of the local corpus server (default: any free port)')
+    parser.add_argument('--no-headless', action='store_false', dest='headless', help='Run browser with visible window')
+    parser.add_argument('--keep-scripts', action='store_true', help='Serve the recorded pages with their <script> tags')
+    parser.add_argument('--output', help='Write the JSON results to this file instead of stdout')
+    parser.add_argument('--compare', metavar='BASELINE_JSON', help='Compare with a previous result file')
+    parser.add_argument('--max-regression', type=float, default=0.2, help='Relative p50 / round trip increase reported as a regression (default: 0.2)')
+    parser.add_argument('--verbose', action='store_true', help='Log scraper progress')
+    args = parser.parse_args()
+
+    logger = setup_logging(args.verbose)
+
+    corpus = load_corpus(args.pages, args.keep_scripts)
+    if not corpus:
+        parser.error('No recorded pages found')
+
+    server = start_corpus_server(corpus, args.port)
+    google_shopping_scraper_settings.url = f"http://127.0.0.1:{server.server_port}/search?tbm=shop"
+    logger.info(f"Serving {len(corpus)} recorded pages at {google_shopping_scraper_settings.url}")
+
+    # One browser shared by all paths, each path extracting with its own scraper configuration
+    host = GoogleShoppingScraper(logger=logger, keep_browser_open=True, pacing_profile='zero')
+    driver = host._get_or_create_driver(headless=args.headless)
+    counter = RoundTripCounter(driver)
+
+    runs = []
+    try:
+        for path in args.paths:
+            extraction_mode, extract = EXTRACTION_PATHS[path]
+            scraper = GoogleShoppingScraper(logger=logger, extraction_mode=extraction_mode, pacing_profile='zero')
+            for query in corpus:
+                for repeat in range(args.repeat):
+                    run = run_extraction(scraper, driver, counter, query, path, extract)
+                    run["repeat"] = repeat
+                    runs.append(run)
+                    logger.info(f"{path} '{query}': {run['items']} items in {run['seconds']:.3f}s, {run['round_trips']} round trips")
+
+        if args.end_to_end:
+            for extraction_mode in dict.fromkeys(mode for mode, _ in EXTRACTION_PATHS.values()):
+                host.extraction_mode = extraction_mode
+                for query in corpus:
+                    for repeat in range(args.repeat):
+                        run = run_query(host, counter, query, f"query_{extraction_mode}")
+                        run["repeat"] = repeat
+                        runs.append(run)
+    finally:
+        host.close_browser()
+        server.shutdown()
+
+    result = {
+        "meta": {
+            "created_at": datetime.now().isoformat(),
+            "pages": len(corpus),
+            "repeat": args.repeat,
+            "headless": args.headless,
+            "browser_version": driver.capabilities.get('browserVersion'),
+            "python": platform.python_version(),
+        },
+        "summary": summarize(runs),
+        "runs": runs,
+    }
+
+    output = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+        logger.info(f"Results saved to: {args.output}")
+    else:
+        print(output)
+
+    if args.compare and compare(result["summary"], args.compare, args.max_regression):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
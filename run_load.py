@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Load driver measuring throughput and tail latency of get_shopping_data_for_query under fault injection.
+
+Runs queries concurrently through a browser pool against the local Google Shopping stand-in
+(started in-process unless --url points at a running one) and reports the results as JSON.
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from google_shopping_scraper.conf import google_shopping_scraper_settings
+from google_shopping_scraper.metrics import percentile
+from google_shopping_scraper.pool import BrowserPool
+from google_shopping_scraper.standin import StandInServer, parse_layout_weights
+
+
+def setup_logging(verbose):
+    """Setup logging configuration"""
+    logging.basicConfig(
+        level=logging.INFO if verbose else logging.WARNING,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[logging.StreamHandler(sys.stderr)]
+    )
+    return logging.getLogger(__name__)
+
+
+def run_query(pool, query, max_retries):
+    """Scrape one query on a pooled browser, recording its latency and outcome"""
+    start = time.perf_counter()
+    items, error = [], None
+    try:
+        with pool.session() as scraper:
+            items = scraper.get_shopping_data_for_query(query, max_retries=max_retries)
+    except BaseException as e:
+        if isinstance(e, (KeyboardInterrupt, SystemExit)):
+            raise
+        error = type(e).__name__
+    return {
+        "query": query,
+        "latency_seconds": round(time.perf_counter() - start, 3),
+        "items": len(items),
+        "error": error,
+    }
+
+
+def summarize(results, wall_seconds):
+    """Aggregate throughput, latency percentiles and the outcome mix of all queries"""
+    latencies = sorted(result["latency_seconds"] for result in results)
+    succeeded = [result for result in results if result["error"] is None and result["items"]]
+    return {
+        "queries": len(results),
+        "succeeded": len(succeeded),
+        "empty": sum(1 for result in results if result["error"] is None and not result["items"]),
+        "errors": dict(Counter(result["error"] for result in results if result["error"])),
+        "wall_seconds": round(wall_seconds, 3),
+        "queries_per_second": round(len(results) / wall_seconds, 3) if wall_seconds > 0 else None,
+        "items_per_second": round(sum(result["items"] for result in results) / wall_seconds, 2) if wall_seconds > 0 else None,
+        "latency_seconds": {
+            "mean": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+            "p50": percentile(latencies, 0.5),
+            "p95": percentile(latencies, 0.95),
+            "p99": percentile(latencies, 0.99),
+            "max": latencies[-1] if latencies else 0.0,
+        },
+    }
+
+
+def main():
+    """Main function to run the load test"""
+    parser = argparse.ArgumentParser(description='Load-test the scraper against a local Google Shopping stand-in')
+    parser.add_argument('--queries', type=int, default=50, help='Number of queries to run (default: 50)')
+    parser.add_argument('--distinct', type=int, default=10, help='Number of distinct query strings (default: 10)')
+    parser.add_argument('--concurrency', type=int, default=2, help='Concurrent browser sessions (default: 2)')
+    parser.add_argument('--max-retries', type=int, default=3, help='Attempts per query (default: 3)')
+    parser.add_argument('--pacing', choices=['stealth', 'normal', 'fast', 'zero'], default='zero', help='Pacing profile of the scrapers (default: zero)')
+    parser.add_argument('--no-headless', action='store_false', dest='headless', help='Run browsers with visible windows')
+    parser.add_argument('--url', help='Search URL of an already running stand-in, instead of starting one')
+    parser.add_argument('--latency', type=float, default=0.2, help='Base response delay in seconds (default: 0.2)')
+    parser.add_argument('--jitter', type=float, default=0.1, help='Mean extra response delay in seconds, exponentially distributed (default: 0.1)')
+    parser.add_argument('--render-delay', type=float, default=0.3, help='Seconds until the first cards render (default: 0.3)')
+    parser.add_argument('--consent-rate', type=float, default=1.0, help='Probability of a consent interstitial without the consent cookie (default: 1.0)')
+    parser.add_argument('--captcha-rate', type=float, default=0.05, help='Probability of a /sorry/ CAPTCHA page per search (default: 0.05)')
+    parser.add_argument('--layouts', type=parse_layout_weights, default={"standard": 0.9, "aria_price": 0.05, "legacy": 0.05}, help='Layout weights (default: standard=0.9,aria_price=0.05,legacy=0.05)')
+    parser.add_argument('--seed', type=int, help='Seed of the fault injection')
+    parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+    parser.add_argument('--verbose', action='store_true', help='Log scraper progress')
+    args = parser.parse_args()
+
+    logger = setup_logging(args.verbose)
+
+    server = None
+    if args.url:
+        google_shopping_scraper_settings.url = args.url
+    else:
+        server = StandInServer(
+            latency=args.latency,
+            jitter=args.jitter,
+            render_delay=args.render_delay,
+            consent_rate=args.consent_rate,
+            captcha_rate=args.captcha_rate,
+            layout_weights=args.layouts,
+            seed=args.seed,
+            logger=logger,
+        ).start()
+        google_shopping_scraper_settings.url = server.url
+    google_shopping_scraper_settings.pacing_profile = args.pacing
+
+    queries = [f"product {i % args.distinct}" for i in range(args.queries)]
+    pool = BrowserPool(
+        logger=logger,
+        min_size=args.concurrency,
+        max_size=args.concurrency,
+        headless=args.headless,
+    )
+
+    try:
+        pool.start()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            results = list(executor.map(lambda query: run_query(pool, query, args.max_retries), queries))
+        wall_seconds = time.perf_counter() - start
+    finally:
+        pool.close()
+        if server:
+            server.stop()
+
+    report = {
+        "meta": {
+            "created_at": datetime.now().isoformat(),
+            "url": google_shopping_scraper_settings.url,
+            "concurrency": args.concurrency,
+            "max_retries": args.max_retries,
+            "pacing": args.pacing,
+            "captcha_rate": args.captcha_rate if server else None,
+            "consent_rate": args.consent_rate if server else None,
+            "layouts": args.layouts if server else None,
+        },
+        "summary": summarize(results, wall_seconds),
+        "server": server.stats() if server else None,
+        "results": results,
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+        logger.info(f"Report saved to: {args.output}")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
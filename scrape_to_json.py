@@ -6,16 +6,31 @@ Script to scrape Google Shopping and save results as JSON with images.
 import argparse
 import json
 import logging
+import os
 import sys
+import time
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
+from multiprocessing import util as multiprocessing_util
 
-from google_shopping_scraper.scraper import GoogleShoppingScraper
+from google_shopping_scraper.chromedriver import ChromeDriverNotFoundError
+from google_shopping_scraper.html_parser import parse_shopping_html_file
+from google_shopping_scraper.metrics import percentile
+from google_shopping_scraper.scraper import (
+    BlockedPageError,
+    ConsentFormAcceptError,
+    DriverGetShoppingDataError,
+    DriverInitializationError,
+    GoogleShoppingScraper,
+)
+from google_shopping_scraper.snapshots import SNAPSHOT_PREFIX, safe_filename_part
 
 
 def setup_logging():
     """Setup logging configuration"""
     import os
-    
+
     # Create debug directory if it doesn't exist
     debug_dir = "debug"
     if not os.path.exists(debug_dir):
@@ -32,6 +47,172 @@ def setup_logging():
     return logging.getLogger(__name__)
 
 
+def item_to_dict(item):
+    """Convert a scraped item to a JSON-serializable dict"""
+    return {
+        "title": item.title,
+        "price": item.price,
+        "delivery_price": item.delivery_price,
+        "review": item.review,
+        "url": item.url,
+        "image_url": item.image_url,
+        "saved_image_path": item.saved_image_path
+    }
+
+
+def results_filename(query):
+    """Name of the JSON results file of a query, replacing path separators and other unsafe characters with '_'"""
+    return f"shopping_results_{safe_filename_part(query)}.json"
+
+
+def save_results(query, items):
+    """Save scraped items for a query to a JSON file and return its name"""
+    # Convert to JSON-serializable format
+    items_data = [item_to_dict(item) for item in items]
+    
+    # Create output data with metadata
+    output_data = {
+        "query": query,
+        "scraped_at": datetime.now().isoformat(),
+        "total_items": len(items_data),
+        "items": items_data
+    }
+    
+    # Save to JSON file
+    output_filename = results_filename(query)
+    with open(output_filename, 'w', encoding='utf-8') as f:
+        json.dump(output_data, f, indent=2, ensure_ascii=False)
+    
+    return output_filename
+
+
+def parse_saved_pages(paths, logger):
+    """Re-parse saved Google Shopping HTML pages offline and save the results as JSON"""
+    for path in paths:
+        # Debug pages are saved as debug_google_shopping_<query>.html
+        name = os.path.splitext(os.path.basename(path))[0]
+        query = name.removeprefix(SNAPSHOT_PREFIX).replace('_', ' ')
+        
+        try:
+            items = parse_shopping_html_file(path)
+        except Exception as e:
+            logger.error(f"Error parsing {path}: {e}")
+            continue
+        
+        output_filename = save_results(query, items)
+        logger.info(f"Parsed {len(items)} items from {path}, saved to: {output_filename}")
+
+
+def load_queries(path):
+    """Read queries from a plain text file (one per line) or a JSONL file (objects with a "query" or "title" field)"""
+    queries = []
+    with open(path, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            if line.startswith('{'):
+                record = json.loads(line)
+                query = record.get('query') or record.get('title')
+                if not query:
+                    raise ValueError(f"{path}:{line_number}: JSON line has no 'query' or 'title' field")
+                queries.append(query)
+            else:
+                queries.append(line)
+    return queries
+
+
+# Scraper owned by the current batch worker process, created by init_batch_worker
+_worker_scraper = None
+_worker_options = {}
+
+
+def init_batch_worker(fast, headless, extraction, pacing, max_items, max_pages, deep_fetch):
+    """Create the long-lived scraper of a batch worker process"""
+    global _worker_scraper, _worker_options
+    logger = logging.getLogger(f"{__name__}.worker{os.getpid()}")
+    _worker_scraper = GoogleShoppingScraper(logger=logger, fast_mode=fast, keep_browser_open=True, extraction_mode=extraction, pacing_profile=pacing)
+    _worker_options = {"headless": headless, "max_items": max_items, "max_pages": max_pages, "deep_fetch": deep_fetch}
+    # Worker processes skip atexit handlers, so close the browser from a multiprocessing finalizer
+    multiprocessing_util.Finalize(_worker_scraper, _worker_scraper.close_browser, exitpriority=10)
+
+
+def scrape_in_batch_worker(query):
+    """Scrape a single query in a batch worker process and return a JSON-serializable record"""
+    start = time.perf_counter()
+    try:
+        items = _worker_scraper.get_shopping_data_for_query(query, **_worker_options)
+        error = None
+    except (BlockedPageError, ChromeDriverNotFoundError, ConsentFormAcceptError, DriverInitializationError, DriverGetShoppingDataError) as e:
+        items = []
+        error = e.message
+    except BaseException as e:
+        # The scraper's errors derive from BaseException, a failed query must not abort the whole batch
+        if isinstance(e, (KeyboardInterrupt, SystemExit)):
+            raise
+        items = []
+        error = getattr(e, "message", None) or str(e) or type(e).__name__
+    return batch_record(query, items, error, time.perf_counter() - start)
+
+
+def batch_record(query, items, error, latency_seconds):
+    """JSON-serializable result record of a query in a batch"""
+    return {
+        "query": query,
+        "scraped_at": datetime.now().isoformat(),
+        "latency_seconds": round(latency_seconds, 3),
+        "total_items": len(items),
+        "error": error,
+        "items": [item_to_dict(item) for item in items]
+    }
+
+
+def run_batch(args, logger):
+    """Scrape all queries of a queries file across worker processes, streaming results to a JSONL file"""
+    queries = load_queries(args.queries_file)
+    if not queries:
+        logger.warning(f"No queries found in {args.queries_file}")
+        return
+    
+    logger.info(f"Scraping {len(queries)} queries with {args.workers} worker processes, writing to {args.output}")
+    
+    latencies = []
+    failed = 0
+    start = time.perf_counter()
+    with open(args.output, 'w', encoding='utf-8') as output, ProcessPoolExecutor(
+        max_workers=args.workers,
+        initializer=init_batch_worker,
+        initargs=(args.fast, args.headless, args.extraction, args.pacing, args.max_items, args.max_pages, args.deep_fetch),
+    ) as executor:
+        futures = {executor.submit(scrape_in_batch_worker, query): query for query in queries}
+        for done, future in enumerate(as_completed(futures), 1):
+            try:
+                record = future.result()
+            except Exception as e:
+                # A worker process that died takes its query down with it, e.g. BrokenProcessPool.
+                # Its latency is only known to be at most the time since the batch started.
+                record = batch_record(futures[future], [], str(e) or type(e).__name__, time.perf_counter() - start)
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            output.flush()
+            
+            latencies.append(record["latency_seconds"])
+            if record["error"] or not record["total_items"]:
+                failed += 1
+            logger.info(f"[{done}/{len(queries)}] '{record['query']}': {record['total_items']} items in {record['latency_seconds']:.1f}s")
+    
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    
+    # Print throughput summary
+    print(f"\n=== BATCH SUMMARY ===")
+    print(f"Queries: {len(queries)} ({failed} failed or empty)")
+    print(f"Workers: {args.workers}")
+    print(f"Elapsed: {elapsed:.1f}s")
+    print(f"Throughput: {len(queries) / elapsed * 60:.1f} queries/min")
+    print(f"Latency p50: {percentile(latencies, 0.5):.2f}s, p95: {percentile(latencies, 0.95):.2f}s")
+    print(f"Results file: {args.output}")
+
+
 def main():
     """Main function to run the scraper"""
     # Parse command line arguments
@@ -41,52 +222,47 @@ def main():
     parser.add_argument('--no-headless', action='store_false', dest='headless', help='Run browser with visible window')
     parser.add_argument('--fast', action='store_true', help='Enable fast mode for quicker scraping (reduced delays)')
     parser.add_argument('--keep-browser', action='store_true', help='Keep browser open between requests (faster for multiple queries)')
+    parser.add_argument('--pacing', choices=['stealth', 'normal', 'fast', 'zero'], default=None, help='Delay profile between scraping actions (default: from settings, or fast with --fast)')
+    parser.add_argument('--extraction', choices=['webdriver', 'javascript', 'html'], default=None, help='Product extraction backend (default: from settings)')
+    parser.add_argument('--max-items', type=int, default=None, help='Maximum number of items per query (default: from settings)')
+    parser.add_argument('--max-pages', type=int, default=None, help='Maximum number of results pages to follow per query (default: from settings)')
+    parser.add_argument('--deep-fetch', action='store_true', default=None, help='Load the results pages of a query in parallel tabs')
+    parser.add_argument('--from-html', nargs='+', metavar='HTML_FILE', help='Re-parse saved HTML pages (e.g. debug/*.html) offline instead of scraping')
+    parser.add_argument('--queries-file', help='Scrape every query of a plain text or JSONL file instead of a single query')
+    parser.add_argument('--workers', type=int, default=2, help='Number of worker processes, each with its own browser, for --queries-file (default: 2)')
+    parser.add_argument('--output', default='shopping_results_batch.jsonl', help='JSONL file the --queries-file results are streamed to (default: shopping_results_batch.jsonl)')
     args = parser.parse_args()
     
     logger = setup_logging()
     
+    if args.from_html:
+        parse_saved_pages(args.from_html, logger)
+        return
+    
+    if args.queries_file:
+        if args.workers < 1:
+            parser.error('--workers must be at least 1')
+        run_batch(args, logger)
+        return
+    
     logger.info(f"Starting Google Shopping scraper for query: '{args.query}'")
     logger.info(f"Headless mode: {args.headless}")
     logger.info(f"Fast mode: {args.fast}")
     logger.info(f"Keep browser open: {args.keep_browser}")
     
+    scraper = None
     try:
         # Initialize scraper
-        scraper = GoogleShoppingScraper(logger=logger, fast_mode=args.fast, keep_browser_open=args.keep_browser)
+        scraper = GoogleShoppingScraper(logger=logger, fast_mode=args.fast, keep_browser_open=args.keep_browser, extraction_mode=args.extraction, pacing_profile=args.pacing)
         
         # Scrape data
-        items = scraper.get_shopping_data_for_query(args.query, headless=args.headless)
+        items = scraper.get_shopping_data_for_query(args.query, headless=args.headless, max_items=args.max_items, max_pages=args.max_pages, deep_fetch=args.deep_fetch)
         
         if not items:
             logger.warning("No items found!")
             return
         
-        # Convert to JSON-serializable format
-        items_data = []
-        for item in items:
-            item_dict = {
-                "title": item.title,
-                "price": item.price,
-                "delivery_price": item.delivery_price,
-                "review": item.review,
-                "url": item.url,
-                "image_url": item.image_url,
-                "saved_image_path": item.saved_image_path
-            }
-            items_data.append(item_dict)
-        
-        # Create output data with metadata
-        output_data = {
-            "query": args.query,
-            "scraped_at": datetime.now().isoformat(),
-            "total_items": len(items_data),
-            "items": items_data
-        }
-        
-        # Save to JSON file
-        output_filename = f"shopping_results_{args.query.replace(' ', '_')}.json"
-        with open(output_filename, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, indent=2, ensure_ascii=False)
+        output_filename = save_results(args.query, items)
         
         logger.info(f"Successfully scraped {len(items)} items")
         logger.info(f"Results saved to: {output_filename}")
@@ -97,19 +273,28 @@ def main():
         print(f"Items found: {len(items)}")
         print(f"JSON file: {output_filename}")
         
-        # Print all items as preview (limited to top 5)
+        # Print all items as preview
         print(f"\n=== ALL RESULTS ===")
         for i, item in enumerate(items):
             print(f"\n{i+1}. {item.title}")
             print(f"   Price: {item.price}")
             print(f"   Image URL: {item.image_url[:100] + '...' if item.image_url and len(item.image_url) > 100 else item.image_url or 'N/A'}")
         
+        # Print where the time went
+        print(f"\n=== TIMINGS ===")
+        for phase, stats in sorted(scraper.last_timings.items(), key=lambda entry: -entry[1]["total"]):
+            print(f"{phase:<16} {stats['total']:8.2f}s  ({stats['count']}x, max {stats['max']:.2f}s)")
+        
+    except (BlockedPageError, ChromeDriverNotFoundError, ConsentFormAcceptError, DriverInitializationError, DriverGetShoppingDataError) as e:
+        # The scraper's errors derive from BaseException, so they are not caught below
+        logger.error(f"Error during scraping: {e.message}")
+        sys.exit(1)
     except Exception as e:
         logger.error(f"Error during scraping: {e}")
         sys.exit(1)
     finally:
-        # Clean up browser if keeping it open
-        if hasattr(scraper, 'close_browser'):
+        # Clean up browser if keeping it open. The scraper is not created if its options are invalid.
+        if scraper is not None:
             scraper.close_browser()
 
 
@@ -0,0 +1,133 @@
+"""
+    In-process TTL + LRU cache for scraped Google Shopping results.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, List
+
+from google_shopping_scraper.conf import google_shopping_scraper_settings
+from google_shopping_scraper.models import ShoppingItem
+
+
+def normalize_query(query: str) -> str:
+    """Normalizes a query so that e.g. 'cat food' and 'Cat  Food' share a cache entry"""
+    return " ".join(query.lower().split())
+
+
+class CacheEntry:
+    """Cached items for one key"""
+
+    def __init__(self, items: List[ShoppingItem], size: int) -> None:
+        self.items = items
+        self.size = size
+        self.created_at = time.monotonic()
+
+    @property
+    def age(self) -> float:
+        """Seconds since the entry was stored"""
+        return time.monotonic() - self.created_at
+
+
+class ResultCache:
+    """Thread-safe result cache bounded by entry count and total size, evicting least recently used entries"""
+
+    def __init__(
+        self,
+        ttl: float | None = None,
+        stale_ttl: float | None = None,
+        max_entries: int | None = None,
+        max_bytes: int | None = None,
+    ) -> None:
+        settings = google_shopping_scraper_settings
+        self.ttl = settings.cache_ttl if ttl is None else ttl
+        self.stale_ttl = settings.cache_stale_ttl if stale_ttl is None else stale_ttl
+        self.max_entries = settings.cache_max_entries if max_entries is None else max_entries
+        self.max_bytes = settings.cache_max_bytes if max_bytes is None else max_bytes
+
+        self._lock = threading.Lock()
+        self._entries: OrderedDict = OrderedDict()
+        self._total_bytes = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(query: str, region: str, fast: bool, headless: bool, max_items: int = 5, max_pages: int = 1) -> tuple:
+        """Builds a cache key from the normalized query and the options that affect results"""
+        return (normalize_query(query), region, fast, headless, max_items, max_pages)
+
+    @staticmethod
+    def _estimate_size(items: List[ShoppingItem]) -> int:
+        """Approximate size of the items in bytes, dominated by base64 image URLs"""
+        return sum(len(item.model_dump_json()) for item in items)
+
+    def is_stale(self, entry: CacheEntry) -> bool:
+        """Whether an entry is past its TTL and should be refreshed"""
+        return entry.age > self.ttl
+
+    def get(self, key: Hashable) -> CacheEntry | None:
+        """Returns the entry for a key, including stale entries inside the stale window, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            if entry.age > self.ttl + self.stale_ttl:
+                self._remove(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            if entry.age > self.ttl:
+                self.stale_hits += 1
+            else:
+                self.hits += 1
+            return entry
+
+    def set(self, key: Hashable, items: List[ShoppingItem]) -> None:
+        """Stores items for a key, evicting least recently used entries to stay within bounds"""
+        size = self._estimate_size(items)
+        if size > self.max_bytes or self.max_entries < 1:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = CacheEntry(items, size)
+            self._total_bytes += size
+
+            while len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def _remove(self, key: Hashable) -> None:
+        """Removes an entry, the lock must be held"""
+        entry = self._entries.pop(key)
+        self._total_bytes -= entry.size
+
+    def clear(self) -> None:
+        """Removes all entries"""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> dict:
+        """Returns hit/miss counters and current occupancy"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                "stale_ttl": self.stale_ttl,
+            }
@@ -0,0 +1,128 @@
+"""
+    Resolution of the chromedriver binary, cached per process and on disk.
+"""
+
+import json
+import logging
+import os
+import threading
+
+from webdriver_manager.chrome import ChromeDriverManager
+
+from google_shopping_scraper.conf import google_shopping_scraper_settings
+
+
+logging.getLogger("WDM").setLevel(logging.ERROR)
+
+
+class ChromeDriverNotFoundError(BaseException):
+    message = "Unable to find a chromedriver binary."
+
+
+_lock = threading.Lock()
+_resolved_path: str | None = None
+
+
+def _read_manifest(manifest_path: str, version: str | None) -> str | None:
+    """Returns the chromedriver path recorded in the manifest if it is still usable for the pinned version"""
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    path = manifest.get("path")
+    if not path or not os.path.isfile(path):
+        return None
+    if version and manifest.get("version") != version:
+        return None
+    return path
+
+
+def _write_manifest(manifest_path: str, version: str | None, path: str) -> None:
+    """Records a resolved chromedriver path so that later processes skip the driver manager"""
+    directory = os.path.dirname(manifest_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = f"{manifest_path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": version, "path": path}, f)
+    os.replace(temp_path, manifest_path)
+
+
+def resolve_chromedriver_path(logger: logging.Logger | None = None) -> str:
+    """
+    Returns the path of the chromedriver binary.
+
+    The configured chromedriver_path is used as is. Otherwise the path is resolved once per process,
+    first from the on-disk manifest and only then with ChromeDriverManager, pinned to
+    chromedriver_version if set.
+
+    Raises:
+        ChromeDriverNotFoundError: If the configured path does not exist or the driver manager fails.
+    """
+    global _resolved_path
+    logger = logger if logger else logging.getLogger(__name__)
+    settings = google_shopping_scraper_settings
+
+    if settings.chromedriver_path:
+        if not os.path.isfile(settings.chromedriver_path):
+            logger.error(f"Configured chromedriver not found: {settings.chromedriver_path}")
+            raise ChromeDriverNotFoundError
+        return settings.chromedriver_path
+
+    with _lock:
+        if _resolved_path and os.path.isfile(_resolved_path):
+            return _resolved_path
+
+        manifest_path = os.path.expanduser(settings.chromedriver_manifest_path)
+        version = settings.chromedriver_version
+        path = _read_manifest(manifest_path, version)
+
+        if path is None:
+            logger.info(f"Resolving chromedriver {version or '(matching installed Chrome)'} with webdriver-manager")
+            try:
+                path = ChromeDriverManager(driver_version=version).install()
+            except Exception as e:
+                logger.error(f"Error resolving chromedriver: {e}")
+                raise ChromeDriverNotFoundError from e
+
+            try:
+                _write_manifest(manifest_path, version, path)
+            except OSError as e:
+                logger.warning(f"Unable to write chromedriver manifest {manifest_path}: {e}")
+
+        _resolved_path = path
+        return path
+
+
+def reset_chromedriver_cache() -> None:
+    """Forgets the chromedriver path resolved in this process"""
+    global _resolved_path
+    with _lock:
+        _resolved_path = None
+
+
+def discard_resolved_chromedriver(logger: logging.Logger | None = None) -> bool:
+    """
+    Forgets the resolved chromedriver in this process and in the on-disk manifest, e.g. after Chrome
+    updated itself and no longer starts with it. Returns whether the next resolution can pick another one.
+    """
+    global _resolved_path
+    logger = logger if logger else logging.getLogger(__name__)
+    settings = google_shopping_scraper_settings
+
+    # A configured path or a pinned version resolves to the same driver again
+    if settings.chromedriver_path or settings.chromedriver_version:
+        return False
+
+    with _lock:
+        _resolved_path = None
+        manifest_path = os.path.expanduser(settings.chromedriver_manifest_path)
+        try:
+            os.remove(manifest_path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Unable to remove chromedriver manifest {manifest_path}: {e}")
+    return True
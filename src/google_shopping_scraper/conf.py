@@ -2,6 +2,7 @@
     Config module for google_shopping_scraper.
 """
 
+from typing import Dict, Optional, Tuple
 from urllib.parse import quote
 
 from pydantic_settings import BaseSettings
@@ -11,11 +12,93 @@ class GoogleShoppingScraperSettings(BaseSettings):
     """Settings class for Google Shopping Scraper"""
 
     url: str = "https://www.google.com/search?tbm=shop"
+    region: str = "us"
 
-    def get_shopping_url(self, query: str) -> str:
-        """Returns a Google Shopping URL for a given query string."""
+    # How product cards are read: "webdriver" (per-element calls), "javascript" (one script per
+    # scroll step) or "html" (offline parsing of page_source)
+    extraction_mode: str = "webdriver"
+
+    # Delays between scraping actions: "stealth", "normal", "fast" or "zero" (no delays, for tests
+    # and benchmarks). Individual delay points can be overridden, e.g. {"scroll_pause": [0.1, 0.2]}
+    pacing_profile: str = "normal"
+    pacing_overrides: Dict[str, Tuple[float, float]] = {}
+
+    # chromedriver binary. An explicit path skips webdriver-manager entirely; otherwise the driver is
+    # resolved once per process and recorded in the manifest, optionally pinned to a version
+    chromedriver_path: Optional[str] = None
+    chromedriver_version: Optional[str] = None
+    chromedriver_manifest_path: str = "~/.cache/google_shopping_scraper/chromedriver.json"
+
+    # Consent cookies are captured once per region / proxy and restored before navigation, so the
+    # consent flow only runs again after they expire. Optionally persisted to a JSON file.
+    consent_cookie_ttl: float = 24 * 3600
+    consent_store_path: Optional[str] = None
+
+    # How queries on a reused browser are isolated: "wipe" clears cookies and storage of the current
+    # origin, "context" runs each query in a fresh CDP browser context of the same Chrome process
+    isolation_mode: str = "wipe"
+
+    # Whether a query that hits a CAPTCHA / block page is retried with a fresh browser after a longer
+    # back-off, or fails immediately with BlockedPageError
+    retry_on_blocked: bool = True
+
+    # Fingerprint patches registered once per browser via CDP: "off", "minimal" or "standard"
+    stealth_profile: str = "standard"
+
+    # Rendering counts as finished once product nodes have not changed for the quiet window (seconds),
+    # observed in the page with a MutationObserver for at most stability_max_wait seconds
+    stability_quiet_window: float = 0.15
+    stability_max_wait: float = 3.0
+
+    # HTML snapshots of scraped pages, also captured whenever debug logging is enabled. A sample
+    # of pages is written by a background thread, deleting the oldest snapshots beyond the quota
+    snapshot_capture: bool = False
+    snapshot_sample_rate: float = 1.0
+    snapshot_dir: str = "debug"
+    snapshot_max_bytes: int = 100 * 1024 * 1024
+
+    # Products collected per query. Beyond the first results page, start= pagination is followed for
+    # at most max_pages pages of results_page_size products, stopping early once max_items are found
+    max_items: int = 5
+    max_pages: int = 5
+    results_page_size: int = 20
+
+    # Load the results pages of a multi-page query in parallel tabs instead of one after another
+    deep_fetch: bool = False
+
+    # Process-wide budget of navigations to Google shared by all scrapers, browsers and tabs, as a rate
+    # per second with bursts of up to navigation_burst. 0 disables the budget.
+    navigation_rate: float = 0.0
+    navigation_burst: int = 2
+
+    # Tabs loading queries ahead of the one being extracted in get_shopping_data_for_queries
+    pipeline_depth: int = 2
+
+    # Browser pool used by the API for warm, reusable Chrome sessions. Idle sessions are health
+    # checked every pool_health_check_interval seconds (0 disables it), and a checked out session
+    # is verified first if it has not been checked within the interval
+    pool_min_size: int = 1
+    pool_max_size: int = 4
+    pool_checkout_timeout: float = 30.0
+    pool_health_check_interval: float = 60.0
+
+    # Worker threads running blocking scrapes for the API, and how many more may wait
+    api_max_workers: int = 4
+    api_max_queued: int = 16
+
+    # In-process cache of API results; stale entries are served while being refreshed
+    cache_ttl: float = 900.0
+    cache_stale_ttl: float = 3600.0
+    cache_max_entries: int = 256
+    cache_max_bytes: int = 64 * 1024 * 1024
+
+    def get_shopping_url(self, query: str, start: int = 0) -> str:
+        """Returns a Google Shopping URL for a given query string, optionally for a later results page."""
         encoded_query = quote(query)
-        return f"{self.url}&q={encoded_query}&gl=us"
+        url = f"{self.url}&q={encoded_query}&gl={self.region}"
+        if start:
+            url += f"&start={start}"
+        return url
 
 
 google_shopping_scraper_settings = GoogleShoppingScraperSettings()
@@ -0,0 +1,98 @@
+"""
+    Store of Google consent cookies, so that the consent flow only runs once per region and proxy.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, List
+
+from google_shopping_scraper.conf import google_shopping_scraper_settings
+
+
+# Cookies holding the consent decision on Google domains
+CONSENT_COOKIE_NAMES = ("SOCS", "CONSENT")
+
+# Fields of a CDP Network.Cookie that are accepted back by Network.setCookies
+_COOKIE_PARAM_FIELDS = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires")
+
+
+class ConsentStore:
+    """Thread-safe store of post-consent cookies per region / proxy identity, optionally persisted to a file"""
+
+    def __init__(self, ttl: float, path: str | None = None, logger: logging.Logger | None = None) -> None:
+        self._logger = logger if logger else logging.getLogger(__name__)
+        self.ttl = ttl
+        self.path = os.path.expanduser(path) if path else None
+        self._lock = threading.Lock()
+        self._entries: Dict[str, dict] = {}  # key -> {"captured_at": ..., "cookies": [...]}
+        self._load()
+
+    @staticmethod
+    def make_key(region: str, proxy: str | None) -> str:
+        return f"{region}|{proxy or 'direct'}"
+
+    def get(self, key: str) -> List[dict] | None:
+        """Returns the consent cookies of an identity, or None if consent has to be accepted again"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            now = time.time()
+            expired = now - entry["captured_at"] > self.ttl or any(
+                0 < cookie.get("expires", -1) < now for cookie in entry["cookies"]
+            )
+            if expired:
+                del self._entries[key]
+                return None
+            return entry["cookies"]
+
+    def set(self, key: str, cookies: List[dict]) -> None:
+        """Records the consent cookies of an identity. An empty list means no consent is required."""
+        consent_cookies = [
+            {field: cookie[field] for field in _COOKIE_PARAM_FIELDS if field in cookie}
+            for cookie in cookies
+            if cookie.get("name") in CONSENT_COOKIE_NAMES
+        ]
+        with self._lock:
+            self._entries[key] = {"captured_at": time.time(), "cookies": consent_cookies}
+            self._save()
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._save()
+
+    def _load(self) -> None:
+        if not self.path:
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self._entries = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            self._logger.warning(f"Unable to read consent store {self.path}: {e}")
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            self._logger.warning(f"Unable to write consent store {self.path}: {e}")
+
+
+consent_store = ConsentStore(
+    ttl=google_shopping_scraper_settings.consent_cookie_ttl,
+    path=google_shopping_scraper_settings.consent_store_path,
+)
@@ -0,0 +1,191 @@
+"""
+    Shared extraction logic for turning raw Google Shopping product card data into ShoppingItems.
+"""
+
+import hashlib
+import re
+from typing import List
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+from google_shopping_scraper.models import ShoppingItem
+
+
+TITLE_SELECTOR = ".gkQHve.SsM98d.RmEs5b"
+PRICE_SELECTOR = ".lmQWe"
+DELIVERY_SELECTOR = ".ybnj7e"
+REVIEW_SELECTOR = ".yi40Hd"
+
+# How many ancestors of a title element are searched for the card container holding the price
+MAX_CONTAINER_DEPTH = 5
+
+PRICE_PATTERN = re.compile(r'[₹$€£¥]\s*[\d,]+\.?\d*')
+
+# Product id in Google Shopping product page links
+DOCID_PATTERN = re.compile(r'/shopping/product/(\w+)|[?&]docid=(\w+)')
+# Link parameters that depend on the position or session rather than on the product
+TRACKING_PARAMS = frozenset({"ved", "sa", "usg", "ei", "sei", "sxsrf", "uact", "rlz", "sig", "adurl"})
+
+# Collects every product card on the page in a single WebDriver round trip.
+# Mirrors the per-element lookups of GoogleShoppingScraper._get_data_from_item_div.
+EXTRACT_CARDS_SCRIPT = """
+const [titleSelector, priceSelector, deliverySelector, reviewSelector, maxDepth] = arguments;
+const text = (el) => (el ? (el.innerText || '').trim() : '');
+const cards = [];
+const seenContainers = new Set();
+
+for (const titleElement of document.querySelectorAll(titleSelector)) {
+    let current = titleElement;
+    let container = null;
+    for (let i = 0; i < maxDepth && current.parentElement; i++) {
+        const parent = current.parentElement;
+        if (parent.querySelector(priceSelector)) {
+            container = parent;
+            break;
+        }
+        current = parent;
+    }
+    if (!container || seenContainers.has(container)) {
+        continue;
+    }
+    seenContainers.add(container);
+
+    // Image candidates in the same order as the XPath strategies: container, siblings, parent
+    const images = [];
+    const seenImages = new Set();
+    const addImages = (root) => {
+        for (const img of root.querySelectorAll('img')) {
+            if (!seenImages.has(img)) {
+                seenImages.add(img);
+                images.push({src: img.getAttribute('src') ? img.src : null, data_src: img.getAttribute('data-src')});
+            }
+        }
+    };
+    addImages(container);
+    if (container.parentElement) {
+        for (const sibling of container.parentElement.children) {
+            if (sibling !== container) {
+                addImages(sibling);
+            }
+        }
+        addImages(container.parentElement);
+    }
+
+    const priceElement = container.querySelector(priceSelector);
+    const link = container.querySelector('a[href]');
+    cards.push({
+        container_id: container.getAttribute('data-hveid') || text(container).slice(0, 100),
+        docid: container.getAttribute('data-docid'),
+        title: text(container.querySelector(titleSelector)),
+        price: text(priceElement),
+        price_aria_label: priceElement ? priceElement.getAttribute('aria-label') : null,
+        delivery: container.querySelector(deliverySelector) ? text(container.querySelector(deliverySelector)) : null,
+        review: container.querySelector(reviewSelector) ? text(container.querySelector(reviewSelector)) : null,
+        href: link ? link.href : null,
+        images: images,
+    });
+}
+return cards;
+"""
+
+
+def extract_cards_script_args() -> List:
+    """Arguments passed to EXTRACT_CARDS_SCRIPT"""
+    return [TITLE_SELECTOR, PRICE_SELECTOR, DELIVERY_SELECTOR, REVIEW_SELECTOR, MAX_CONTAINER_DEPTH]
+
+
+def parse_price(price_text: str | None, aria_label: str | None) -> str | None:
+    """Returns the price text, falling back to the price in an aria-label like 'Current price: ₹24.50'"""
+    if price_text:
+        return price_text
+    if aria_label and "price" in aria_label.lower():
+        price_match = PRICE_PATTERN.search(aria_label)
+        if price_match:
+            return price_match.group()
+    return None
+
+
+def select_image_url(images: List[dict]) -> str | None:
+    """Picks the best product image from a list of {"src", "data_src"} candidates"""
+    # Priority 1: Base64 images (often highest quality)
+    for img in images:
+        src = img.get("src")
+        if src and src.startswith("data:image/"):
+            return src
+
+    # Priority 2: Google Shopping encrypted URLs
+    for img in images:
+        src = img.get("src")
+        if src and "encrypted-tbn" in src and "shopping?q=tbn:" in src:
+            return src
+
+    # Priority 3: Any encrypted-tbn URL, also checking data-src for lazy loaded images
+    for img in images:
+        src = img.get("src")
+        if src and "encrypted-tbn" in src:
+            return src
+        data_src = img.get("data_src")
+        if data_src and "encrypted-tbn" in data_src:
+            return data_src
+
+    # Priority 4: Any reasonable HTTP image URL
+    for img in images:
+        src = img.get("src")
+        if src and src.startswith("http") and not any(x in src.lower() for x in ["favicon", "icon", "logo"]):
+            return src
+
+    return None
+
+
+def shopping_item_from_card(card: dict) -> ShoppingItem | None:
+    """Builds a ShoppingItem from raw card data, or returns None if the card has no title or price"""
+    title = (card.get("title") or "").strip()
+    if not title:
+        return None
+
+    price = parse_price((card.get("price") or "").strip(), card.get("price_aria_label"))
+    if not price:
+        return None
+
+    delivery = card.get("delivery")
+    delivery_price = delivery.strip() if delivery is not None else "N/A"
+
+    review = None
+    review_text = (card.get("review") or "").strip()
+    if review_text and review_text.replace('.', '').isdigit():
+        review = review_text
+
+    return ShoppingItem(
+        price=price,
+        delivery_price=delivery_price,
+        title=title,
+        review=review,
+        url=card.get("href") or "N/A",
+        image_url=select_image_url(card.get("images") or []),
+        saved_image_path=None,
+        docid=card.get("docid") or None,
+    )
+
+
+def product_fingerprint(item: ShoppingItem) -> str:
+    """
+    Stable identity of a product, the same across scroll passes, result pages and runs.
+
+    Hashes the product's docid (of its card, or taken from a product page URL), else its URL without
+    tracking parameters, else its normalized title and price.
+    """
+    docid = item.docid
+    url = item.url if item.url and item.url != "N/A" else None
+    if not docid and url:
+        match = DOCID_PATTERN.search(url)
+        if match:
+            docid = match.group(1) or match.group(2)
+
+    if docid:
+        identity = f"docid:{docid}"
+    elif url:
+        parsed = urlparse(url)
+        query = [(name, value) for name, value in parse_qsl(parsed.query) if name not in TRACKING_PARAMS]
+        identity = f"url:{parsed._replace(query=urlencode(query), fragment='').geturl()}"
+    else:
+        identity = f"title:{' '.join(item.title.lower().split())}|{item.price}"
+    return hashlib.sha1(identity.encode("utf-8")).hexdigest()
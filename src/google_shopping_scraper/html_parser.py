@@ -0,0 +1,159 @@
+"""
+    Offline extraction of Google Shopping items from rendered page HTML.
+"""
+
+from typing import Iterator, List
+from urllib.parse import urljoin
+
+from google_shopping_scraper.extraction import (
+    DELIVERY_SELECTOR,
+    MAX_CONTAINER_DEPTH,
+    PRICE_SELECTOR,
+    REVIEW_SELECTOR,
+    TITLE_SELECTOR,
+    product_fingerprint,
+    shopping_item_from_card,
+)
+from google_shopping_scraper.models import ShoppingItem
+
+
+try:
+    from lxml import html as lxml_html
+except ImportError:
+    lxml_html = None
+
+
+class HtmlParserUnavailableError(BaseException):
+    message = "The offline HTML parser requires lxml. Install it with 'pip install lxml'."
+
+
+DEFAULT_BASE_URL = "https://www.google.com/"
+
+
+def _class_xpath(selector: str) -> str:
+    """Converts a compound class selector like '.a.b' into an XPath predicate"""
+    classes = [name for name in selector.split(".") if name]
+    return " and ".join(f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')" for name in classes)
+
+
+TITLE_XPATH = f"//*[{_class_xpath(TITLE_SELECTOR)}]"
+PRICE_XPATH = f".//*[{_class_xpath(PRICE_SELECTOR)}]"
+DELIVERY_XPATH = f".//*[{_class_xpath(DELIVERY_SELECTOR)}]"
+REVIEW_XPATH = f".//*[{_class_xpath(REVIEW_SELECTOR)}]"
+
+
+def _text(element) -> str:
+    """Returns the whitespace-normalized text of an element"""
+    return " ".join(element.text_content().split()) if element is not None else ""
+
+
+def _first(element, xpath: str):
+    """Returns the first match of an XPath query, or None"""
+    matches = element.xpath(xpath)
+    return matches[0] if matches else None
+
+
+def _image_candidates(container, base_url: str) -> List[dict]:
+    """Collects image candidates from the container, its siblings and its parent, in that order"""
+    roots = [container]
+    parent = container.getparent()
+    if parent is not None:
+        roots.extend(sibling for sibling in parent if sibling is not container)
+        roots.append(parent)
+
+    images = []
+    seen = set()
+    for root in roots:
+        for img in root.iter("img"):
+            if img in seen:
+                continue
+            seen.add(img)
+            src = img.get("src")
+            images.append({
+                "src": urljoin(base_url, src) if src else None,
+                "data_src": img.get("data-src"),
+            })
+    return images
+
+
+def _card_from_container(container, base_url: str) -> dict:
+    """Builds raw card data in the same shape as EXTRACT_CARDS_SCRIPT returns"""
+    price_element = _first(container, PRICE_XPATH)
+    delivery_element = _first(container, DELIVERY_XPATH)
+    review_element = _first(container, REVIEW_XPATH)
+    link = _first(container, ".//a[@href]")
+    return {
+        "container_id": container.get("data-hveid") or _text(container)[:100],
+        "docid": container.get("data-docid"),
+        "title": _text(_first(container, f".{TITLE_XPATH}")),
+        "price": _text(price_element),
+        "price_aria_label": price_element.get("aria-label") if price_element is not None else None,
+        "delivery": _text(delivery_element) if delivery_element is not None else None,
+        "review": _text(review_element) if review_element is not None else None,
+        "href": urljoin(base_url, link.get("href")) if link is not None else None,
+        "images": _image_candidates(container, base_url),
+    }
+
+
+def iter_cards(html: str, base_url: str = DEFAULT_BASE_URL) -> Iterator[dict]:
+    """Yields raw card data for every product container in the page, in document order"""
+    if lxml_html is None:
+        raise HtmlParserUnavailableError
+
+    tree = lxml_html.fromstring(html)
+    seen = set()
+    for title_element in tree.xpath(TITLE_XPATH):
+        # Navigate up to find the container that has both title and price
+        container = None
+        current = title_element
+        for _ in range(MAX_CONTAINER_DEPTH):
+            parent = current.getparent()
+            if parent is None:
+                break
+            if parent.xpath(PRICE_XPATH):
+                container = parent
+                break
+            current = parent
+
+        if container is None or container in seen:
+            continue
+        seen.add(container)
+        yield _card_from_container(container, base_url)
+
+
+def parse_shopping_html(html: str, max_items: int | None = None, base_url: str = DEFAULT_BASE_URL) -> List[ShoppingItem]:
+    """
+    Parses rendered Google Shopping HTML into shopping items.
+
+    Args:
+        html: Rendered page HTML, e.g. driver.page_source or a saved debug page
+        max_items: Stop after this many items (default: all)
+        base_url: URL relative links and image sources are resolved against
+
+    Returns:
+        List[ShoppingItem]: Items in page order, each product only once.
+    Raises:
+        HtmlParserUnavailableError: If lxml is not installed.
+    """
+    items = []
+    seen = set()  # Fingerprints of the products parsed so far, a product can be listed by several cards
+    for card in iter_cards(html, base_url=base_url):
+        try:
+            item = shopping_item_from_card(card)
+        except ValueError:
+            continue
+        if item:
+            fingerprint = product_fingerprint(item)
+            if fingerprint in seen:
+                continue
+            seen.add(fingerprint)
+            items.append(item)
+            if max_items is not None and len(items) >= max_items:
+                break
+    return items
+
+
+def parse_shopping_html_file(path: str, max_items: int | None = None, base_url: str = DEFAULT_BASE_URL) -> List[ShoppingItem]:
+    """Parses a saved Google Shopping HTML file into shopping items"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return parse_shopping_html(f.read(), max_items=max_items, base_url=base_url)
@@ -0,0 +1,130 @@
+"""
+    Latency histograms and counters for scraping, exported in Prometheus text format.
+"""
+
+import math
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple
+
+
+METRIC_PREFIX = "google_shopping_scraper"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+
+COUNTER_HELP = {
+    "retries": "Scrape attempts retried after a failure or empty result",
+    "captcha_detections": "Pages detected as CAPTCHA or block pages",
+    "items_found": "Shopping items extracted",
+}
+
+
+class Histogram:
+    """Cumulative histogram of observed durations"""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self.bucket_counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            self.bucket_counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Thread-safe registry of per-phase duration histograms and event counters"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Histogram] = {}
+        self._counters: Dict[str, float] = {name: 0 for name in COUNTER_HELP}
+
+    def observe(self, phase: str, seconds: float) -> None:
+        """Records the duration of a scrape phase"""
+        with self._lock:
+            histogram = self._histograms.get(phase)
+            if histogram is None:
+                histogram = self._histograms[phase] = Histogram()
+            histogram.observe(seconds)
+
+    def increment(self, counter: str, amount: float = 1) -> None:
+        """Increments an event counter"""
+        with self._lock:
+            self._counters[counter] = self._counters.get(counter, 0) + amount
+
+    @contextmanager
+    def timed(self, phase: str) -> Iterator[None]:
+        """Context manager recording the duration of the wrapped block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(phase, time.perf_counter() - start)
+
+    def reset(self) -> None:
+        """Clears all recorded metrics"""
+        with self._lock:
+            self._histograms.clear()
+            self._counters = {name: 0 for name in COUNTER_HELP}
+
+    def render_prometheus(self) -> str:
+        """Renders all metrics in the Prometheus text exposition format"""
+        name = f"{METRIC_PREFIX}_phase_duration_seconds"
+        lines = [
+            f"# HELP {name} Duration of scrape phases in seconds",
+            f"# TYPE {name} histogram",
+        ]
+        with self._lock:
+            for phase, histogram in sorted(self._histograms.items()):
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.bucket_counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{phase="{phase}",le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{phase="{phase}",le="+Inf"}} {histogram.count}')
+                lines.append(f'{name}_sum{{phase="{phase}"}} {histogram.sum}')
+                lines.append(f'{name}_count{{phase="{phase}"}} {histogram.count}')
+
+            for counter, value in sorted(self._counters.items()):
+                counter_name = f"{METRIC_PREFIX}_{counter}_total"
+                lines.append(f"# HELP {counter_name} {COUNTER_HELP.get(counter, counter)}")
+                lines.append(f"# TYPE {counter_name} counter")
+                lines.append(f"{counter_name} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(0, math.ceil(fraction * len(sorted_values)) - 1)]
+
+
+class PhaseTimings:
+    """Durations of the phases of a single scrape, for inspection from Python"""
+
+    def __init__(self) -> None:
+        self.spans: List[Tuple[str, float]] = []
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.spans.append((phase, seconds))
+
+    def summary(self) -> Dict[str, dict]:
+        """Returns count, total and max seconds per phase"""
+        result: Dict[str, dict] = {}
+        for phase, seconds in self.spans:
+            stats = result.setdefault(phase, {"count": 0, "total": 0.0, "max": 0.0})
+            stats["count"] += 1
+            stats["total"] += seconds
+            stats["max"] = max(stats["max"], seconds)
+        return result
+
+
+scraper_metrics = MetricsRegistry()
@@ -13,3 +13,4 @@ class ShoppingItem(BaseModel):
     url: str
     image_url: str | None
     saved_image_path: str | None
+    docid: str | None = None
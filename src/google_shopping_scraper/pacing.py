@@ -0,0 +1,137 @@
+"""
+    Pacing of the human-like delays between scraping actions.
+"""
+
+import random
+import threading
+import time
+from typing import Callable, Dict, Tuple
+
+from google_shopping_scraper.conf import google_shopping_scraper_settings
+
+
+DelayRange = Tuple[float, float]
+
+# Delay ranges in seconds for each named delay point of a scrape
+NORMAL_DELAYS: Dict[str, DelayRange] = {
+    "request": (1.0, 3.0),                # Before the first attempt of a query
+    "retry": (5.0, 10.0),                 # Before each retry of a query
+    "blocked_retry": (20.0, 40.0),        # Before retrying a query that hit a block page
+    "min_request_interval": (1.0, 1.0),   # Minimum time between two queries
+    "consent_page_load": (1.0, 2.0),      # After loading the search page, before the consent button
+    "consent_scroll": (0.5, 1.5),         # After scrolling the consent button into view
+    "consent_hover": (0.2, 0.8),          # Between hovering and clicking the consent button
+    "after_consent": (0.5, 1.5),          # After the consent flow
+    "before_extract": (1.0, 2.0),         # Before extracting products from the page
+    "page_turn": (1.0, 2.0),              # Before loading the next results page of a query
+    "page_prefetch": (0.3, 0.8),          # Between starting the parallel page loads of a deep fetch
+    "render_settle": (1.0, 1.0),          # After the first product selector appeared
+    "stability_poll": (0.5, 0.5),         # Between product count checks
+    "page_stability_poll": (1.0, 1.0),    # Between page source length checks
+    "image_load": (0.01, 0.1),            # Before reading images of a product
+    "item_gap": (0.01, 0.05),             # Between processing two products
+    "scroll_pause": (0.3, 0.7),           # After each smart scroll step
+    "human_scroll_pause": (0.5, 1.5),     # After each simulated human scroll step
+    "human_scroll_return": (1.0, 2.0),    # After scrolling back to the top
+}
+
+
+def _scaled(delays: Dict[str, DelayRange], factor: float) -> Dict[str, DelayRange]:
+    return {point: (low * factor, high * factor) for point, (low, high) in delays.items()}
+
+
+PACING_PROFILES: Dict[str, Dict[str, DelayRange]] = {
+    "stealth": _scaled(NORMAL_DELAYS, 2.0),
+    "normal": NORMAL_DELAYS,
+    "fast": {**_scaled(NORMAL_DELAYS, 0.3), "min_request_interval": (0.5, 0.5)},
+    "zero": _scaled(NORMAL_DELAYS, 0.0),
+}
+
+
+class Pacer:
+    """Draws and sleeps the delays of named delay points according to a pacing profile"""
+
+    def __init__(
+        self,
+        profile: str = "normal",
+        overrides: Dict[str, DelayRange] | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._last_request_time = 0.0
+        self.total_slept = 0.0
+        self.use_profile(profile, overrides)
+
+    def use_profile(self, profile: str, overrides: Dict[str, DelayRange] | None = None) -> None:
+        """Switches to the delays of another pacing profile, still keeping the minimum interval since the previous query"""
+        if profile not in PACING_PROFILES:
+            raise ValueError(f"Unknown pacing profile '{profile}', expected one of {tuple(PACING_PROFILES)}")
+        with self._lock:
+            self.profile = profile
+            self.delays = {**PACING_PROFILES[profile], **(overrides or {})}
+
+    def delay(self, point: str) -> float:
+        """Draws a delay in seconds for a delay point"""
+        low, high = self.delays[point]
+        return random.uniform(low, high) if high > low else low
+
+    def pause(self, point: str) -> float:
+        """Sleeps for a delay drawn for a delay point and returns it"""
+        seconds = self.delay(point)
+        if seconds > 0:
+            self._sleep(seconds)
+            self.total_slept += seconds
+        return seconds
+
+    def wait_for_request_slot(self, point: str = "request") -> float:
+        """Keeps the minimum interval since the previous query, then pauses for a request delay point"""
+        with self._lock:
+            waited = 0.0
+            time_since_last_request = time.time() - self._last_request_time
+            min_interval = self.delay("min_request_interval")
+            if time_since_last_request < min_interval:
+                waited = min_interval - time_since_last_request
+                self._sleep(waited)
+                self.total_slept += waited
+
+            waited += self.pause(point)
+            self._last_request_time = time.time()
+            return waited
+
+
+class NavigationBudget:
+    """Token bucket limiting how fast all scrapers of the process navigate to Google, shared by every browser and tab"""
+
+    def __init__(self, rate: float, burst: int = 1, sleep: Callable[[float], None] = time.sleep) -> None:
+        self.rate = rate  # Navigations per second, 0 for no limit
+        self.burst = max(1, burst)
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def acquire(self) -> float:
+        """Takes a navigation slot, sleeping until it is due. Returns the seconds waited."""
+        if not self.enabled:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Slots are reserved in arrival order, so waiters sleep without holding the lock
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+
+navigation_budget = NavigationBudget(
+    rate=google_shopping_scraper_settings.navigation_rate,
+    burst=google_shopping_scraper_settings.navigation_burst,
+)
@@ -0,0 +1,220 @@
+"""
+    Bounded pool of warm Chrome sessions for concurrent scraping.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, List
+
+from google_shopping_scraper.conf import google_shopping_scraper_settings
+from google_shopping_scraper.metrics import scraper_metrics
+from google_shopping_scraper.scraper import GoogleShoppingScraper
+
+
+class BrowserPoolTimeoutError(BaseException):
+    message = "Timed out waiting for a free browser session in the pool."
+
+
+class BrowserPoolClosedError(BaseException):
+    message = "Browser pool has been closed."
+
+
+class BrowserPool:
+    """Pool of pre-launched GoogleShoppingScraper sessions that callers check out and return"""
+
+    def __init__(
+        self,
+        logger: logging.Logger | None = None,
+        min_size: int | None = None,
+        max_size: int | None = None,
+        checkout_timeout: float | None = None,
+        health_check_interval: float | None = None,
+        fast_mode: bool = False,
+        headless: bool = True,
+        proxy: str = None,
+    ) -> None:
+        self._logger = logger if logger else logging.getLogger(__name__)
+        settings = google_shopping_scraper_settings
+        self.min_size = settings.pool_min_size if min_size is None else min_size
+        self.max_size = settings.pool_max_size if max_size is None else max_size
+        self.checkout_timeout = settings.pool_checkout_timeout if checkout_timeout is None else checkout_timeout
+        self.health_check_interval = (
+            settings.pool_health_check_interval if health_check_interval is None else health_check_interval
+        )
+        if self.max_size < 1 or self.min_size < 0 or self.min_size > self.max_size:
+            raise ValueError(f"Invalid pool size bounds: min={self.min_size}, max={self.max_size}")
+
+        self.fast_mode = fast_mode
+        self.headless = headless
+        self.proxy = proxy
+
+        self._condition = threading.Condition()
+        self._idle: List[GoogleShoppingScraper] = []  # Sessions ready to be checked out
+        self._last_checked = {}  # id(scraper) -> time of last successful health check
+        self._size = 0  # Idle + checked out + being launched
+        self._closed = False
+
+    def _create_session(self) -> GoogleShoppingScraper:
+        """Launches a new warm, consent-ready browser session"""
+        scraper = GoogleShoppingScraper(logger=self._logger, fast_mode=self.fast_mode, keep_browser_open=True)
+        scraper.warm_up(proxy=self.proxy, headless=self.headless)
+        self._mark_checked(scraper)
+        return scraper
+
+    def _mark_checked(self, scraper: GoogleShoppingScraper) -> None:
+        with self._condition:
+            self._last_checked[id(scraper)] = time.monotonic()
+
+    def _forget_checked(self, scraper: GoogleShoppingScraper) -> None:
+        with self._condition:
+            self._last_checked.pop(id(scraper), None)
+
+    def _discard_session(self, scraper: GoogleShoppingScraper) -> None:
+        """Closes a session and frees its slot in the pool"""
+        self._forget_checked(scraper)
+        scraper.close_browser()
+        with self._condition:
+            self._size -= 1
+            self._condition.notify()
+
+    def _is_healthy(self, scraper: GoogleShoppingScraper) -> bool:
+        """Checks a session if it has not been checked within the health check interval"""
+        with self._condition:
+            last_checked = self._last_checked.get(id(scraper), 0)
+        if time.monotonic() - last_checked < self.health_check_interval:
+            return True
+        # Probing the browser is a WebDriver round trip, so it runs outside the lock
+        if scraper.is_browser_alive():
+            self._mark_checked(scraper)
+            return True
+        return False
+
+    def start(self) -> None:
+        """Pre-launches browser sessions up to the minimum pool size"""
+        self._logger.info(f"Starting browser pool (min={self.min_size}, max={self.max_size})")
+        while True:
+            with self._condition:
+                if self._closed or self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                scraper = self._create_session()
+            except BaseException:
+                with self._condition:
+                    self._size -= 1
+                raise
+            self.checkin(scraper)
+
+    def checkout(self, timeout: float | None = None) -> GoogleShoppingScraper:
+        """
+        Checks out a healthy browser session, launching one if the pool has not reached its maximum size.
+
+        Raises:
+            BrowserPoolTimeoutError: If no session becomes available within the timeout.
+            BrowserPoolClosedError: If the pool has been closed.
+        """
+        timeout = self.checkout_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        while True:
+            with self._condition:
+                while not self._idle and self._size >= self.max_size and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise BrowserPoolTimeoutError
+                    self._condition.wait(remaining)
+
+                if self._closed:
+                    raise BrowserPoolClosedError
+
+                if self._idle:
+                    scraper = self._idle.pop()
+                else:
+                    scraper = None
+                    self._size += 1
+
+            if scraper is None:
+                try:
+                    return self._create_session()
+                except BaseException:
+                    with self._condition:
+                        self._size -= 1
+                        self._condition.notify()
+                    raise
+
+            if self._is_healthy(scraper):
+                return scraper
+
+            self._logger.warning("Pooled browser session failed health check, replacing it")
+            self._discard_session(scraper)
+
+    def checkin(self, scraper: GoogleShoppingScraper, discard: bool = False) -> None:
+        """Returns a checked out session to the pool, closing it if it is broken or the pool is closed"""
+        with self._condition:
+            keep = not discard and not self._closed
+            if keep:
+                self._idle.append(scraper)
+                self._condition.notify()
+        if not keep:
+            self._discard_session(scraper)
+
+    @contextmanager
+    def session(self, timeout: float | None = None) -> Iterator[GoogleShoppingScraper]:
+        """Context manager that checks out a session and returns it afterwards"""
+        with scraper_metrics.timed("pool_checkout"):
+            scraper = self.checkout(timeout=timeout)
+        try:
+            yield scraper
+        except BaseException:
+            # The session may be left on a broken page, let the next checkout verify it
+            self._forget_checked(scraper)
+            self.checkin(scraper)
+            raise
+        else:
+            self.checkin(scraper)
+
+    def health_check(self) -> int:
+        """
+        Verifies all idle sessions, replacing dead ones. Returns the number of sessions replaced.
+
+        Run periodically by the API so that idle browsers that crashed are replaced before they are checked out.
+        """
+        with self._condition:
+            idle, self._idle = self._idle, []
+
+        replaced = 0
+        for scraper in idle:
+            if scraper.is_browser_alive():
+                self._mark_checked(scraper)
+                self.checkin(scraper)
+            else:
+                replaced += 1
+                self._discard_session(scraper)
+
+        if replaced:
+            self._logger.warning(f"Replaced {replaced} dead browser sessions")
+            self.start()
+        return replaced
+
+    def stats(self) -> dict:
+        """Returns the current pool occupancy"""
+        with self._condition:
+            return {
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "min_size": self.min_size,
+                "max_size": self.max_size,
+            }
+
+    def close(self) -> None:
+        """Closes all idle sessions. Sessions still checked out are closed when they are returned."""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._condition.notify_all()
+        for scraper in idle:
+            self._discard_session(scraper)
+        self._logger.info("Browser pool closed")
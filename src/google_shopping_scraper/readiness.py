@@ -0,0 +1,125 @@
+"""
+    Detection of when a Google Shopping page is ready to be scraped, or blocked.
+"""
+
+# Signals returned by a readiness wait
+READY_PRODUCTS = "products"
+READY_BLOCKED = "blocked"
+READY_TIMEOUT = "timeout"
+
+# Any of these indicates that product results have started rendering.
+# Not [data-hveid]: Google tags the search header and filters with it before any product renders.
+PRODUCT_SELECTORS = (
+    ".gkQHve",           # Product title elements (most reliable and fast)
+    ".lmQWe",            # Price elements
+    ".sh-dgr__content",  # Main shopping results container
+)
+
+# Any of these indicates a CAPTCHA or "unusual traffic" interstitial
+BLOCKED_SELECTORS = (
+    "#captcha-form",
+    "#recaptcha",
+    "iframe[src*='recaptcha']",
+    "form[action*='/sorry/']",
+)
+BLOCKED_PATH_PREFIX = "/sorry/"
+BLOCKED_TEXT_MARKERS = ("unusual traffic", "not a robot")
+# Block pages are small, only documents with less text than this are searched for the marker texts
+BLOCKED_TEXT_MAX_LENGTH = 20000
+
+_IS_BLOCKED_FUNCTION = """
+const isBlocked = (blockedSelector, blockedPathPrefix, textMarkers, textMaxLength) => {
+    if (window.location.pathname.startsWith(blockedPathPrefix) || document.querySelector(blockedSelector)) {
+        return true;
+    }
+    const text = document.body ? document.body.textContent : '';
+    return text.length < textMaxLength && textMarkers.some((marker) => text.toLowerCase().includes(marker));
+};
+"""
+
+# Checks whether the current page is a block page in a single WebDriver round trip
+BLOCKED_CHECK_SCRIPT = _IS_BLOCKED_FUNCTION + """
+return isBlocked(...arguments);
+"""
+
+# Checks for all signals in a single WebDriver round trip, block pages first.
+# Returns null while none of them has fired yet.
+READINESS_SCRIPT = _IS_BLOCKED_FUNCTION + """
+const [productSelector, ...blockedArgs] = arguments;
+if (isBlocked(...blockedArgs)) {
+    return 'blocked';
+}
+if (document.querySelector(productSelector)) {
+    return 'products';
+}
+return null;
+"""
+
+
+def blocked_check_script_args() -> list:
+    """Returns the arguments of BLOCKED_CHECK_SCRIPT"""
+    return [", ".join(BLOCKED_SELECTORS), BLOCKED_PATH_PREFIX, list(BLOCKED_TEXT_MARKERS), BLOCKED_TEXT_MAX_LENGTH]
+
+
+def readiness_script_args() -> list:
+    """Returns the arguments of READINESS_SCRIPT"""
+    return [", ".join(PRODUCT_SELECTORS), *blocked_check_script_args()]
+
+
+# Resolves once no node matching the selector (or, without a selector, no node at all) has been added,
+# removed or changed for a quiet window, or when the maximum wait is reached.
+# Runs with execute_async_script, so the callback is the last argument.
+STABILITY_SCRIPT = """
+const [selector, quietMs, maxWaitMs, done] = arguments;
+const start = performance.now();
+let mutations = 0;
+let quietTimer = null;
+let maxTimer = null;
+let finished = false;
+
+// A mutated node is relevant if it is or lies inside a matching node, an added or removed node also if it contains one
+const insideSelector = (node) => {
+    const element = node.nodeType === Node.ELEMENT_NODE ? node : node.parentElement;
+    return !!element && !!element.closest(selector);
+};
+const containsSelector = (node) => node.nodeType === Node.ELEMENT_NODE && (node.matches(selector) || !!node.querySelector(selector));
+
+const isRelevant = (record) => {
+    if (!selector || insideSelector(record.target)) return true;
+    return [...record.addedNodes, ...record.removedNodes].some(containsSelector);
+};
+
+const finish = (stable) => {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearTimeout(quietTimer);
+    clearTimeout(maxTimer);
+    done({
+        stable: stable,
+        waited_ms: Math.round(performance.now() - start),
+        mutations: mutations,
+        count: selector ? document.querySelectorAll(selector).length : null,
+    });
+};
+
+// With a selector the DOM only counts as stable once a matching node exists, otherwise the
+// observer keeps waiting for one to be added, up to maxWaitMs
+const armQuietTimer = () => {
+    clearTimeout(quietTimer);
+    quietTimer = setTimeout(() => {
+        if (!selector || document.querySelector(selector)) finish(true);
+    }, quietMs);
+};
+
+const observer = new MutationObserver((records) => {
+    if (records.some(isRelevant)) {
+        mutations++;
+        armQuietTimer();
+    }
+});
+
+observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true, characterData: true});
+armQuietTimer();
+maxTimer = setTimeout(() => finish(false), maxWaitMs);
+"""
@@ -2,33 +2,69 @@
     Module for scraping Google Shopping.
 """
 
+import functools
 import logging
+import math
 import time
 import random
 import re
 import base64
 import os
 import json
+from collections import deque
 from urllib.parse import urlparse
 
-from typing import List
+from contextlib import closing, contextmanager
+from typing import Callable, Deque, Dict, Iterator, List
 
 from pydantic import ValidationError
 from selenium import webdriver
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.common.exceptions import NoSuchElementException, SessionNotCreatedException, TimeoutException
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
 
+from google_shopping_scraper.chromedriver import discard_resolved_chromedriver, resolve_chromedriver_path
 from google_shopping_scraper.conf import google_shopping_scraper_settings
+from google_shopping_scraper.consent import ConsentStore, consent_store
+from google_shopping_scraper.extraction import (
+    EXTRACT_CARDS_SCRIPT,
+    extract_cards_script_args,
+    product_fingerprint,
+    shopping_item_from_card,
+)
+from google_shopping_scraper.html_parser import parse_shopping_html
+from google_shopping_scraper.metrics import PhaseTimings, scraper_metrics
 from google_shopping_scraper.models import ShoppingItem
+from google_shopping_scraper.pacing import Pacer, navigation_budget
+from google_shopping_scraper.readiness import (
+    BLOCKED_CHECK_SCRIPT,
+    READINESS_SCRIPT,
+    READY_BLOCKED,
+    READY_TIMEOUT,
+    STABILITY_SCRIPT,
+    blocked_check_script_args,
+    readiness_script_args,
+)
+from google_shopping_scraper.snapshots import get_snapshot_writer
+from google_shopping_scraper.stealth import build_stealth_script
 
 
-logging.getLogger("WDM").setLevel(logging.ERROR)
+EXTRACTION_MODES = ("webdriver", "javascript", "html")
+ISOLATION_MODES = ("wipe", "context")
+
+
+def _timed_phase(phase: str):
+    """Decorator timing a GoogleShoppingScraper method as a scrape phase"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self._timed(phase):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
 
 
 class ConsentFormAcceptError(BaseException):
@@ -43,17 +79,28 @@ class DriverGetShoppingDataError(BaseException):
     message = "Unable to get Google Shopping data with Chrome webdriver."
 
 
+class BlockedPageError(BaseException):
+    message = "Google blocked the request with a CAPTCHA or unusual traffic page."
+
+
 class GoogleShoppingScraper:
     """Class for scraping Google Shopping"""
 
-    def __init__(self, logger: logging.Logger | None = None, fast_mode: bool = False, keep_browser_open: bool = False) -> None:
+    def __init__(self, logger: logging.Logger | None = None, fast_mode: bool = False, keep_browser_open: bool = False, extraction_mode: str | None = None, pacing_profile: str | None = None) -> None:
         self._logger = logger if logger else logging.getLogger(__name__)
+        self.extraction_mode = extraction_mode or google_shopping_scraper_settings.extraction_mode
+        if self.extraction_mode not in EXTRACTION_MODES:
+            raise ValueError(f"Unknown extraction mode '{self.extraction_mode}', expected one of {EXTRACTION_MODES}")
+        if google_shopping_scraper_settings.isolation_mode not in ISOLATION_MODES:
+            raise ValueError(f"Unknown isolation mode '{google_shopping_scraper_settings.isolation_mode}', expected one of {ISOLATION_MODES}")
         self._consent_button_xpath = "/html/body/c-wiz/div/div/div/div[2]/div[1]/div[3]/div[1]/div[1]/form[2]/div/div/button/span"
-        self._last_request_time = 0
+        self._pacing_profile = pacing_profile  # Explicit pacing profile, overrides fast_mode
         self.fast_mode = fast_mode  # Enable fast mode for reduced delays
         self.keep_browser_open = keep_browser_open  # Keep browser session alive
         self._driver = None  # Persistent browser session
         self._driver_config = {}  # Store driver configuration
+        self._browser_context_id = None  # CDP browser context of the query running in context isolation
+        self.timings = PhaseTimings()  # Phase durations of the latest query
         
         # Create debug directory if it doesn't exist
         self.debug_dir = "debug"
@@ -64,31 +111,57 @@ class GoogleShoppingScraper:
         if fast_mode:
             self._logger.info("Fast mode enabled - reduced delays for faster scraping")
         
+        self._logger.debug(f"Using '{self.pacer.profile}' pacing profile")
+        
         if keep_browser_open:
             self._logger.info("Browser session management enabled - browser will stay open between requests")
 
-    def _add_random_delay(self, min_delay: float = 0.5, max_delay: float = 1.5) -> None:
-        """Adds a random delay to avoid being detected as a bot - optimized for speed"""
-        if self.fast_mode:
-            min_delay = min_delay * 0.3  # Reduce delays by 70% in fast mode
-            max_delay = max_delay * 0.3
-        
-        current_time = time.time()
-        time_since_last_request = current_time - self._last_request_time
-        
-        # Reduce minimum time between requests for faster scraping
-        min_time_between_requests = 0.5 if self.fast_mode else 1.0
-        if time_since_last_request < min_time_between_requests:
-            additional_delay = min_time_between_requests - time_since_last_request
-            time.sleep(additional_delay)
-        
-        # Reduced random delay for speed
-        delay = random.uniform(min_delay, max_delay)
-        self._logger.debug(f"Adding random delay of {delay:.2f} seconds")
-        time.sleep(delay)
-        
-        self._last_request_time = time.time()
+    @contextmanager
+    def _timed(self, phase: str) -> Iterator[None]:
+        """Times a scrape phase, recording it on this scraper and in the process-wide metrics"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self.timings.add(phase, seconds)
+            scraper_metrics.observe(phase, seconds)
+
+    @property
+    def last_timings(self) -> dict:
+        """Count, total and max seconds per phase for the latest query"""
+        return self.timings.summary()
+
+    @property
+    def fast_mode(self) -> bool:
+        """Whether fast mode is enabled"""
+        return self._fast_mode
+
+    @fast_mode.setter
+    def fast_mode(self, value: bool) -> None:
+        """Enables or disables fast mode, switching to the fast pacing profile unless a profile was given"""
+        self._fast_mode = value
+        settings = google_shopping_scraper_settings
+        profile = self._pacing_profile or ("fast" if value else settings.pacing_profile)
+        if getattr(self, "pacer", None) is None:
+            self.pacer = Pacer(profile, overrides=settings.pacing_overrides)
+        elif self.pacer.profile != profile:
+            # Switching in place keeps the minimum interval since the previous query of this session,
+            # which the API relies on as it sets fast_mode on every checkout of a pooled session
+            self.pacer.use_profile(profile, overrides=settings.pacing_overrides)
+
+    def _add_random_delay(self, point: str = "request") -> None:
+        """Adds a random delay to avoid being detected as a bot, keeping a minimum interval between requests"""
+        delay = self.pacer.wait_for_request_slot(point)
+        self._logger.debug(f"Added random delay of {delay:.2f} seconds")
 
+    def _wait_for_navigation_budget(self) -> None:
+        """Waits for a slot of the process-wide navigation budget before loading a Google page"""
+        if navigation_budget.enabled:
+            with self._timed("navigation_budget"):
+                navigation_budget.acquire()
+
+    @_timed_phase("driver_init")
     def _init_chrome_driver(self, proxy: str = None, headless: bool = True) -> webdriver.Chrome:
         """Initializes Chrome webdriver with stealth options"""
         chrome_options = Options()
@@ -161,25 +234,35 @@ class GoogleShoppingScraper:
         }
         chrome_options.add_experimental_option("prefs", prefs)
         
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=chrome_options)
-        
-        # Execute stealth scripts
-        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-        driver.execute_script("Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4, 5]})")
-        driver.execute_script("Object.defineProperty(navigator, 'languages', {get: () => ['en-US', 'en']})")
-        driver.execute_script("Object.defineProperty(navigator, 'permissions', {get: () => ({query: () => Promise.resolve({state: 'granted'})})})")
-        
-        # Set a more realistic viewport
-        driver.execute_script("Object.defineProperty(screen, 'width', {get: () => 1920})")
-        driver.execute_script("Object.defineProperty(screen, 'height', {get: () => 1080})")
+        with self._timed("driver_resolve"):
+            service = Service(resolve_chromedriver_path(self._logger))
+        try:
+            driver = webdriver.Chrome(service=service, options=chrome_options)
+        except SessionNotCreatedException as e:
+            # A cached chromedriver no longer matches Chrome once Chrome has updated itself
+            if not discard_resolved_chromedriver(self._logger):
+                raise
+            self._logger.warning(f"Chromedriver does not match the installed Chrome, resolving it again: {e.msg}")
+            with self._timed("driver_resolve"):
+                service = Service(resolve_chromedriver_path(self._logger))
+            driver = webdriver.Chrome(service=service, options=chrome_options)
         
-        # Additional stealth measures
-        driver.execute_script("Object.defineProperty(navigator, 'hardwareConcurrency', {get: () => 4})")
-        driver.execute_script("Object.defineProperty(navigator, 'deviceMemory', {get: () => 8})")
+        self._inject_stealth_script(driver)
         
         return driver
 
+    def _inject_stealth_script(self, driver: webdriver.Chrome) -> None:
+        """Registers the stealth patches once so that they run before the scripts of every page"""
+        script = build_stealth_script(google_shopping_scraper_settings.stealth_profile)
+        if not script:
+            return
+        try:
+            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": script})
+        except Exception as e:
+            # Without CDP, patch at least the current document
+            self._logger.warning(f"Could not register stealth script via CDP, patching current page only: {e}")
+            driver.execute_script(script)
+
     def _get_or_create_driver(self, proxy: str = None, headless: bool = True) -> webdriver.Chrome:
         """Get existing driver or create new one if needed"""
         # Check if we should reuse existing driver
@@ -197,12 +280,41 @@ class GoogleShoppingScraper:
                 self._logger.warning(f"Existing browser session is dead, creating new one: {e}")
                 self._driver = None
         
+        # Quit a live driver with a different configuration so it is not leaked
+        if self._driver is not None:
+            self.close_browser()
+        
         # Create new driver
         self._logger.debug("Creating new browser session")
         self._driver = self._init_chrome_driver(proxy=proxy, headless=headless)
         self._driver_config = {'proxy': proxy, 'headless': headless}
         return self._driver
 
+    def warm_up(self, proxy: str = None, headless: bool = True) -> None:
+        """
+        Launches the persistent browser session ahead of the first query and makes it consent-ready.
+
+        A consent flow that fails here is only logged, the first query then runs it again.
+        """
+        if not self.keep_browser_open:
+            raise ValueError("warm_up requires keep_browser_open=True")
+        driver = self._get_or_create_driver(proxy=proxy, headless=headless)
+        try:
+            self._warm_up_consent(driver)
+        except (BlockedPageError, ConsentFormAcceptError) as e:
+            self._logger.warning(f"Could not prepare consent while warming up: {e.message}")
+
+    def is_browser_alive(self) -> bool:
+        """Checks whether the persistent browser session still responds"""
+        if self._driver is None:
+            return False
+        try:
+            self._driver.current_url
+            return True
+        except Exception:
+            return False
+
+    @_timed_phase("clear_state")
     def _clear_browser_state(self, driver: webdriver.Chrome) -> None:
         """Clear browser state between requests for better reliability"""
         try:
@@ -215,6 +327,60 @@ class GoogleShoppingScraper:
         except Exception as e:
             self._logger.debug(f"Error clearing browser state: {e}")
 
+    @_timed_phase("context_open")
+    def _open_browser_context(self, driver: webdriver.Chrome) -> dict:
+        """Opens a tab in a fresh CDP browser context of the running Chrome and switches to it"""
+        main_window = driver.current_window_handle
+        context_id = driver.execute_cdp_cmd("Target.createBrowserContext", {})["browserContextId"]
+        try:
+            target_id = driver.execute_cdp_cmd(
+                "Target.createTarget", {"url": "about:blank", "browserContextId": context_id}
+            )["targetId"]
+            # ChromeDriver uses target ids as window handles
+            driver.switch_to.window(target_id)
+        except Exception:
+            driver.execute_cdp_cmd("Target.disposeBrowserContext", {"browserContextId": context_id})
+            raise
+        
+        # Scripts registered on new documents are per tab
+        self._inject_stealth_script(driver)
+        return {"context_id": context_id, "main_window": main_window}
+
+    @_timed_phase("context_close")
+    def _close_browser_context(self, driver: webdriver.Chrome, context: dict) -> None:
+        """Returns to the main tab and disposes a browser context with all of its tabs, cookies and storage"""
+        try:
+            driver.switch_to.window(context["main_window"])
+            driver.execute_cdp_cmd("Target.disposeBrowserContext", {"browserContextId": context["context_id"]})
+        except Exception as e:
+            self._logger.debug(f"Error disposing browser context: {e}")
+
+    @contextmanager
+    def _isolated_query(self, driver: webdriver.Chrome) -> Iterator[None]:
+        """Isolates a query on a reused browser, in a fresh browser context or by wiping the browser state"""
+        if not self.keep_browser_open:
+            # A fresh browser is started for every query anyway
+            yield
+            return
+        
+        context = None
+        if google_shopping_scraper_settings.isolation_mode == "context":
+            try:
+                context = self._open_browser_context(driver)
+            except Exception as e:
+                self._logger.warning(f"Could not open a browser context, clearing browser state instead: {e}")
+        if context is None:
+            self._clear_browser_state(driver)
+        else:
+            self._browser_context_id = context["context_id"]
+        
+        try:
+            yield
+        finally:
+            if context is not None:
+                self._browser_context_id = None
+                self._close_browser_context(driver, context)
+
     def close_browser(self) -> None:
         """Manually close the browser session"""
         if self._driver:
@@ -235,48 +401,130 @@ class GoogleShoppingScraper:
             except:
                 pass
 
+    def _restore_consent_cookies(self, driver: webdriver.Chrome, consent_key: str) -> bool:
+        """Sets the stored consent cookies of an identity before navigation. Returns whether consent was restored."""
+        cookies = consent_store.get(consent_key)
+        if cookies is None:
+            return False
+        try:
+            if cookies:
+                driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+            return True
+        except Exception as e:
+            self._logger.debug(f"Could not restore consent cookies: {e}")
+            return False
+
+    def _capture_consent_cookies(self, driver: webdriver.Chrome, consent_key: str) -> None:
+        """Stores the consent cookies set by the consent flow for later sessions of the same identity"""
+        try:
+            cookies = driver.execute_cdp_cmd("Network.getAllCookies", {}).get("cookies", [])
+        except Exception as e:
+            self._logger.debug(f"Could not capture consent cookies: {e}")
+            return
+        consent_store.set(consent_key, cookies)
+
+    def _accept_consent_form(self, driver: webdriver.Chrome) -> None:
+        """Clicks the consent button of the loaded page with human-like behavior, if the form is shown"""
+        self._logger.info("Accepting consent form..")
+        
+        # Reduced delay for faster scraping
+        self.pacer.pause("consent_page_load")
+        
+        # Try to find and click consent button with human-like behavior
+        try:
+            consent_button = driver.find_element(
+                By.XPATH,
+                self._consent_button_xpath,
+            )
+            
+            # Scroll to the button if needed
+            driver.execute_script("arguments[0].scrollIntoView(true);", consent_button)
+            self.pacer.pause("consent_scroll")
+            
+            # Move mouse to button and click (more human-like)
+            actions = ActionChains(driver)
+            actions.move_to_element(consent_button)
+            self.pacer.pause("consent_hover")
+            actions.click()
+            actions.perform()
+            
+            self._logger.info("Consent form accepted successfully")
+        
+        except NoSuchElementException:
+            self._logger.warning("Consent form button not found - may not be required")
+
+    @_timed_phase("consent_warm_up")
+    def _warm_up_consent(self, driver: webdriver.Chrome) -> None:
+        """
+        Makes a fresh browser consent-ready: restores the stored consent cookies of its identity, or accepts
+        the consent form once on the search page and stores the outcome for the queries and sessions to come.
+        """
+        consent_key = ConsentStore.make_key(google_shopping_scraper_settings.region, self._driver_config.get('proxy'))
+        if self._restore_consent_cookies(driver, consent_key):
+            self._logger.debug("Consent cookies restored while warming up")
+            return
+        
+        try:
+            self._wait_for_navigation_budget()
+            with self._timed("navigate"):
+                driver.get(google_shopping_scraper_settings.get_shopping_url(""))
+            blocked = self._is_blocked_page(driver)
+            if not blocked and driver.find_elements(By.XPATH, self._consent_button_xpath):
+                self._accept_consent_form(driver)
+        except Exception as e:
+            raise ConsentFormAcceptError from e
+        
+        if blocked:
+            scraper_metrics.increment("captcha_detections")
+            raise BlockedPageError
+        
+        # Let the consent redirect finish before reading the cookies it set
+        self.pacer.pause("after_consent")
+        self._capture_consent_cookies(driver, consent_key)
+
+    @_timed_phase("consent")
     def _click_consent_button(self, driver: webdriver.Chrome, query: str) -> None:
         """Clicks google consent form with selenium Chrome webdriver using human-like behavior"""
-        self._logger.info("Accepting consent form..")
         url = google_shopping_scraper_settings.get_shopping_url(query)
+        consent_key = ConsentStore.make_key(google_shopping_scraper_settings.region, self._driver_config.get('proxy'))
+        restored = self._restore_consent_cookies(driver, consent_key)
         try:
-            driver.get(url)
+            self._wait_for_navigation_budget()
+            with self._timed("navigate"):
+                driver.get(url)
             
-            # Reduced delay for faster scraping
-            time.sleep(random.uniform(1, 2))
+            # Fail fast on a block page before any consent or rendering waits
+            if self._is_blocked_page(driver):
+                self._handle_blocked_page(driver, query)
             
-            # Try to find and click consent button with human-like behavior
-            try:
-                consent_button = driver.find_element(
-                    By.XPATH,
-                    self._consent_button_xpath,
-                )
-                
-                # Scroll to the button if needed
-                driver.execute_script("arguments[0].scrollIntoView(true);", consent_button)
-                time.sleep(random.uniform(0.5, 1.5))
-                
-                # Move mouse to button and click (more human-like)
-                actions = ActionChains(driver)
-                actions.move_to_element(consent_button)
-                time.sleep(random.uniform(0.2, 0.8))
-                actions.click()
-                actions.perform()
-                
-                self._logger.info("Consent form accepted successfully")
+            # Restored consent cookies skip the consent flow unless the form shows up anyway
+            if restored and not driver.find_elements(By.XPATH, self._consent_button_xpath):
+                self._logger.info("Consent restored from stored cookies")
+            else:
+                if restored:
+                    self._logger.info("Stored consent cookies were not accepted")
+                    consent_store.invalidate(consent_key)
+                    restored = False
                 
-            except NoSuchElementException:
-                self._logger.warning("Consent form button not found - may not be required")
+                self._accept_consent_form(driver)
                 
         except Exception as e:
             raise ConsentFormAcceptError from e
 
         # Wait for JavaScript to render the page after consent
-        self._wait_for_javascript_rendering(driver)
+        if self._wait_for_javascript_rendering(driver) == READY_BLOCKED:
+            self._handle_blocked_page(driver, query)
+        
+        if restored:
+            return
+        
+        # Remember the outcome of the consent flow, also when no consent was required
+        self._capture_consent_cookies(driver, consent_key)
         
         # Reduced delay after consent for speed
-        time.sleep(random.uniform(0.5, 1.5))
+        self.pacer.pause("after_consent")
 
+    @_timed_phase("item_extract")
     def _get_data_from_item_div(self, div) -> ShoppingItem:
         """Retrieves shopping item data from a div element and returns it as a ShoppingItem object."""
         try:
@@ -317,7 +565,7 @@ class GoogleShoppingScraper:
             image_url = None
             try:
                 # Minimal delay to allow images to load
-                time.sleep(random.uniform(0.01, 0.1))
+                self.pacer.pause("image_load")
                 
                 # Look for images in multiple ways
                 all_imgs = []
@@ -411,6 +659,13 @@ class GoogleShoppingScraper:
             except:
                 pass
 
+            # Product id of the card, if Google renders it, identifies the product across result pages
+            docid = None
+            try:
+                docid = div.get_attribute("data-docid") or None
+            except:
+                pass
+
             return ShoppingItem(
                 price=price,
                 delivery_price=delivery_price,
@@ -419,52 +674,83 @@ class GoogleShoppingScraper:
                 url=url,
                 image_url=image_url,
                 saved_image_path=None,
+                docid=docid,
             )
 
         except Exception as e:
             self._logger.debug(f"Error extracting data from item: {e}")
             return None
 
-    def _wait_for_javascript_rendering(self, driver: webdriver.Chrome, timeout: int = 8) -> None:
-        """Wait for JavaScript to render the page content before extracting HTML - optimized for speed."""
+    def _wait_for_readiness(self, driver: webdriver.Chrome, timeout: float = 8) -> str:
+        """
+        Waits until product results render or a block page is detected, whichever comes first, under one deadline.
+        Returns the signal that fired: READY_PRODUCTS, READY_BLOCKED or READY_TIMEOUT.
+        """
+        args = readiness_script_args()
+        try:
+            return WebDriverWait(driver, timeout, poll_frequency=0.25).until(
+                lambda d: d.execute_script(READINESS_SCRIPT, *args)
+            )
+        except TimeoutException:
+            return READY_TIMEOUT
+
+    @_timed_phase("render_wait")
+    def _wait_for_javascript_rendering(self, driver: webdriver.Chrome, timeout: int = 8) -> str:
+        """Wait for JavaScript to render the page content before extracting HTML - optimized for speed. Returns the readiness signal."""
         try:
             self._logger.debug("Waiting for JavaScript to render page content...")
             
-            # Wait for the main shopping results container to be present
-            wait = WebDriverWait(driver, timeout)
-            
-            # Try multiple selectors that indicate the page has loaded - prioritized by speed
-            selectors_to_wait_for = [
-                ".gkQHve",           # Product title elements (most reliable and fast)
-                ".lmQWe",            # Price elements
-                "[data-hveid]",      # Elements with Google's tracking IDs
-                ".sh-dgr__content",  # Main shopping results container
-            ]
-            
-            # Wait for at least one of these selectors to be present
-            for selector in selectors_to_wait_for:
-                try:
-                    wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
-                    self._logger.debug(f"Found element with selector: {selector}")
-                    break
-                except TimeoutException:
-                    continue
+            signal = self._wait_for_readiness(driver, timeout)
+            if signal == READY_BLOCKED:
+                self._logger.warning("Block page detected while waiting for JavaScript rendering")
+                return signal
+            if signal == READY_TIMEOUT:
+                self._logger.warning(f"Timeout waiting for JavaScript rendering after {timeout} seconds")
+                return signal
             
             # Reduced wait for dynamic content to load
-            time.sleep(1)
+            self.pacer.pause("render_settle")
             
             # Quick stability check instead of full page stability
             self._quick_stability_check(driver)
             
             self._logger.debug("JavaScript rendering wait completed")
+            return signal
             
-        except TimeoutException:
-            self._logger.warning(f"Timeout waiting for JavaScript rendering after {timeout} seconds")
         except Exception as e:
             self._logger.warning(f"Error waiting for JavaScript rendering: {e}")
+            return READY_TIMEOUT
+
+    def _wait_for_dom_quiet(self, driver: webdriver.Chrome, selector: str | None, max_wait: float) -> dict | None:
+        """
+        Waits in the page until no matching node has mutated for the configured quiet window.
+        Returns the observer result (stable, waited_ms, mutations, count), or None if the observer could not run.
+        """
+        quiet_window = google_shopping_scraper_settings.stability_quiet_window
+        # The script resolves itself by max_wait, well within WebDriver's default 30s script timeout
+        max_wait = min(max_wait, 25)
+        try:
+            result = driver.execute_async_script(STABILITY_SCRIPT, selector, quiet_window * 1000, max_wait * 1000)
+        except Exception as e:
+            self._logger.debug(f"MutationObserver stability detection failed: {e}")
+            return None
+        if not isinstance(result, dict):
+            return None
+        if result.get("stable"):
+            state = "stable"
+        elif result.get("count") == 0:
+            state = "without matching nodes"
+        else:
+            state = "still changing"
+        self._logger.debug(f"DOM {state} after {result.get('waited_ms')} ms ({result.get('mutations')} mutations)")
+        return result
 
     def _wait_for_page_stability(self, driver: webdriver.Chrome, max_wait: int = 5) -> None:
         """Wait for the page to reach a stable state with no DOM changes."""
+        if self._wait_for_dom_quiet(driver, None, max_wait) is not None:
+            return
+        
+        # Fall back to comparing page source lengths
         try:
             previous_html_length = 0
             stable_count = 0
@@ -481,15 +767,22 @@ class GoogleShoppingScraper:
                     stable_count = 0
                 
                 previous_html_length = current_html_length
-                time.sleep(1)
+                self.pacer.pause("page_stability_poll")
                 
             self._logger.debug("Page stability wait completed")
             
         except Exception as e:
             self._logger.debug(f"Error waiting for page stability: {e}")
 
+    @_timed_phase("stability_check")
     def _quick_stability_check(self, driver: webdriver.Chrome) -> None:
-        """Quick stability check for faster scraping - only 2 checks instead of 5."""
+        """Waits until product nodes stop changing, tracking the actual render time instead of fixed polls."""
+        max_wait = google_shopping_scraper_settings.stability_max_wait
+        result = self._wait_for_dom_quiet(driver, ".gkQHve", max_wait)
+        if result is not None and result.get("stable") and result.get("count"):
+            return
+        
+        # Fall back to polling the product count, which also requires products to be present
         try:
             previous_element_count = 0
             
@@ -502,63 +795,101 @@ class GoogleShoppingScraper:
                     return
                 
                 previous_element_count = current_element_count
-                time.sleep(0.5)  # Shorter wait
+                self.pacer.pause("stability_poll")
                 
             self._logger.debug("Quick stability check completed")
             
         except Exception as e:
             self._logger.debug(f"Error in quick stability check: {e}")
 
-    def _save_html_for_debug(self, driver: webdriver.Chrome, query: str) -> None:
-        """Saves the current page HTML to a file for debugging purposes after JavaScript rendering."""
+    def _should_capture_snapshot(self) -> bool:
+        """Snapshots are captured when enabled in the settings or when debug logging is effectively enabled"""
+        return google_shopping_scraper_settings.snapshot_capture or self._logger.isEnabledFor(logging.DEBUG)
+
+    @_timed_phase("debug_snapshot")
+    def _save_html_for_debug(self, driver: webdriver.Chrome, query: str, force: bool = False) -> None:
+        """Queues a snapshot of the rendered page HTML for the background writer, subject to the sample rate."""
         try:
-            # Wait for JavaScript to render the page content
-            self._wait_for_javascript_rendering(driver)
+            writer = get_snapshot_writer()
+            if not writer.should_capture(force=force):
+                return
             
             html_content = driver.page_source
-            filename = f"debug_google_shopping_{query.replace(' ', '_')}.html"
-            filepath = os.path.join(self.debug_dir, filename)
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-            self._logger.info(f"HTML content (after JavaScript rendering) saved to {filepath} for debugging")
-            
-            # Check if we hit a CAPTCHA
-            if "recaptcha" in html_content.lower() or "unusual traffic" in html_content.lower():
-                self._logger.warning("CAPTCHA detected! Google is blocking automated requests.")
-                self._logger.info("You may need to:")
-                self._logger.info("1. Wait some time before trying again")
-                self._logger.info("2. Use a VPN or different IP address")
-                self._logger.info("3. Solve the CAPTCHA manually in the browser window")
-                
+            writer.submit(query, html_content)
+            
         except Exception as e:
             self._logger.error(f"Failed to save HTML for debugging: {e}")
 
-    def _get_items_for_query(self, driver: webdriver.Chrome, query: str = "") -> List[ShoppingItem]:
+    def _is_blocked_page(self, driver: webdriver.Chrome) -> bool:
+        """Checks for a CAPTCHA or unusual traffic page by its URL and marker elements in one round trip"""
+        try:
+            return bool(driver.execute_script(BLOCKED_CHECK_SCRIPT, *blocked_check_script_args()))
+        except Exception as e:
+            self._logger.debug(f"Error checking for a block page: {e}")
+            return False
+
+    def _handle_blocked_page(self, driver: webdriver.Chrome, query: str) -> None:
+        """Records a block page, snapshots it if enabled and aborts the scrape attempt"""
+        scraper_metrics.increment("captcha_detections")
+        self._logger.warning("CAPTCHA detected! Google is blocking automated requests.")
+        self._logger.info("You may need to:")
+        self._logger.info("1. Wait some time before trying again")
+        self._logger.info("2. Use a VPN or different IP address")
+        self._logger.info("3. Solve the CAPTCHA manually in the browser window")
+        if self._should_capture_snapshot():
+            self._save_html_for_debug(driver, query, force=True)
+        raise BlockedPageError
+
+    def _get_items_for_query(self, driver: webdriver.Chrome, query: str = "", max_items: int = 5) -> List[ShoppingItem]:
         """Retrieves shopping item data from a Google Shopping page with optimized speed."""
+        return list(self._iter_items_for_query(driver, query, max_items))
+
+    def _iter_items_for_query(self, driver: webdriver.Chrome, query: str = "", max_items: int = 5) -> Iterator[ShoppingItem]:
+        """Yields up to max_items shopping items from a Google Shopping page as soon as each one is extracted."""
         self._logger.info("Scraping Google shopping page..")
         
         # Reduced delay for faster scraping
-        time.sleep(random.uniform(1, 2))
+        self.pacer.pause("before_extract")
         
         # Ensure JavaScript has rendered the page content before proceeding
-        self._wait_for_javascript_rendering(driver)
+        signal = self._wait_for_javascript_rendering(driver)
+
+        # Nothing to extract from a block page, fail fast instead of scrolling it
+        if signal == READY_BLOCKED:
+            self._handle_blocked_page(driver, query)
 
-        # Save HTML for debugging (now with fully rendered content) - only in debug mode
-        if self._logger.level <= logging.DEBUG:
+        # Snapshot the rendered page if enabled
+        if self._should_capture_snapshot():
             self._save_html_for_debug(driver, query)
 
+        # Parse the rendered page offline instead of querying elements through the driver
+        if self.extraction_mode == "html":
+            yield from self._extract_items_from_page_source(driver, max_items)
+            return
+
         # Smart scrolling - only scroll until we find enough products
-        item_data = self._smart_scroll_and_extract(driver)
+        found = 0
+        for item in self._iter_smart_scroll_and_extract(driver, max_items):
+            found += 1
+            yield item
         
-        if item_data:
-            self._logger.info(f"Successfully extracted {len(item_data)} product items")
-            return item_data
+        if found:
+            self._logger.info(f"Successfully extracted {found} product items")
+            return
 
         # Fallback: if smart scrolling didn't work, try the old method
         self._logger.warning("Smart scrolling didn't find products, trying fallback method")
         
+        if self.extraction_mode == "javascript":
+            yield from self._fallback_extract_with_script(driver, max_items)
+        else:
+            yield from self._fallback_extract_with_webdriver(driver, max_items)
+
+    def _fallback_extract_with_webdriver(self, driver: webdriver.Chrome, max_items: int = 5) -> List[ShoppingItem]:
+        """Fallback extraction of the first product containers on the page with per-element WebDriver calls"""
         # Find product containers - look for divs that contain both title and price
         items = []
+        container_ids = set()
         try:
             # Find all elements with titles first
             title_elements = driver.find_elements(By.CSS_SELECTOR, ".gkQHve.SsM98d.RmEs5b")
@@ -575,7 +906,8 @@ class GoogleShoppingScraper:
                             # Check if this parent contains a price element
                             parent.find_element(By.CSS_SELECTOR, ".lmQWe")
                             # If we found both title and price in this container, use it
-                            if parent not in items:
+                            if parent.id not in container_ids:
+                                container_ids.add(parent.id)
                                 items.append(parent)
                             break
                         except:
@@ -593,8 +925,7 @@ class GoogleShoppingScraper:
             return []
 
         # Limit the number of items to process
-        max_items = min(15, len(items))  # Process max 15 items to find top 5
-        items = items[:max_items]
+        items = items[:max_items * 3]  # Process max 3 containers per wanted product
         self._logger.info(f"Processing {len(items)} product containers")
 
         item_data = []
@@ -604,7 +935,7 @@ class GoogleShoppingScraper:
             try:
                 # Minimal delay between processing items for speed
                 if i > 0:
-                    time.sleep(random.uniform(0.01, 0.05))
+                    self.pacer.pause("item_gap")
                 
                 item = self._get_data_from_item_div(container)
                 if item:
@@ -612,9 +943,9 @@ class GoogleShoppingScraper:
                     processed_count += 1
                     self._logger.debug(f"Successfully processed item {processed_count}: {item.title[:50]}...")
                 
-                # Stop if we have enough items - limit to top 5
-                if len(item_data) >= 5:  # Limit to 5 actual products
-                    self._logger.info(f"Reached limit of 5 products, stopping processing")
+                # Stop if we have enough items
+                if len(item_data) >= max_items:
+                    self._logger.info(f"Reached limit of {max_items} products, stopping processing")
                     break
                 
             except ValidationError:
@@ -627,6 +958,61 @@ class GoogleShoppingScraper:
         self._logger.info(f"Successfully extracted {len(item_data)} product items")
         return item_data
 
+    @_timed_phase("html_extract")
+    def _extract_items_from_page_source(self, driver: webdriver.Chrome, max_items: int = 5) -> List[ShoppingItem]:
+        """Extracts products by parsing driver.page_source, scrolling once for lazy loaded cards if needed"""
+        item_data = parse_shopping_html(driver.page_source, max_items=max_items, base_url=driver.current_url)
+        
+        if len(item_data) < max_items:
+            # Scroll through the page so lazy loaded cards render, then parse again
+            viewport_height = driver.execute_script("return window.innerHeight")
+            current_position = 0
+            for _ in range(10):
+                current_position += viewport_height
+                driver.execute_script(f"window.scrollTo(0, {current_position});")
+                self.pacer.pause("scroll_pause")
+                if current_position >= driver.execute_script("return document.body.scrollHeight"):
+                    break
+            item_data = parse_shopping_html(driver.page_source, max_items=max_items, base_url=driver.current_url)
+        
+        if item_data:
+            self._logger.info(f"Successfully extracted {len(item_data)} product items from page source")
+        else:
+            self._logger.warning("No products found in page source")
+        return item_data
+
+    def _fallback_extract_with_script(self, driver: webdriver.Chrome, max_items: int = 5) -> List[ShoppingItem]:
+        """Fallback extraction of the first product cards on the page with a single execute_script call"""
+        try:
+            cards = self._extract_cards_with_script(driver)
+        except Exception as e:
+            self._logger.warning(f"Error finding items: {e}")
+            return []
+        
+        if not cards:
+            self._logger.warning("No product containers found")
+            return []
+        
+        # Process max 3 containers per wanted product, as in the WebDriver fallback
+        cards = cards[:max_items * 3]
+        self._logger.info(f"Processing {len(cards)} product containers")
+        
+        item_data = []
+        for card in cards:
+            try:
+                item = shopping_item_from_card(card)
+            except ValidationError:
+                self._logger.error("Data missing from shopping item div. Skipping..")
+                continue
+            if item:
+                item_data.append(item)
+            if len(item_data) >= max_items:
+                self._logger.info(f"Reached limit of {max_items} products, stopping processing")
+                break
+        
+        self._logger.info(f"Successfully extracted {len(item_data)} product items")
+        return item_data
+
     def _is_product_item(self, div) -> bool:
         """Check if the div element contains a product item"""
         try:
@@ -672,80 +1058,145 @@ class GoogleShoppingScraper:
             self._logger.debug(f"Error checking if item is product: {e}")
             return False
 
-    def _smart_scroll_and_extract(self, driver: webdriver.Chrome) -> List[ShoppingItem]:
+    @_timed_phase("card_script")
+    def _extract_cards_with_script(self, driver: webdriver.Chrome) -> List[dict]:
+        """Collects raw data for every product card on the page in a single execute_script round trip"""
+        return driver.execute_script(EXTRACT_CARDS_SCRIPT, *extract_cards_script_args()) or []
+
+    def _extract_visible_items_with_webdriver(self, driver: webdriver.Chrome, item_data: List[ShoppingItem], seen: set, visited: set, max_items: int = 5) -> Iterator[ShoppingItem]:
+        """
+        Extracts new products at the current scroll position with per-element WebDriver calls, yielding each one.
+
+        seen holds the fingerprints of the products extracted so far, visited the ids of the title and container
+        elements already handled, which later scroll passes skip without any WebDriver call.
+        """
+        title_elements = driver.find_elements(By.CSS_SELECTOR, ".gkQHve.SsM98d.RmEs5b")
+        
+        # Process visible products
+        for title_elem in title_elements:
+            if len(item_data) >= max_items:
+                break
+            
+            # Element ids are client-side references to the same DOM node, checking them costs no round trip
+            if title_elem.id in visited:
+                continue
+                
+            item = None
+            try:
+                # Navigate up to find the container that has both title and price
+                current = title_elem
+                container = None
+                
+                for _ in range(5):  # Look up to 5 levels up
+                    parent = current.find_element(By.XPATH, "./..")
+                    try:
+                        # Check if this parent contains a price element
+                        parent.find_element(By.CSS_SELECTOR, ".lmQWe")
+                        container = parent
+                        break
+                    except:
+                        current = parent
+                        continue
+                
+                if container:
+                    # Another title of an already processed container
+                    if container.id in visited:
+                        visited.add(title_elem.id)
+                        continue
+                    
+                    # Cards that are not fully rendered yet stay unvisited and are retried on the next pass
+                    item = self._get_data_from_item_div(container)
+                    if item:
+                        visited.update((title_elem.id, container.id))
+                        fingerprint = product_fingerprint(item)
+                        if fingerprint in seen:
+                            item = None
+                        else:
+                            seen.add(fingerprint)
+                            item_data.append(item)
+                            self._logger.info(f"Found product {len(item_data)}/{max_items}: {item.title[:50]}...")
+                            
+                            # Minimal delay between processing for speed
+                            self.pacer.pause("item_gap")
+            except:
+                continue
+            
+            # Yield outside the bare except so closing the generator is not swallowed
+            if item is not None:
+                yield item
+
+    def _extract_visible_items_with_script(self, driver: webdriver.Chrome, item_data: List[ShoppingItem], seen: set, visited: set, max_items: int = 5) -> Iterator[ShoppingItem]:
+        """Extracts new products at the current scroll position with a single execute_script call, yielding each one"""
+        for card in self._extract_cards_with_script(driver):
+            if len(item_data) >= max_items:
+                break
+            
+            if card.get("container_id") in visited:
+                continue
+            
+            try:
+                item = shopping_item_from_card(card)
+            except ValidationError:
+                self._logger.debug("Data missing from shopping item card. Skipping..")
+                continue
+            
+            if item:
+                visited.add(card.get("container_id"))
+                fingerprint = product_fingerprint(item)
+                if fingerprint in seen:
+                    continue
+                seen.add(fingerprint)
+                item_data.append(item)
+                self._logger.info(f"Found product {len(item_data)}/{max_items}: {item.title[:50]}...")
+                yield item
+
+    def _smart_scroll_and_extract(self, driver: webdriver.Chrome, max_items: int = 5) -> List[ShoppingItem]:
         """Smart scrolling that stops when we find enough products"""
+        return list(self._iter_smart_scroll_and_extract(driver, max_items))
+
+    def _iter_smart_scroll_and_extract(self, driver: webdriver.Chrome, max_items: int = 5) -> Iterator[ShoppingItem]:
+        """Smart scrolling that yields products as they are found and stops when we find enough"""
         try:
             item_data = []
+            seen = set()  # Fingerprints of the extracted products
+            visited = set()  # Title / container element ids, or card container ids, already handled
             viewport_height = driver.execute_script("return window.innerHeight")
             current_position = 0
-            scroll_increment = viewport_height // 3
-            max_scrolls = 10  # Limit scrolling attempts
+            # Every pass reads all rendered cards, so deeper result sets scroll in larger steps
+            scroll_increment = viewport_height // 3 if max_items <= 5 else viewport_height * 2 // 3
+            max_scrolls = 10 * math.ceil(max_items / 5)  # Limit scrolling attempts
             scroll_count = 0
             
-            self._logger.info("Starting smart scrolling to find products...")
+            self._logger.info(f"Starting smart scrolling to find products ({self.extraction_mode} extraction)...")
             
-            while len(item_data) < 5 and scroll_count < max_scrolls:
+            while len(item_data) < max_items and scroll_count < max_scrolls:
                 # Check for products at current position
                 try:
-                    title_elements = driver.find_elements(By.CSS_SELECTOR, ".gkQHve.SsM98d.RmEs5b")
-                    
-                    # Process visible products
-                    for title_elem in title_elements:
-                        if len(item_data) >= 5:
-                            break
-                            
-                        try:
-                            # Navigate up to find the container that has both title and price
-                            current = title_elem
-                            container = None
-                            
-                            for _ in range(5):  # Look up to 5 levels up
-                                parent = current.find_element(By.XPATH, "./..")
-                                try:
-                                    # Check if this parent contains a price element
-                                    parent.find_element(By.CSS_SELECTOR, ".lmQWe")
-                                    container = parent
-                                    break
-                                except:
-                                    current = parent
-                                    continue
-                            
-                            if container:
-                                # Check if we already processed this container
-                                container_id = container.get_attribute("data-hveid") or str(hash(container.text[:100]))
-                                processed_ids = [getattr(item, '_container_id', None) for item in item_data]
-                                
-                                if container_id not in processed_ids:
-                                    item = self._get_data_from_item_div(container)
-                                    if item:
-                                        item._container_id = container_id  # Mark as processed
-                                        item_data.append(item)
-                                        self._logger.info(f"Found product {len(item_data)}/5: {item.title[:50]}...")
-                                        
-                                        # Minimal delay between processing for speed
-                                        time.sleep(random.uniform(0.01, 0.05))
-                        except:
-                            continue
+                    if self.extraction_mode == "javascript":
+                        yield from self._extract_visible_items_with_script(driver, item_data, seen, visited, max_items)
+                    else:
+                        yield from self._extract_visible_items_with_webdriver(driver, item_data, seen, visited, max_items)
                 
                 except Exception as e:
                     self._logger.debug(f"Error checking products at position {current_position}: {e}")
                 
                 # If we have enough products, stop scrolling
-                if len(item_data) >= 5:
-                    self._logger.info("Found 5 products, stopping smart scroll")
+                if len(item_data) >= max_items:
+                    self._logger.info(f"Found {max_items} products, stopping smart scroll")
                     break
                 
-                # Scroll down a bit more
-                scroll_amount = random.randint(scroll_increment - 50, scroll_increment + 50)
-                current_position += scroll_amount
-                driver.execute_script(f"window.scrollTo(0, {current_position});")
-                
-                # Reduced pause between scrolls for speed
-                time.sleep(random.uniform(0.3, 0.7))
-                scroll_count += 1
-                
-                # Check if we've reached the bottom
-                page_height = driver.execute_script("return document.body.scrollHeight")
+                with self._timed("scroll_step"):
+                    # Scroll down a bit more
+                    scroll_amount = random.randint(scroll_increment - 50, scroll_increment + 50)
+                    current_position += scroll_amount
+                    driver.execute_script(f"window.scrollTo(0, {current_position});")
+                    
+                    # Reduced pause between scrolls for speed
+                    self.pacer.pause("scroll_pause")
+                    scroll_count += 1
+                    
+                    # Check if we've reached the bottom
+                    page_height = driver.execute_script("return document.body.scrollHeight")
                 if current_position >= page_height:
                     self._logger.info("Reached bottom of page")
                     break
@@ -755,11 +1206,8 @@ class GoogleShoppingScraper:
             else:
                 self._logger.warning(f"Smart scrolling found no products after {scroll_count} scrolls")
             
-            return item_data
-            
         except Exception as e:
             self._logger.warning(f"Error during smart scrolling: {e}")
-            return []
 
     def _simulate_human_scrolling(self, driver: webdriver.Chrome) -> None:
         """Simulates human-like scrolling behavior (fallback method)"""
@@ -780,7 +1228,7 @@ class GoogleShoppingScraper:
                 driver.execute_script(f"window.scrollTo(0, {current_position});")
                 
                 # Random pause between scrolls
-                time.sleep(random.uniform(0.5, 1.5))
+                self.pacer.pause("human_scroll_pause")
                 
                 # Update page height in case content loaded dynamically
                 page_height = driver.execute_script("return document.body.scrollHeight")
@@ -791,14 +1239,14 @@ class GoogleShoppingScraper:
             
             # Scroll back to top
             driver.execute_script("window.scrollTo(0, 0);")
-            time.sleep(random.uniform(1, 2))
+            self.pacer.pause("human_scroll_return")
             
         except Exception as e:
             self._logger.warning(f"Error during scrolling simulation: {e}")
 
 
 
-    def get_shopping_data_for_query(self, query: str, max_retries: int = 3, proxy: str = None, headless: bool = True) -> List[ShoppingItem]:
+    def get_shopping_data_for_query(self, query: str, max_retries: int = 3, proxy: str = None, headless: bool = True, on_item: Callable[[ShoppingItem], None] | None = None, max_items: int | None = None, max_pages: int | None = None, deep_fetch: bool | None = None) -> List[ShoppingItem]:
         """
         Retrieves a list of shopping items in Google Shopping for a query with stealth measures.
 
@@ -807,6 +1255,10 @@ class GoogleShoppingScraper:
             max_retries: Maximum number of retry attempts if scraping fails
             proxy: Optional proxy server (format: "ip:port" or "protocol://ip:port")
             headless: Whether to run browser in headless mode (default: True)
+            on_item: Optional callback called with each item as soon as it is extracted
+            max_items: Maximum number of items to collect (default: from settings)
+            max_pages: Maximum number of results pages to follow (default: from settings)
+            deep_fetch: Whether to load the results pages in parallel tabs (default: from settings)
 
         Returns:
             List[ShoppingItem]: A list of ShoppingItem objects.
@@ -814,47 +1266,120 @@ class GoogleShoppingScraper:
             ConsentFormAcceptError: If the Google consent form cannot be accepted.
             DriverInitializationError: If the Chrome webdriver cannot be initialized.
             DriverGetShoppingDataError: If the shopping data cannot be scraped from the Google Shopping site.
+            BlockedPageError: If Google answers with a CAPTCHA or unusual traffic page on the last attempt.
+        """
+        items = []
+        for item in self.iter_shopping_data(query, max_retries=max_retries, proxy=proxy, headless=headless, max_items=max_items, max_pages=max_pages, deep_fetch=deep_fetch):
+            items.append(item)
+            if on_item:
+                on_item(item)
+        return items
+
+    def iter_shopping_data(self, query: str, max_retries: int = 3, proxy: str = None, headless: bool = True, max_items: int | None = None, max_pages: int | None = None, deep_fetch: bool | None = None) -> Iterator[ShoppingItem]:
+        """
+        Yields shopping items in Google Shopping for a query as soon as each one is extracted.
+
+        Breaking out of the loop or closing the generator stops scrolling and releases the browser.
+        Attempts are only retried while no item has been yielded yet.
+
+        Args:
+            query: The search query string
+            max_retries: Maximum number of retry attempts if scraping fails
+            proxy: Optional proxy server (format: "ip:port" or "protocol://ip:port")
+            headless: Whether to run browser in headless mode (default: True)
+            max_items: Maximum number of items to yield (default: from settings)
+            max_pages: Maximum number of results pages to follow (default: from settings)
+            deep_fetch: Whether to load the results pages in parallel tabs (default: from settings)
+
+        Raises:
+            ConsentFormAcceptError: If the Google consent form cannot be accepted.
+            DriverInitializationError: If the Chrome webdriver cannot be initialized.
+            DriverGetShoppingDataError: If the shopping data cannot be scraped from the Google Shopping site.
+            BlockedPageError: If Google answers with a CAPTCHA or unusual traffic page on the last attempt.
         """
+        settings = google_shopping_scraper_settings
+        max_items = settings.max_items if max_items is None else max_items
+        max_pages = settings.max_pages if max_pages is None else max_pages
+        deep_fetch = settings.deep_fetch if deep_fetch is None else deep_fetch
+        if max_items < 1 or max_pages < 1:
+            raise ValueError(f"Invalid result limits: max_items={max_items}, max_pages={max_pages}")
+        
         self._logger.info(f"Retrieving shopping items for query '{query}' with stealth measures..")
+        self.timings = PhaseTimings()
         
+        with self._timed("query"):
+            yield from self._iter_shopping_data_with_retries(query, max_retries, proxy, headless, max_items, max_pages, deep_fetch)
+
+    def _iter_shopping_data_with_retries(self, query: str, max_retries: int, proxy: str, headless: bool, max_items: int = 5, max_pages: int = 1, deep_fetch: bool = False) -> Iterator[ShoppingItem]:
+        """Runs scrape attempts for a query until one yields items or the retries are exhausted"""
+        blocked = False
         for attempt in range(max_retries):
             try:
                 # Add delay before each attempt
                 if attempt > 0:
                     self._logger.info(f"Retry attempt {attempt + 1}/{max_retries}")
-                    self._add_random_delay(5.0, 10.0)  # Longer delay for retries
+                    scraper_metrics.increment("retries")
+                    with self._timed("retry_delay"):
+                        # Back off longer after a block page
+                        self._add_random_delay("blocked_retry" if blocked else "retry")
                 else:
-                    self._add_random_delay(1.0, 3.0)
+                    with self._timed("request_delay"):
+                        self._add_random_delay("request")
                 
-                driver = self._get_or_create_driver(proxy=proxy, headless=headless)
+                with self._timed("driver_acquire"):
+                    driver = self._get_or_create_driver(proxy=proxy, headless=headless)
                 
+                found = 0
                 try:
-                    # Clear browser state if reusing browser
-                    self._clear_browser_state(driver)
+                    # Isolate the query from previous ones if reusing browser
+                    with self._isolated_query(driver):
+                        self._click_consent_button(driver, query)
+                        # Closing the item generator right away stops scrolling when the consumer stops early
+                        with closing(self._iter_result_pages(driver, query, max_items, max_pages, deep_fetch)) as items:
+                            for item in items:
+                                found += 1
+                                scraper_metrics.increment("items_found")
+                                yield item
                     
-                    self._click_consent_button(driver, query)
-                    items = self._get_items_for_query(driver, query)
-                    
-                    if items:
-                        self._logger.info(f"Successfully scraped {len(items)} items")
-                        return items
+                    if found:
+                        self._logger.info(f"Successfully scraped {found} items")
+                        return
                     else:
                         self._logger.warning("No items found, this might indicate detection")
                         if attempt < max_retries - 1:
                             continue
                         
+                except BlockedPageError:
+                    self._logger.warning(f"Blocked on scraping attempt {attempt + 1}")
+                    blocked = True
+                    if found:
+                        # Blocked on a later results page, items already handed out cannot be taken back
+                        self._logger.warning(f"Stopping pagination after {found} items")
+                        if self.keep_browser_open:
+                            self.close_browser()
+                        return
+                    if attempt < max_retries - 1 and google_shopping_scraper_settings.retry_on_blocked:
+                        # The blocked session is not reused, the next attempt starts a fresh browser
+                        if self.keep_browser_open:
+                            self.close_browser()
+                        continue
+                    raise
                 except Exception as e:
                     self._logger.error(f"Error during scraping attempt {attempt + 1}: {e}")
-                    if attempt < max_retries - 1:
+                    # Items already handed out cannot be taken back, so only retry an attempt that yielded nothing
+                    if not found and attempt < max_retries - 1:
                         continue
                     raise DriverGetShoppingDataError from e
                 finally:
                     # Only close driver if not keeping browser open
                     if not self.keep_browser_open:
-                        try:
-                            driver.quit()  # Use quit() instead of close() for cleaner shutdown
-                        except:
-                            pass
+                        with self._timed("teardown"):
+                            try:
+                                driver.quit()  # Use quit() instead of close() for cleaner shutdown
+                            except:
+                                pass
+                        self._driver = None
+                        self._driver_config = {}
                         
             except Exception as e:
                 if attempt < max_retries - 1:
@@ -867,3 +1392,236 @@ class GoogleShoppingScraper:
         
         # If we get here, all attempts failed
         raise DriverGetShoppingDataError("All retry attempts failed")
+
+    def _iter_result_pages(self, driver: webdriver.Chrome, query: str, max_items: int, max_pages: int, deep_fetch: bool = False) -> Iterator[ShoppingItem]:
+        """
+        Yields items of the loaded results page, then follows start= pagination until max_items or max_pages is reached.
+        With deep_fetch, the further pages max_items needs are loaded in parallel tabs while the first one is extracted.
+        Products repeated on a later page are skipped.
+        """
+        settings = google_shopping_scraper_settings
+        seen = set()  # Fingerprints of every yielded item
+        found = 0
+        main_window = driver.current_window_handle
+        tabs = []
+        try:
+            if deep_fetch:
+                deep_pages = min(max_pages, math.ceil(max_items / settings.results_page_size))
+                tabs = self._open_pipeline_tabs(driver, deep_pages - 1)
+                for page, tab in enumerate(tabs, 1):
+                    self._prefetch_results_page(driver, tab, query, page * settings.results_page_size)
+                driver.switch_to.window(main_window)
+                if tabs:
+                    self._logger.info(f"Loading results pages 2-{len(tabs) + 1} in parallel tabs")
+            
+            for page in range(max_pages):
+                if page > 0:
+                    if page <= len(tabs):
+                        driver.switch_to.window(tabs[page - 1])
+                        if not self._wait_for_navigation_commit(driver):
+                            self._logger.warning(f"Results page {page + 1} did not start loading, stopping pagination")
+                            return
+                    else:
+                        self.pacer.pause("page_turn")
+                        self._wait_for_navigation_budget()
+                        with self._timed("navigate"):
+                            driver.get(settings.get_shopping_url(query, start=page * settings.results_page_size))
+                    if self._is_blocked_page(driver):
+                        self._handle_blocked_page(driver, query)
+                
+                page_found = 0
+                start = time.perf_counter()
+                with self._timed("results_page"):
+                    with closing(self._iter_items_for_query(driver, query, max_items - found)) as items:
+                        for item in items:
+                            page_found += 1
+                            fingerprint = product_fingerprint(item)
+                            if fingerprint in seen:
+                                continue
+                            seen.add(fingerprint)
+                            found += 1
+                            yield item
+                self._logger.info(f"Results page {page + 1}: {page_found} items in {time.perf_counter() - start:.2f}s")
+                
+                # An empty page means the results ran out
+                if found >= max_items or not page_found:
+                    return
+        finally:
+            if tabs:
+                self._close_pipeline_tabs(driver, tabs, main_window)
+
+    def get_shopping_data_for_queries(self, queries: List[str], pipeline_depth: int | None = None, proxy: str = None, headless: bool = True, on_result: Callable[[str, List[ShoppingItem]], None] | None = None, max_items: int | None = None) -> Dict[str, List[ShoppingItem]]:
+        """
+        Retrieves shopping items for many queries with one browser, loading upcoming queries in other tabs
+        while the current one is being extracted.
+
+        On a reused browser the batch is isolated from earlier queries like a single query, by the
+        isolation_mode setting. The queries of one batch share its cookies and storage though: their tabs
+        load at the same time, so wiping the state or switching the browser context for one of them
+        would disturb the queries still loading in the others, and they share the consent cookies.
+
+        Args:
+            queries: The search query strings
+            pipeline_depth: Number of tabs with a query loading or loaded at the same time (default: from settings)
+            proxy: Optional proxy server (format: "ip:port" or "protocol://ip:port")
+            headless: Whether to run browser in headless mode (default: True)
+            on_result: Optional callback called with each query and its items as soon as the query is done
+            max_items: Maximum number of items per query, from its first results page (default: from settings)
+
+        Returns:
+            Dict[str, List[ShoppingItem]]: The items of each query, empty for queries that failed.
+        Raises:
+            DriverInitializationError: If the Chrome webdriver cannot be initialized.
+            ConsentFormAcceptError: If the consent form of the first query cannot be accepted, stopping the batch.
+            BlockedPageError: If Google answers with a CAPTCHA or unusual traffic page, stopping the batch.
+        """
+        settings = google_shopping_scraper_settings
+        depth = settings.pipeline_depth if pipeline_depth is None else pipeline_depth
+        max_items = settings.max_items if max_items is None else max_items
+        if depth < 1:
+            raise ValueError(f"Pipeline depth must be at least 1, got {depth}")
+        if max_items < 1:
+            raise ValueError(f"Invalid result limit: max_items={max_items}")
+        
+        self._logger.info(f"Retrieving shopping items for {len(queries)} queries with pipeline depth {depth}..")
+        self.timings = PhaseTimings()
+        results: Dict[str, List[ShoppingItem]] = {}
+        pending = deque(queries)
+        
+        def deliver(query: str, items: List[ShoppingItem]) -> None:
+            scraper_metrics.increment("items_found", len(items))
+            results[query] = items
+            self._logger.info(f"Scraped {len(items)} items for query '{query}' ({len(results)}/{len(queries)})")
+            if on_result:
+                on_result(query, items)
+        
+        try:
+            with self._timed("driver_acquire"):
+                driver = self._get_or_create_driver(proxy=proxy, headless=headless)
+        except Exception as e:
+            raise DriverInitializationError from e
+        
+        try:
+            # Isolate the batch from previous queries if reusing browser
+            with self._isolated_query(driver):
+                self._run_query_pipeline(driver, pending, depth, proxy, max_items, deliver)
+        finally:
+            if not self.keep_browser_open:
+                with self._timed("teardown"):
+                    self.close_browser()
+        
+        return results
+
+    def _run_query_pipeline(self, driver: webdriver.Chrome, pending: Deque[str], depth: int, proxy: str, max_items: int, deliver: Callable[[str, List[ShoppingItem]], None]) -> None:
+        """Scrapes the pending queries in up to depth tabs of the current browser context, delivering each one's items"""
+        settings = google_shopping_scraper_settings
+        main_window = driver.current_window_handle
+        tabs = [main_window]
+        try:
+            # Without stored consent, the first query goes through the consent flow so the other tabs share its cookies
+            consent_key = ConsentStore.make_key(settings.region, proxy)
+            if pending and consent_store.get(consent_key) is None:
+                query = pending.popleft()
+                with self._timed("request_delay"):
+                    self._add_random_delay("request")
+                try:
+                    self._click_consent_button(driver, query)
+                    deliver(query, self._get_items_for_query(driver, query, max_items))
+                except (BlockedPageError, ConsentFormAcceptError):
+                    raise
+                except Exception as e:
+                    self._logger.error(f"Error scraping query '{query}': {e}")
+                    deliver(query, [])
+            else:
+                self._restore_consent_cookies(driver, consent_key)
+            
+            tabs += self._open_pipeline_tabs(driver, min(depth, len(pending)) - 1)
+            
+            # Start loading a query in every tab, then extract them in order, refilling each tab once it is done
+            in_flight = deque()  # (query, tab) in navigation order
+            for tab in tabs:
+                if pending:
+                    query = pending.popleft()
+                    self._prefetch_query(driver, tab, query)
+                    in_flight.append((query, tab))
+            
+            while in_flight:
+                query, tab = in_flight.popleft()
+                driver.switch_to.window(tab)
+                try:
+                    with self._timed("pipeline_query"):
+                        if not self._wait_for_navigation_commit(driver):
+                            raise TimeoutException(f"Navigation to the results of query '{query}' did not start")
+                        if self._is_blocked_page(driver):
+                            self._handle_blocked_page(driver, query)
+                        items = self._get_items_for_query(driver, query, max_items)
+                except BlockedPageError:
+                    raise
+                except Exception as e:
+                    self._logger.error(f"Error scraping query '{query}': {e}")
+                    items = []
+                deliver(query, items)
+                
+                if pending:
+                    query = pending.popleft()
+                    self._prefetch_query(driver, tab, query)
+                    in_flight.append((query, tab))
+        finally:
+            self._close_pipeline_tabs(driver, tabs[1:], main_window)
+
+    def _open_pipeline_tabs(self, driver: webdriver.Chrome, count: int) -> List[str]:
+        """Opens extra tabs for pipelined queries or results pages and returns their window handles"""
+        tabs = []
+        for _ in range(count):
+            if self._browser_context_id:
+                # Tabs of an isolated query share its browser context, and so its consent cookies
+                target_id = driver.execute_cdp_cmd(
+                    "Target.createTarget", {"url": "about:blank", "browserContextId": self._browser_context_id}
+                )["targetId"]
+                driver.switch_to.window(target_id)
+            else:
+                driver.switch_to.new_window("tab")
+            # Scripts registered on new documents are per tab
+            self._inject_stealth_script(driver)
+            tabs.append(driver.current_window_handle)
+        return tabs
+
+    def _close_pipeline_tabs(self, driver: webdriver.Chrome, tabs: List[str], main_window: str) -> None:
+        """Closes the extra pipeline tabs and returns to the main tab"""
+        try:
+            for tab in tabs:
+                driver.switch_to.window(tab)
+                driver.close()
+            driver.switch_to.window(main_window)
+        except Exception as e:
+            self._logger.debug(f"Error closing pipeline tabs: {e}")
+
+    def _prefetch_query(self, driver: webdriver.Chrome, tab: str, query: str) -> None:
+        """Starts loading a query in a tab without waiting for the page to load"""
+        driver.switch_to.window(tab)
+        # A refilled tab keeps showing its previous query until the new navigation commits,
+        # so blank it first to tell the two apart
+        driver.get("about:blank")
+        with self._timed("request_delay"):
+            self._add_random_delay("request")
+        self._wait_for_navigation_budget()
+        with self._timed("navigate"):
+            driver.execute_script("window.location.href = arguments[0];", google_shopping_scraper_settings.get_shopping_url(query))
+
+    @_timed_phase("navigation_commit")
+    def _wait_for_navigation_commit(self, driver: webdriver.Chrome, timeout: float = 8) -> bool:
+        """Waits until a prefetching tab has left about:blank for its new page. Returns whether it did in time."""
+        try:
+            WebDriverWait(driver, timeout, poll_frequency=0.1).until(lambda d: d.current_url != "about:blank")
+            return True
+        except TimeoutException:
+            return False
+
+    def _prefetch_results_page(self, driver: webdriver.Chrome, tab: str, query: str, start: int) -> None:
+        """Starts loading a later results page of a query in a tab without waiting for the page to load"""
+        driver.switch_to.window(tab)
+        # A short stagger instead of a full page turn delay, the page loads overlap anyway
+        self.pacer.pause("page_prefetch")
+        self._wait_for_navigation_budget()
+        with self._timed("navigate"):
+            driver.execute_script("window.location.href = arguments[0];", google_shopping_scraper_settings.get_shopping_url(query, start=start))
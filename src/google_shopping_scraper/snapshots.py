@@ -0,0 +1,132 @@
+"""
+    Background writer for HTML snapshots of scraped pages, with sampling and a disk quota.
+"""
+
+import atexit
+import logging
+import os
+import queue
+import random
+import re
+import threading
+from typing import Dict
+
+from google_shopping_scraper.conf import google_shopping_scraper_settings
+
+
+SNAPSHOT_PREFIX = "debug_google_shopping_"
+
+
+def safe_filename_part(query: str) -> str:
+    """Turns a query into part of a file name, replacing path separators and other unsafe characters with '_'"""
+    return re.sub(r"[^\w.-]+", "_", query).strip("_.") or "query"
+
+
+class SnapshotWriter:
+    """Writes page snapshots from a background thread, deleting the oldest ones to stay within a disk quota"""
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int,
+        sample_rate: float = 1.0,
+        max_pending: int = 32,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        self._logger = logger if logger else logging.getLogger(__name__)
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.sample_rate = sample_rate
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._sizes: Dict[str, int] = {}  # path -> size of snapshots on disk
+        self.written = 0
+        self.dropped = 0
+
+        os.makedirs(directory, exist_ok=True)
+        for name in os.listdir(directory):
+            path = os.path.join(directory, name)
+            if name.startswith(SNAPSHOT_PREFIX) and os.path.isfile(path):
+                self._sizes[path] = os.path.getsize(path)
+
+        self._thread = threading.Thread(target=self._run, name="snapshot-writer", daemon=True)
+        self._thread.start()
+
+    def should_capture(self, force: bool = False) -> bool:
+        """Decides whether a page is sampled for a snapshot"""
+        return force or random.random() < self.sample_rate
+
+    def submit(self, query: str, html: str) -> bool:
+        """Queues a snapshot for writing without blocking. Returns False if it was dropped."""
+        filename = f"{SNAPSHOT_PREFIX}{safe_filename_part(query)}.html"
+        try:
+            self._queue.put_nowait((os.path.join(self.directory, filename), html))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            self._logger.debug(f"Snapshot writer busy, dropped snapshot for '{query}'")
+            return False
+
+    def flush(self) -> None:
+        """Blocks until all queued snapshots are written"""
+        self._queue.join()
+
+    def _run(self) -> None:
+        while True:
+            path, html = self._queue.get()
+            try:
+                self._write(path, html)
+            except Exception as e:
+                self._logger.error(f"Failed to write snapshot {path}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _write(self, path: str, html: str) -> None:
+        data = html.encode("utf-8")
+        if len(data) > self.max_bytes:
+            self.dropped += 1
+            self._logger.warning(f"Snapshot {path} exceeds the snapshot disk quota, skipped")
+            return
+
+        # An existing snapshot of the same query is overwritten, so its size no longer counts
+        self._sizes.pop(path, None)
+        self._evict(self.max_bytes - len(data))
+
+        with open(path, "wb") as f:
+            f.write(data)
+        self._sizes[path] = len(data)
+        self.written += 1
+        self._logger.info(f"HTML snapshot saved to {path}")
+
+    def _evict(self, budget: int) -> None:
+        """Deletes the oldest snapshots until the remaining ones fit in the budget"""
+        total = sum(self._sizes.values())
+        if total <= budget:
+            return
+        for path in sorted(self._sizes, key=lambda p: os.path.getmtime(p) if os.path.exists(p) else 0):
+            size = self._sizes.pop(path)
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            if total <= budget:
+                return
+
+
+_writer: SnapshotWriter | None = None
+_writer_lock = threading.Lock()
+
+
+def get_snapshot_writer() -> SnapshotWriter:
+    """Returns the snapshot writer shared by all scrapers of the process"""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            settings = google_shopping_scraper_settings
+            _writer = SnapshotWriter(
+                directory=settings.snapshot_dir,
+                max_bytes=settings.snapshot_max_bytes,
+                sample_rate=settings.snapshot_sample_rate,
+            )
+            atexit.register(_writer.flush)
+        return _writer
@@ -0,0 +1,367 @@
+"""
+    Local stand-in for Google Shopping, serving synthetic result pages with latency, consent, CAPTCHA
+    and layout faults, for load-testing the scraper without touching Google.
+
+    Run standalone with `python -m google_shopping_scraper.standin` and point the `url` setting at it.
+"""
+
+import argparse
+import html
+import json
+import logging
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+from urllib.parse import parse_qs, quote, urlparse
+
+
+# Class names of the card elements per layout. "aria_price" hides the price text behind the
+# aria-label, "legacy" uses older class names the extractors do not know.
+LAYOUTS: Dict[str, Dict[str, str]] = {
+    "standard": {"container": "sh-dgr__content", "title": "gkQHve SsM98d RmEs5b", "price": "lmQWe"},
+    "aria_price": {"container": "sh-dgr__content", "title": "gkQHve SsM98d RmEs5b", "price": "lmQWe"},
+    "legacy": {"container": "sh-dgr__grid-result", "title": "tAxDx", "price": "XrAfOe"},
+}
+
+CONSENT_COOKIE = "SOCS"
+BLOCKED_TEXT = "Our systems have detected unusual traffic from your computer network."
+
+# 1x1 transparent GIF, served inline like Google's base64 product thumbnails
+_THUMBNAIL = "data:image/gif;base64,R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7"
+
+_ADJECTIVES = ("Classic", "Premium", "Compact", "Deluxe", "Eco", "Pro", "Mini", "Ultra", "Smart", "Value")
+_STORES = ("Walmart", "Target", "Best Buy", "eBay", "Amazon.com", "Etsy")
+
+# Cards are inserted by a script after the render delay, more of them whenever the page is scrolled
+# near its bottom, like Google's lazily rendered result grid
+_RESULTS_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title} - Google Shopping</title>
+<style>
+body {{ margin: 0; font-family: arial, sans-serif; }}
+.sh-pr__row {{ display: flex; height: 240px; border-bottom: 1px solid #eee; }}
+.sh-pr__img img {{ width: 160px; height: 160px; }}
+</style></head>
+<body><div id="search"><div id="res" class="sh-pr__product-results-grid"></div></div>
+<script>
+const cards = {cards};
+const res = document.getElementById('res');
+let rendered = 0;
+let loading = false;
+const render = (count) => {{
+    res.insertAdjacentHTML('beforeend', cards.slice(rendered, rendered + count).join(''));
+    rendered = Math.min(cards.length, rendered + count);
+    loading = false;
+}};
+setTimeout(() => render({initial_cards}), {render_delay_ms});
+window.addEventListener('scroll', () => {{
+    if (loading || rendered === 0 || rendered >= cards.length) return;
+    if (window.scrollY + window.innerHeight >= document.body.scrollHeight - 400) {{
+        loading = true;
+        setTimeout(() => render({lazy_batch}), {lazy_delay_ms});
+    }}
+}});
+</script></body></html>
+"""
+
+_CARD = (
+    '<div class="sh-pr__row"><div class="sh-pr__img"><img src="{image}" alt=""></div>'
+    '<div class="{container}" data-hveid="{hveid}"><a href="/shopping/product/{product_id}">'
+    '<div class="{title_class}">{title}</div></a>'
+    '<span class="{price_class}" aria-label="Current price: {price}">{price_text}</span>'
+    '<span class="ybnj7e">{delivery}</span><span class="yi40Hd">{rating}</span>'
+    '<div class="aULzUe">{store}</div></div></div>'
+)
+
+# Mirrors the structure that GoogleShoppingScraper's consent button XPath expects
+_CONSENT_FORM = (
+    '<form action="/consent/save" method="post"><input type="hidden" name="continue" value="{continue_url}">'
+    '<div><div><button type="submit"><span>{label}</span></button></div></div></form>'
+)
+_CONSENT_PAGE = (
+    '<!DOCTYPE html><html><head><meta charset="utf-8"><title>Before you continue to Google</title></head>'
+    '<body><c-wiz><div><div><div><div></div><div><div><div></div><div></div><div><div><div>'
+    "<h1>Before you continue to Google</h1>{reject}{accept}"
+    "</div></div></div></div></div></div></div></div></c-wiz></body></html>"
+)
+
+_BLOCKED_PAGE = (
+    '<!DOCTYPE html><html><head><meta charset="utf-8"><title>Sorry...</title></head><body>'
+    '<form id="captcha-form" action="/sorry/index" method="post"><div id="recaptcha"></div>'
+    '<input type="hidden" name="continue" value="{continue_url}"></form>'
+    "<p>{text}</p><p>This page checks to see if it's really you sending the requests, and not a robot.</p>"
+    "</body></html>"
+)
+
+
+def parse_layout_weights(value: str) -> Dict[str, float]:
+    """Parses layout weights like "standard=0.8,legacy=0.2" """
+    weights = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in LAYOUTS:
+            raise ValueError(f"Unknown layout '{name}', expected one of {tuple(LAYOUTS)}")
+        weights[name] = float(weight) if weight else 1.0
+    return weights
+
+
+class StandInServer:
+    """Threaded HTTP server imitating Google Shopping search, consent and block pages"""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.2,
+        jitter: float = 0.1,
+        render_delay: float = 0.3,
+        results_per_page: int = 20,
+        total_results: int = 100,
+        initial_cards: int = 4,
+        lazy_batch: int = 4,
+        lazy_delay: float = 0.2,
+        consent_rate: float = 1.0,
+        captcha_rate: float = 0.0,
+        layout_weights: Dict[str, float] | None = None,
+        seed: int | None = None,
+        logger: logging.Logger | None = None,
+    ) -> None:
+        self._logger = logger if logger else logging.getLogger(__name__)
+        self.latency = latency  # Base delay of every response, in seconds
+        self.jitter = jitter  # Mean of an exponential extra delay, giving a long latency tail
+        self.render_delay = render_delay  # Until the first cards are inserted into the page
+        self.results_per_page = results_per_page
+        self.total_results = total_results  # Products of a query across all results pages
+        self.initial_cards = initial_cards
+        self.lazy_batch = lazy_batch
+        self.lazy_delay = lazy_delay
+        self.consent_rate = consent_rate  # Probability of a consent redirect for clients without the consent cookie
+        self.captcha_rate = captcha_rate  # Probability of a /sorry/ redirect for a search
+        self.layout_weights = layout_weights or {"standard": 1.0}
+        self.seed = seed
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.counters: Dict[str, int] = {"requests": 0, "results": 0, "consent": 0, "blocked": 0}
+
+        self._httpd = ThreadingHTTPServer((host, port), _StandInRequestHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.standin = self
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        """Search URL to use as the scraper's `url` setting"""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/search?tbm=shop"
+
+    def start(self) -> "StandInServer":
+        """Serves requests from a background thread"""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="standin-server", daemon=True)
+        self._thread.start()
+        self._logger.info(f"Google Shopping stand-in serving at {self.url}")
+        return self
+
+    def serve_forever(self) -> None:
+        self._logger.info(f"Google Shopping stand-in serving at {self.url}")
+        self._httpd.serve_forever()
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def stats(self) -> Dict[str, int]:
+        """Returns how many requests were served, and how many of them were results, consent or block pages"""
+        with self._lock:
+            return dict(self.counters)
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self.counters[counter] = self.counters.get(counter, 0) + 1
+
+    def _chance(self, probability: float) -> bool:
+        with self._lock:
+            return self._random.random() < probability
+
+    def _response_delay(self) -> float:
+        with self._lock:
+            extra = self._random.expovariate(1 / self.jitter) if self.jitter > 0 else 0.0
+        return self.latency + extra
+
+    def _pick_layout(self) -> str:
+        with self._lock:
+            return self._random.choices(list(self.layout_weights), weights=list(self.layout_weights.values()))[0]
+
+    def _products(self, query: str, start: int = 0) -> List[dict]:
+        """Synthetic products of a results page of a query from offset start, identical on every request for the same page"""
+        rng = random.Random(f"{self.seed}:{query}:{start}")
+        products = []
+        for i in range(start, min(start + self.results_per_page, self.total_results)):
+            price = rng.uniform(5, 500)
+            products.append({
+                "product_id": f"{rng.getrandbits(48):x}",
+                "title": f"{rng.choice(_ADJECTIVES)} {query.title()} {i + 1}",
+                "price": f"${price:,.2f}",
+                "delivery": "Free delivery" if rng.random() < 0.6 else f"+${rng.uniform(2, 15):.2f} delivery",
+                "rating": f"{rng.uniform(3, 5):.1f}" if rng.random() < 0.8 else "",
+                "store": rng.choice(_STORES),
+            })
+        return products
+
+    def results_page(self, query: str, layout: str, start: int = 0) -> str:
+        classes = LAYOUTS[layout]
+        cards = [
+            _CARD.format(
+                image=_THUMBNAIL,
+                container=classes["container"],
+                hveid=f"CA{i}QAA",
+                product_id=product["product_id"],
+                title_class=classes["title"],
+                title=html.escape(product["title"]),
+                price_class=classes["price"],
+                price=product["price"],
+                price_text="" if layout == "aria_price" else product["price"],
+                delivery=product["delivery"],
+                rating=product["rating"],
+                store=product["store"],
+            )
+            for i, product in enumerate(self._products(query, start), start)
+        ]
+        return _RESULTS_PAGE.format(
+            title=html.escape(query),
+            # Escaped so that a card can never close the script element
+            cards=json.dumps(cards).replace("</", "<\\/"),
+            initial_cards=self.initial_cards,
+            render_delay_ms=int(self.render_delay * 1000),
+            lazy_batch=self.lazy_batch,
+            lazy_delay_ms=int(self.lazy_delay * 1000),
+        )
+
+    @staticmethod
+    def consent_page(continue_url: str) -> str:
+        continue_url = html.escape(continue_url)
+        return _CONSENT_PAGE.format(
+            reject=_CONSENT_FORM.format(continue_url=continue_url, label="Reject all"),
+            accept=_CONSENT_FORM.format(continue_url=continue_url, label="Accept all"),
+        )
+
+    @staticmethod
+    def blocked_page(continue_url: str) -> str:
+        return _BLOCKED_PAGE.format(continue_url=html.escape(continue_url), text=BLOCKED_TEXT)
+
+
+class _StandInRequestHandler(BaseHTTPRequestHandler):
+    server_version = "gws"
+
+    @property
+    def standin(self) -> StandInServer:
+        return self.server.standin
+
+    def log_message(self, format, *args):
+        self.standin._logger.debug(f"{self.address_string()} {format % args}")
+
+    def do_GET(self):
+        self.standin._count("requests")
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+        time.sleep(self.standin._response_delay())
+
+        if url.path == "/search":
+            if self.standin._chance(self.standin.captcha_rate):
+                self.standin._count("blocked")
+                self._redirect(f"/sorry/index?continue={quote(self.path, safe='')}")
+            elif CONSENT_COOKIE not in self._cookies() and self.standin._chance(self.standin.consent_rate):
+                self.standin._count("consent")
+                self._redirect(f"/consent?continue={quote(self.path, safe='')}")
+            else:
+                self.standin._count("results")
+                query = params.get("q", [""])[0]
+                start = params.get("start", ["0"])[0]
+                start = int(start) if start.isdigit() else 0
+                self._send_html(self.standin.results_page(query, self.standin._pick_layout(), start))
+        elif url.path == "/consent":
+            self._send_html(self.standin.consent_page(params.get("continue", ["/"])[0]))
+        elif url.path.startswith("/sorry/"):
+            self._send_html(self.standin.blocked_page(params.get("continue", ["/"])[0]), status=429)
+        else:
+            self.send_error(404)
+
+    def do_POST(self):
+        self.standin._count("requests")
+        length = int(self.headers.get("Content-Length") or 0)
+        form = parse_qs(self.rfile.read(length).decode("utf-8"))
+        if urlparse(self.path).path != "/consent/save":
+            self.send_error(404)
+            return
+
+        continue_url = form.get("continue", ["/"])[0]
+        if not continue_url.startswith("/"):
+            continue_url = "/"
+        self.send_response(303)
+        self.send_header("Set-Cookie", f"{CONSENT_COOKIE}=CAESHAgBEhJnd3NfMjAyNDA; Path=/; Max-Age=34190000; SameSite=Lax")
+        self.send_header("Location", continue_url)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _cookies(self) -> Dict[str, str]:
+        cookies = {}
+        for part in (self.headers.get("Cookie") or "").split(";"):
+            name, _, value = part.strip().partition("=")
+            if name:
+                cookies[name] = value
+        return cookies
+
+    def _redirect(self, location: str) -> None:
+        self.send_response(302)
+        self.send_header("Location", location)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _send_html(self, page: str, status: int = 200) -> None:
+        body = page.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a local Google Shopping stand-in for load tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.2, help="Base response delay in seconds (default: 0.2)")
+    parser.add_argument("--jitter", type=float, default=0.1, help="Mean extra delay in seconds, exponentially distributed (default: 0.1)")
+    parser.add_argument("--render-delay", type=float, default=0.3, help="Seconds until the first cards render (default: 0.3)")
+    parser.add_argument("--results", type=int, default=20, help="Product cards per results page (default: 20)")
+    parser.add_argument("--total-results", type=int, default=100, help="Products per query across all results pages (default: 100)")
+    parser.add_argument("--consent-rate", type=float, default=1.0, help="Probability of a consent interstitial without the consent cookie (default: 1.0)")
+    parser.add_argument("--captcha-rate", type=float, default=0.0, help="Probability of a /sorry/ CAPTCHA page per search (default: 0.0)")
+    parser.add_argument("--layouts", type=parse_layout_weights, default={"standard": 1.0}, help="Layout weights, e.g. standard=0.8,aria_price=0.1,legacy=0.1")
+    parser.add_argument("--seed", type=int, help="Seed of the fault injection")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    server = StandInServer(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        render_delay=args.render_delay,
+        results_per_page=args.results,
+        total_results=args.total_results,
+        consent_rate=args.consent_rate,
+        captcha_rate=args.captcha_rate,
+        layout_weights=args.layouts,
+        seed=args.seed,
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+    Browser fingerprint patches injected into every page before its own scripts run.
+"""
+
+from typing import Dict, List
+
+
+# Each patch overrides one navigator or screen property that differs between automated and regular Chrome
+STEALTH_PATCHES: Dict[str, str] = {
+    "webdriver": "Object.defineProperty(navigator, 'webdriver', {get: () => undefined});",
+    "plugins": "Object.defineProperty(navigator, 'plugins', {get: () => [1, 2, 3, 4, 5]});",
+    "languages": "Object.defineProperty(navigator, 'languages', {get: () => ['en-US', 'en']});",
+    "permissions": (
+        "Object.defineProperty(navigator, 'permissions', "
+        "{get: () => ({query: () => Promise.resolve({state: 'granted'})})});"
+    ),
+    "screen": (
+        "Object.defineProperty(screen, 'width', {get: () => 1920});"
+        "Object.defineProperty(screen, 'height', {get: () => 1080});"
+    ),
+    "hardware": (
+        "Object.defineProperty(navigator, 'hardwareConcurrency', {get: () => 4});"
+        "Object.defineProperty(navigator, 'deviceMemory', {get: () => 8});"
+    ),
+}
+
+STEALTH_PROFILES: Dict[str, List[str]] = {
+    "off": [],
+    "minimal": ["webdriver"],
+    "standard": list(STEALTH_PATCHES),
+}
+
+
+def build_stealth_script(profile: str = "standard") -> str:
+    """Combines the patches of a stealth profile into a single script"""
+    if profile not in STEALTH_PROFILES:
+        raise ValueError(f"Unknown stealth profile '{profile}', expected one of {tuple(STEALTH_PROFILES)}")
+    # Each patch is isolated so that one failing override does not skip the others
+    return "\n".join(f"try {{ {STEALTH_PATCHES[patch]} }} catch (e) {{}}" for patch in STEALTH_PROFILES[profile])
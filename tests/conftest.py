@@ -0,0 +1,34 @@
+import pytest
+
+from google_shopping_scraper.consent import consent_store
+from google_shopping_scraper.scraper import GoogleShoppingScraper
+
+from fakes import FakeDriver
+
+
+@pytest.fixture(autouse=True)
+def isolated_state(tmp_path, monkeypatch):
+    """Runs every test in its own working directory, with no consent cookies captured by earlier tests"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(consent_store, "_entries", {})
+    monkeypatch.setattr(consent_store, "path", None)
+
+
+@pytest.fixture
+def fake_browsers(monkeypatch):
+    """
+    Makes scrapers launch FakeDrivers instead of Chrome. Call the fixture with the page function
+    (and FakeDriver options) of the browsers to launch; the launched drivers are collected in the returned list.
+    """
+    drivers = []
+
+    def install(pages, **options):
+        def init_chrome_driver(self, proxy=None, headless=True):
+            driver = FakeDriver(pages, **options)
+            drivers.append(driver)
+            return driver
+
+        monkeypatch.setattr(GoogleShoppingScraper, "_init_chrome_driver", init_chrome_driver)
+        return drivers
+
+    return install
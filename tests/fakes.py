@@ -0,0 +1,285 @@
+"""
+    In-memory stand-ins for Chrome WebDriver sessions, rendering pages with lxml, for offline tests.
+"""
+
+import itertools
+import re
+from typing import Callable, List
+from urllib.parse import urlparse
+
+from lxml import html as lxml_html
+from selenium.common.exceptions import NoSuchElementException, NoSuchWindowException, WebDriverException
+from selenium.webdriver.remote.webelement import WebElement
+
+from google_shopping_scraper import html_parser
+from google_shopping_scraper.extraction import EXTRACT_CARDS_SCRIPT
+from google_shopping_scraper.readiness import (
+    BLOCKED_CHECK_SCRIPT,
+    BLOCKED_PATH_PREFIX,
+    BLOCKED_SELECTORS,
+    READINESS_SCRIPT,
+    STABILITY_SCRIPT,
+)
+
+
+BLANK_URL = "about:blank"
+BLANK_PAGE = "<html><body></body></html>"
+
+# Only the simple selectors used by the scraper: tag, #id, .class, [attr], [attr*='value'] and combinations
+_SELECTOR_PART = re.compile(r"(\w+)|#([\w-]+)|\.([\w-]+)|\[([\w-]+)(?:\*='([^']*)')?\]")
+
+
+def css_to_xpath(selector: str, prefix: str = ".//") -> str:
+    """Converts a simple CSS selector into an XPath query"""
+    tag, predicates = "*", []
+    for match in _SELECTOR_PART.finditer(selector):
+        name, element_id, class_name, attribute, contains = match.groups()
+        if name:
+            tag = name
+        elif element_id:
+            predicates.append(f"@id='{element_id}'")
+        elif class_name:
+            predicates.append(html_parser._class_xpath(class_name))
+        elif contains is not None:
+            predicates.append(f"contains(@{attribute}, '{contains}')")
+        else:
+            predicates.append(f"@{attribute}")
+    return prefix + tag + "".join(f"[{predicate}]" for predicate in predicates)
+
+
+def shopping_page(titles: List[str], price: str = "$9.99") -> str:
+    """Renders a minimal results page with one product card per title"""
+    cards = "".join(
+        f'<div class="card" data-hveid="C{i}"><img src="https://encrypted-tbn0.gstatic.com/shopping?q=tbn:{i}">'
+        f'<a href="/shopping/product/{abs(hash(title))}"><div class="gkQHve SsM98d RmEs5b">{title}</div></a>'
+        f'<span class="lmQWe">{price}</span><span class="ybnj7e">Free delivery</span></div>'
+        for i, title in enumerate(titles)
+    )
+    return f"<html><body><div id='res' class='sh-dgr__content'>{cards}</div></body></html>"
+
+
+# Nested at the absolute XPath of the consent button the scraper clicks
+CONSENT_PAGE = (
+    "<html><body><c-wiz><div><div><div><div></div><div><div><div></div><div></div><div><div><div>"
+    "<form></form><form><div><div><button><span>Accept all</span></button></div></div></form>"
+    "</div></div></div></div></div></div></div></c-wiz></body></html>"
+)
+
+
+class FakeElement(WebElement):
+    """A WebElement backed by an lxml element, counting every command as a round trip"""
+
+    def __init__(self, driver: "FakeDriver", element) -> None:
+        super().__init__(driver, "element" + element.getroottree().getpath(element))
+        self._driver = driver
+        self._element = element
+
+    @property
+    def text(self) -> str:
+        self._driver._command()
+        return " ".join(self._element.text_content().split())
+
+    def get_attribute(self, name: str) -> str | None:
+        self._driver._command()
+        return self._element.get(name)
+
+    def find_elements(self, by: str, selector: str) -> List["FakeElement"]:
+        self._driver._command()
+        xpath = selector if by == "xpath" else css_to_xpath(selector)
+        return [FakeElement(self._driver, element) for element in self._element.xpath(xpath)]
+
+    def find_element(self, by: str, selector: str) -> "FakeElement":
+        elements = self.find_elements(by, selector)
+        if not elements:
+            raise NoSuchElementException(selector)
+        return elements[0]
+
+
+class _FakeSwitchTo:
+    def __init__(self, driver: "FakeDriver") -> None:
+        self._driver = driver
+
+    def window(self, handle: str) -> None:
+        self._driver._command()
+        if handle not in self._driver.tabs:
+            raise NoSuchWindowException(handle)
+        self._driver.current_window_handle = handle
+
+    def new_window(self, type_hint: str | None = None) -> None:
+        self._driver._command()
+        self._driver.current_window_handle = self._driver.open_tab()
+
+
+class FakeTab:
+    """A browser tab with its committed document and a navigation still in flight"""
+
+    def __init__(self, url: str = BLANK_URL, html: str = BLANK_PAGE) -> None:
+        self.url = url
+        self.tree = lxml_html.fromstring(html)
+        self.pending_url = None
+        self.pending_commands = 0  # Commands until the pending navigation commits
+
+
+class FakeDriver:
+    """
+    A Chrome WebDriver session serving pages from a function of the URL.
+
+    Scripts are recognized by the scraper's script constants. Script navigations through
+    window.location.href are asynchronous like in Chrome: the tab keeps its current document
+    for navigation_delay further commands before the new one is committed.
+    """
+
+    def __init__(self, pages: Callable[[str], str], navigation_delay: int = 0, consent_cookies: List[dict] | None = None) -> None:
+        self.pages = pages
+        self.navigation_delay = navigation_delay
+        self.consent_cookies = consent_cookies or []  # Cookies set by clicking the consent button
+        self.tabs = {"main": FakeTab()}
+        self.current_window_handle = "main"
+        self.cookies = []  # CDP cookies of the browser
+        self.cdp_commands = []  # Names of all CDP commands sent
+        self.browser_contexts = []  # Ids of the browser contexts not disposed yet
+        self.navigations = []  # (tab, url) of every committed navigation
+        self.clicks = 0
+        self.calls = 0  # WebDriver round trips
+        self.quit_called = False
+        self.crashed = False  # Set to make every further command fail like a dead browser
+        self._handles = itertools.count(1)
+
+    def open_tab(self) -> str:
+        handle = f"tab-{next(self._handles)}"
+        self.tabs[handle] = FakeTab()
+        return handle
+
+    def _command(self) -> None:
+        """Counts a round trip, letting the pending navigation of the current tab progress"""
+        if self.crashed:
+            raise WebDriverException("chrome not reachable")
+        self.calls += 1
+        tab = self.tabs.get(self.current_window_handle)
+        if tab is not None and tab.pending_url is not None:
+            if tab.pending_commands <= 0:
+                self._commit(tab, tab.pending_url)
+            else:
+                tab.pending_commands -= 1
+
+    @property
+    def _tab(self) -> FakeTab:
+        return self.tabs[self.current_window_handle]
+
+    def _commit(self, tab: FakeTab, url: str) -> None:
+        tab.url, tab.tree, tab.pending_url = url, lxml_html.fromstring(self.pages(url)), None
+        handle = next(handle for handle, candidate in self.tabs.items() if candidate is tab)
+        self.navigations.append((handle, url))
+
+    @property
+    def window_handles(self) -> List[str]:
+        return list(self.tabs)
+
+    @property
+    def current_url(self) -> str:
+        self._command()
+        return self._tab.url
+
+    @property
+    def page_source(self) -> str:
+        self._command()
+        return lxml_html.tostring(self._tab.tree, encoding="unicode")
+
+    @property
+    def switch_to(self) -> _FakeSwitchTo:
+        return _FakeSwitchTo(self)
+
+    @property
+    def capabilities(self) -> dict:
+        return {"browserVersion": "126.0.6478.126"}
+
+    def get(self, url: str) -> None:
+        self._command()
+        self._commit(self.tabs[self.current_window_handle], url)
+
+    def find_elements(self, by: str, selector: str) -> List[FakeElement]:
+        self._command()
+        xpath = selector if by == "xpath" else css_to_xpath(selector, prefix="//")
+        return [FakeElement(self, element) for element in self._tab.tree.xpath(xpath)]
+
+    def find_element(self, by: str, selector: str) -> FakeElement:
+        elements = self.find_elements(by, selector)
+        if not elements:
+            raise NoSuchElementException(selector)
+        return elements[0]
+
+    def _matches_any(self, selectors) -> bool:
+        return any(self._tab.tree.xpath(css_to_xpath(selector, prefix="//")) for selector in selectors)
+
+    def _is_blocked(self) -> bool:
+        return urlparse(self._tab.url).path.startswith(BLOCKED_PATH_PREFIX) or self._matches_any(BLOCKED_SELECTORS)
+
+    def execute_script(self, script: str, *args):
+        self._command()
+        tab = self._tab
+        if script == READINESS_SCRIPT:
+            if self._is_blocked():
+                return "blocked"
+            return "products" if self._matches_any(args[0].split(", ")) else None
+        if script == BLOCKED_CHECK_SCRIPT:
+            return self._is_blocked()
+        if script == EXTRACT_CARDS_SCRIPT:
+            return list(html_parser.iter_cards(lxml_html.tostring(tab.tree, encoding="unicode"), base_url=tab.url))
+        if script.startswith("window.location.href ="):
+            tab.pending_url, tab.pending_commands = args[0], self.navigation_delay
+            if self.navigation_delay == 0:
+                self._commit(tab, args[0])
+            return None
+        if "innerHeight" in script:
+            return 1000
+        if "scrollHeight" in script:
+            return 1000
+        return None
+
+    def execute_async_script(self, script: str, *args):
+        self._command()
+        if script == STABILITY_SCRIPT:
+            selector = args[0]
+            count = len(self._tab.tree.xpath(css_to_xpath(selector, prefix="//"))) if selector else None
+            # Static documents are quiet at once, but only stable once a matching node exists
+            return {"stable": not selector or count > 0, "waited_ms": 0, "mutations": 0, "count": count}
+        return None
+
+    def execute_cdp_cmd(self, cmd: str, params: dict) -> dict:
+        self._command()
+        self.cdp_commands.append(cmd)
+        if cmd == "Network.getAllCookies":
+            return {"cookies": list(self.cookies)}
+        if cmd == "Network.setCookies":
+            self.cookies.extend(params["cookies"])
+        elif cmd == "Target.createBrowserContext":
+            self.browser_contexts.append(f"context-{next(self._handles)}")
+            return {"browserContextId": self.browser_contexts[-1]}
+        elif cmd == "Target.createTarget":
+            # ChromeDriver uses target ids as window handles
+            handle = f"{params['browserContextId']}/target-{next(self._handles)}"
+            self.tabs[handle] = FakeTab()
+            return {"targetId": handle}
+        elif cmd == "Target.disposeBrowserContext":
+            self.browser_contexts.remove(params["browserContextId"])
+            self.tabs = {handle: tab for handle, tab in self.tabs.items() if not handle.startswith(params["browserContextId"] + "/")}
+        return {}
+
+    def execute(self, driver_command: str, params: dict | None = None) -> dict:
+        """Receives the commands of ActionChains, every performed action sequence is a click on the consent button"""
+        self._command()
+        if driver_command == "actions":
+            self.clicks += 1
+            self.cookies.extend(self.consent_cookies)
+        return {"value": None}
+
+    def close(self) -> None:
+        self._command()
+        del self.tabs[self.current_window_handle]
+
+    def delete_all_cookies(self) -> None:
+        self._command()
+        self.cookies = []
+
+    def quit(self) -> None:
+        self.quit_called = True
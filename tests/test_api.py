@@ -0,0 +1,267 @@
+import asyncio
+import json
+import logging
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+import api
+from google_shopping_scraper.cache import ResultCache
+from google_shopping_scraper.conf import google_shopping_scraper_settings
+from google_shopping_scraper.models import ShoppingItem
+from google_shopping_scraper.scraper import BlockedPageError
+
+
+logger = logging.getLogger(__name__)
+
+
+class BlockingScrape:
+    """Stands in for scrape_items, holding every scrape until it is released"""
+
+    def __init__(self) -> None:
+        self.calls = []
+        self.release = threading.Event()
+
+    def __call__(self, query, headless, fast, keep_browser, max_items, max_pages, logger):
+        self.calls.append(query)
+        assert self.release.wait(timeout=5)
+        return [query]
+
+
+@pytest.fixture(autouse=True)
+def executor(monkeypatch):
+    """Runs scrapes of the API on a private executor, with an empty result cache"""
+    executor = ThreadPoolExecutor(max_workers=4)
+    monkeypatch.setattr(api, "_scrape_executor", executor)
+    monkeypatch.setattr(api, "_inflight_scrapes", {})
+    monkeypatch.setattr(api, "_pending_scrapes", 0)
+    monkeypatch.setattr(api, "_result_cache", ResultCache())
+    yield executor
+    executor.shutdown(wait=True)
+
+
+@pytest.fixture
+def scrape(monkeypatch):
+    """Makes the API scrape with a blocking fake scraper"""
+    fake = BlockingScrape()
+    monkeypatch.setattr(api, "scrape_items", fake)
+    yield fake
+    fake.release.set()
+
+
+def coalesced(query):
+    key = ResultCache.make_key(query, "us", False, True, 10, 1)
+    return api.coalesced_scrape(key, query, True, False, True, 10, 1, logger)
+
+
+def test_identical_concurrent_scrapes_share_one_executor_call(scrape):
+    async def main():
+        requests = [asyncio.ensure_future(coalesced("cat food")) for _ in range(3)]
+        await asyncio.sleep(0)
+        assert len(api._inflight_scrapes) == 1
+        scrape.release.set()
+        return await asyncio.gather(*requests)
+
+    assert asyncio.run(main()) == [["cat food"]] * 3
+    assert scrape.calls == ["cat food"]
+    # The finished scrape is forgotten, so the next request scrapes again
+    assert api._inflight_scrapes == {}
+
+
+def test_different_scrapes_are_not_shared(scrape):
+    async def main():
+        requests = [asyncio.ensure_future(coalesced(query)) for query in ["cat food", "dog food"]]
+        await asyncio.sleep(0)
+        scrape.release.set()
+        return await asyncio.gather(*requests)
+
+    assert asyncio.run(main()) == [["cat food"], ["dog food"]]
+    assert sorted(scrape.calls) == ["cat food", "dog food"]
+
+
+def test_cancelled_joiner_does_not_cancel_the_shared_scrape(scrape):
+    async def main():
+        first = asyncio.ensure_future(coalesced("cat food"))
+        joiner = asyncio.ensure_future(coalesced("cat food"))
+        await asyncio.sleep(0)
+        shared = next(iter(api._inflight_scrapes.values()))
+
+        # A client disconnecting cancels its request
+        joiner.cancel()
+        await asyncio.sleep(0)
+        assert joiner.cancelled()
+        assert not shared.cancelled()
+
+        scrape.release.set()
+        return await first
+
+    assert asyncio.run(main()) == ["cat food"]
+    assert scrape.calls == ["cat food"]
+
+
+def shopping_item(title):
+    return ShoppingItem(
+        title=title, price="$9.99", delivery_price="Free delivery", review=None,
+        url="https://example.com", image_url=None, saved_image_path=None,
+    )
+
+
+class FakeStreamingScraper:
+    """A pooled scraper yielding the given items, then raising error if set"""
+
+    def __init__(self, titles, error=None, wait_for=None) -> None:
+        self.titles = titles
+        self.error = error
+        self.wait_for = wait_for  # Called before every item after the first one
+        self.fast_mode = False
+        self.closed = False
+
+    def iter_shopping_data(self, query, headless=True, max_items=None, max_pages=None):
+        try:
+            for rank, title in enumerate(self.titles):
+                if rank and self.wait_for:
+                    self.wait_for()
+                yield shopping_item(title)
+            if self.error:
+                raise self.error
+        finally:
+            self.closed = True
+
+
+class FakePool:
+    headless = True
+
+    def __init__(self, scraper) -> None:
+        self.scraper = scraper
+        self.checkouts = 0
+        self.returned = threading.Event()
+
+    @contextmanager
+    def session(self):
+        self.checkouts += 1
+        try:
+            yield self.scraper
+        finally:
+            self.returned.set()
+
+
+@pytest.fixture
+def pooled(monkeypatch):
+    """Serves scrapes from a pool holding the given fake scraper"""
+    def install(scraper):
+        pool = FakePool(scraper)
+        monkeypatch.setattr(api, "_browser_pool", pool)
+        return pool
+    return install
+
+
+def stream(**params):
+    response = TestClient(api.app).get("/scrape/stream", params={"query": "cat food", "use_cache": False, **params})
+    assert response.status_code == 200
+    return response
+
+
+def test_stream_ndjson(pooled):
+    pooled(FakeStreamingScraper(["Purina ONE", "Meow Mix"]))
+
+    response = stream()
+
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [(record["type"], record.get("rank")) for record in records] == [("item", 1), ("item", 2), ("summary", None)]
+    assert records[1]["item"]["title"] == "Meow Mix"
+    assert records[2]["total_items"] == 2
+    assert not records[2]["cached"]
+
+
+def test_stream_sse(pooled):
+    pooled(FakeStreamingScraper(["Purina ONE"]))
+
+    response = stream(format="sse")
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = response.text.split("\n\n")
+    assert events[-1] == ""
+    assert [event.split("\n")[0] for event in events[:-1]] == ["event: item", "event: summary"]
+    summary = json.loads(events[1].split("\n")[1].removeprefix("data: "))
+    assert summary["total_items"] == 1
+
+
+def test_stream_ends_with_an_error_record(pooled):
+    pooled(FakeStreamingScraper(["Purina ONE"], error=BlockedPageError()))
+
+    records = [json.loads(line) for line in stream().text.splitlines()]
+
+    assert [record["type"] for record in records] == ["item", "error"]
+    assert records[1] == {"type": "error", "status_code": 503, "detail": BlockedPageError.message}
+
+
+def test_client_disconnect_stops_the_scrape_and_returns_the_session(pooled, monkeypatch):
+    stops = []
+    stream_items = api.stream_items
+
+    def recording_stream_items(*args):
+        stops.append(args[-1])
+        return stream_items(*args)
+
+    monkeypatch.setattr(api, "stream_items", recording_stream_items)
+    # The second item is only extracted once the client has gone away
+    scraper = FakeStreamingScraper(["Purina ONE", "Meow Mix", "Fancy Feast"], wait_for=lambda: stops[0].wait(timeout=5))
+    pool = pooled(scraper)
+
+    async def main():
+        response = await api.stream_google_shopping(
+            query="cat food", headless=True, fast=False, keep_browser=True, use_cache=False,
+            max_items=10, max_pages=1, format="ndjson",
+        )
+        records = response.body_iterator
+        first = json.loads(await records.__anext__())
+        # The server closes the body iterator when the client disconnects
+        await records.aclose()
+        assert stops[0].is_set()
+        # Keep the event loop running until the worker has returned the session
+        returned = await asyncio.get_running_loop().run_in_executor(None, pool.returned.wait, 5)
+        return first, returned
+
+    first, returned = asyncio.run(main())
+
+    assert first["item"]["title"] == "Purina ONE"
+    assert returned and pool.checkouts == 1
+    assert scraper.closed
+
+
+@pytest.mark.parametrize("endpoint, options", [
+    (api.scrape_google_shopping, {}),
+    (api.stream_google_shopping, {"format": "ndjson"}),
+])
+def test_full_scrape_queue_is_rejected(scrape, endpoint, options, monkeypatch):
+    monkeypatch.setattr(google_shopping_scraper_settings, "api_max_workers", 1)
+    monkeypatch.setattr(google_shopping_scraper_settings, "api_max_queued", 1)
+
+    async def main():
+        # One scrape running and one queued behind it
+        busy = [asyncio.ensure_future(coalesced(query)) for query in ["cat food", "dog food"]]
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert api._pending_scrapes == 2
+        try:
+            with pytest.raises(HTTPException) as rejected:
+                await endpoint(
+                    query="fish food", headless=True, fast=False, keep_browser=True, use_cache=False,
+                    max_items=10, max_pages=1, **options,
+                )
+        finally:
+            scrape.release.set()
+            await asyncio.gather(*busy)
+        return rejected.value
+
+    rejected = asyncio.run(main())
+
+    assert rejected.status_code == 503
+    assert rejected.detail == api.ScrapeQueueFullError.message
+    assert scrape.calls == ["cat food", "dog food"]
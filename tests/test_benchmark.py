@@ -0,0 +1,94 @@
+import json
+import os
+import shutil
+import sys
+
+import pytest
+
+from fakes import FakeDriver
+
+import benchmark
+
+from google_shopping_scraper.conf import google_shopping_scraper_settings
+
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "shopping_results.html")
+
+
+@pytest.fixture
+def recorded_page(tmp_path, fake_browsers, monkeypatch):
+    """The committed results page recorded as a debug snapshot, served by fake browsers"""
+    # The html extraction path parses the page with lxml
+    pytest.importorskip("lxml")
+    # The benchmark points the scraper at its corpus server
+    monkeypatch.setattr(google_shopping_scraper_settings, "url", google_shopping_scraper_settings.url)
+    path = tmp_path / f"{benchmark.SNAPSHOT_PREFIX}cat_food.html"
+    shutil.copy(FIXTURE, path)
+    with open(FIXTURE, encoding="utf-8") as f:
+        html = f.read()
+    fake_browsers(lambda url: html)
+    return str(path)
+
+
+def run_benchmark(monkeypatch, *argv):
+    monkeypatch.setattr(sys, "argv", ["benchmark.py", *argv])
+    benchmark.main()
+
+
+def test_round_trip_counter():
+    driver = FakeDriver(lambda url: "<html></html>")
+    counter = benchmark.RoundTripCounter(driver)
+
+    assert driver.execute("actions") == {"value": None}
+    driver.execute("getTitle")
+
+    assert counter.count == 2
+    assert driver.clicks == 1
+
+
+def test_benchmark_output(recorded_page, tmp_path, monkeypatch):
+    output = tmp_path / "results.json"
+
+    run_benchmark(monkeypatch, recorded_page, "--repeat", "2", "--output", str(output))
+
+    with open(output, encoding="utf-8") as f:
+        result = json.load(f)
+    assert result["meta"]["pages"] == 1 and result["meta"]["repeat"] == 2
+    assert list(result["summary"]) == list(benchmark.EXTRACTION_PATHS)
+    assert len(result["runs"]) == 2 * len(benchmark.EXTRACTION_PATHS)
+    assert {run["query"] for run in result["runs"]} == {"cat food"}
+    # Every extraction path finds the four products of the recorded page
+    assert {path: stats["items"] for path, stats in result["summary"].items()} == dict.fromkeys(benchmark.EXTRACTION_PATHS, 8)
+
+
+def summary(p50_seconds, mean_round_trips):
+    return {"webdriver": {"p50_seconds": p50_seconds, "mean_round_trips": mean_round_trips}}
+
+
+@pytest.mark.parametrize("current, regressed", [
+    (summary(0.11, 40), False),
+    (summary(0.13, 40), True),
+    (summary(0.10, 50), True),
+])
+def test_compare(tmp_path, current, regressed):
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps({"summary": summary(0.10, 40)}), encoding="utf-8")
+
+    assert benchmark.compare(current, str(baseline), max_regression=0.2) == regressed
+
+
+def test_compare_skips_paths_missing_from_the_baseline(tmp_path):
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps({"summary": {}}), encoding="utf-8")
+    assert not benchmark.compare(summary(1.0, 100), str(baseline), max_regression=0.2)
+
+
+def test_benchmark_exits_on_a_regression(recorded_page, tmp_path, monkeypatch):
+    baseline = tmp_path / "baseline.json"
+    paths = {path: {"p50_seconds": 1e-9, "mean_round_trips": 0} for path in benchmark.EXTRACTION_PATHS}
+    baseline.write_text(json.dumps({"summary": paths}), encoding="utf-8")
+
+    with pytest.raises(SystemExit) as exit_info:
+        run_benchmark(monkeypatch, recorded_page, "--repeat", "1", "--output", str(tmp_path / "results.json"), "--compare", str(baseline))
+
+    assert exit_info.value.code == 1
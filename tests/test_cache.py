@@ -0,0 +1,96 @@
+import pytest
+
+from google_shopping_scraper import cache
+from google_shopping_scraper.cache import ResultCache, normalize_query
+from google_shopping_scraper.models import ShoppingItem
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache.time, "monotonic", clock)
+    return clock
+
+
+def make_items(title, count=1):
+    return [
+        ShoppingItem(price="$1.00", delivery_price="N/A", title=f"{title} {i}", review=None, url="N/A", image_url=None, saved_image_path=None)
+        for i in range(count)
+    ]
+
+
+def test_normalize_query():
+    assert normalize_query("  Cat   FOOD ") == "cat food"
+    assert ResultCache.make_key("Cat  Food", "us", False, True) == ResultCache.make_key("cat food", "us", False, True)
+    assert ResultCache.make_key("cat food", "us", False, True) != ResultCache.make_key("cat food", "de", False, True)
+    assert ResultCache.make_key("cat food", "us", False, True, max_items=5) != ResultCache.make_key("cat food", "us", False, True, max_items=10)
+
+
+def test_evicts_least_recently_used_entry(clock):
+    result_cache = ResultCache(ttl=60, stale_ttl=0, max_entries=2, max_bytes=10**6)
+    result_cache.set("a", make_items("a"))
+    result_cache.set("b", make_items("b"))
+    # Reading "a" makes "b" the least recently used entry
+    assert result_cache.get("a") is not None
+
+    result_cache.set("c", make_items("c"))
+
+    assert result_cache.get("b") is None
+    assert result_cache.get("a") is not None
+    assert result_cache.get("c") is not None
+    assert result_cache.stats()["evictions"] == 1
+
+
+def test_byte_limit(clock):
+    size = ResultCache._estimate_size(make_items("a", 2))
+    result_cache = ResultCache(ttl=60, stale_ttl=0, max_entries=10, max_bytes=size * 2)
+    result_cache.set("a", make_items("a", 2))
+    result_cache.set("b", make_items("b", 2))
+    result_cache.set("c", make_items("c", 2))
+
+    stats = result_cache.stats()
+    assert stats["entries"] == 2
+    assert stats["bytes"] <= size * 2
+    assert result_cache.get("a") is None
+
+    # Entries larger than the whole cache are not stored at all
+    result_cache.set("huge", make_items("huge", 10))
+    assert result_cache.get("huge") is None
+    assert result_cache.stats()["entries"] == 2
+
+
+def test_replacing_an_entry_keeps_the_byte_count(clock):
+    result_cache = ResultCache(ttl=60, stale_ttl=0, max_entries=10, max_bytes=10**6)
+    result_cache.set("a", make_items("a", 3))
+    result_cache.set("a", make_items("a", 1))
+    assert result_cache.stats()["bytes"] == ResultCache._estimate_size(make_items("a", 1))
+
+
+def test_stale_window(clock):
+    result_cache = ResultCache(ttl=60, stale_ttl=30, max_entries=10, max_bytes=10**6)
+    result_cache.set("a", make_items("a"))
+
+    clock.now += 59
+    entry = result_cache.get("a")
+    assert not result_cache.is_stale(entry)
+
+    # Past the TTL the entry is still served, flagged for a refresh
+    clock.now += 20
+    entry = result_cache.get("a")
+    assert entry is not None
+    assert result_cache.is_stale(entry)
+
+    # Past the stale window it is dropped
+    clock.now += 20
+    assert result_cache.get("a") is None
+    stats = result_cache.stats()
+    assert (stats["hits"], stats["stale_hits"], stats["misses"]) == (1, 1, 1)
+    assert (stats["entries"], stats["bytes"]) == (0, 0)
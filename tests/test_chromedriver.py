@@ -0,0 +1,125 @@
+import json
+
+import pytest
+from selenium.common.exceptions import SessionNotCreatedException
+
+from google_shopping_scraper import chromedriver, scraper
+from google_shopping_scraper.chromedriver import (
+    ChromeDriverNotFoundError,
+    discard_resolved_chromedriver,
+    reset_chromedriver_cache,
+    resolve_chromedriver_path,
+)
+from google_shopping_scraper.conf import google_shopping_scraper_settings
+from google_shopping_scraper.scraper import GoogleShoppingScraper
+
+from fakes import FakeDriver
+
+
+class StubDriverManager:
+    """Stands in for ChromeDriverManager, 'downloading' a new driver binary on every install"""
+
+    def __init__(self, directory) -> None:
+        self.directory = directory
+        self.installs = []
+
+    def __call__(self, driver_version=None):
+        self.driver_version = driver_version
+        return self
+
+    def install(self) -> str:
+        path = self.directory / f"chromedriver-{len(self.installs) + 1}"
+        path.write_text("#!/bin/sh\n")
+        self.installs.append(self.driver_version)
+        return str(path)
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    manager = StubDriverManager(tmp_path)
+    monkeypatch.setattr(chromedriver, "ChromeDriverManager", manager)
+    monkeypatch.setattr(google_shopping_scraper_settings, "chromedriver_path", None)
+    monkeypatch.setattr(google_shopping_scraper_settings, "chromedriver_version", None)
+    monkeypatch.setattr(google_shopping_scraper_settings, "chromedriver_manifest_path", str(tmp_path / "cache" / "chromedriver.json"))
+    reset_chromedriver_cache()
+    yield manager
+    reset_chromedriver_cache()
+
+
+def test_manifest_is_reused_by_later_processes(manager, tmp_path):
+    path = resolve_chromedriver_path()
+    with open(tmp_path / "cache" / "chromedriver.json", encoding="utf-8") as f:
+        assert json.load(f) == {"version": None, "path": path}
+
+    # Same process: cached in memory
+    assert resolve_chromedriver_path() == path
+    # Another process: read from the manifest
+    reset_chromedriver_cache()
+    assert resolve_chromedriver_path() == path
+    assert manager.installs == [None]
+
+
+def test_manifest_of_another_pinned_version_is_ignored(manager, monkeypatch):
+    first = resolve_chromedriver_path()
+    reset_chromedriver_cache()
+    monkeypatch.setattr(google_shopping_scraper_settings, "chromedriver_version", "126.0.6478.126")
+
+    assert resolve_chromedriver_path() != first
+    assert manager.installs == [None, "126.0.6478.126"]
+
+
+def test_manifest_of_a_deleted_driver_is_ignored(manager):
+    first = resolve_chromedriver_path()
+    reset_chromedriver_cache()
+    chromedriver.os.remove(first)
+
+    assert resolve_chromedriver_path() != first
+    assert len(manager.installs) == 2
+
+
+def test_configured_path(manager, tmp_path, monkeypatch):
+    monkeypatch.setattr(google_shopping_scraper_settings, "chromedriver_path", str(tmp_path / "missing"))
+    with pytest.raises(ChromeDriverNotFoundError):
+        resolve_chromedriver_path()
+    assert not discard_resolved_chromedriver()
+    assert manager.installs == []
+
+
+def test_discard_resolves_again(manager, tmp_path):
+    first = resolve_chromedriver_path()
+
+    assert discard_resolved_chromedriver()
+
+    assert not (tmp_path / "cache" / "chromedriver.json").exists()
+    assert resolve_chromedriver_path() != first
+
+
+def test_driver_is_resolved_again_after_chrome_updated(manager, monkeypatch):
+    services = []
+
+    def chrome(service, options):
+        services.append(service.path)
+        if len(services) == 1:
+            raise SessionNotCreatedException("This version of ChromeDriver only supports Chrome version 125")
+        return FakeDriver(lambda url: "")
+
+    monkeypatch.setattr(scraper.webdriver, "Chrome", chrome)
+
+    driver = GoogleShoppingScraper()._init_chrome_driver()
+
+    assert isinstance(driver, FakeDriver)
+    assert len(services) == 2 and services[0] != services[1]
+    assert len(manager.installs) == 2
+
+
+def test_pinned_driver_is_not_resolved_again(manager, monkeypatch):
+    monkeypatch.setattr(google_shopping_scraper_settings, "chromedriver_version", "125.0.6422.141")
+
+    def chrome(service, options):
+        raise SessionNotCreatedException("This version of ChromeDriver only supports Chrome version 125")
+
+    monkeypatch.setattr(scraper.webdriver, "Chrome", chrome)
+
+    with pytest.raises(SessionNotCreatedException):
+        GoogleShoppingScraper()._init_chrome_driver()
+    assert manager.installs == ["125.0.6422.141"]
@@ -0,0 +1,80 @@
+import pytest
+
+from google_shopping_scraper import consent
+from google_shopping_scraper.consent import ConsentStore
+
+
+COOKIES = [
+    {"name": "SOCS", "value": "CAISHAgB", "domain": ".google.com", "path": "/", "secure": True, "expires": 2e9, "size": 16, "session": False},
+    {"name": "NID", "value": "511=tracking", "domain": ".google.com", "path": "/"},
+    {"name": "CONSENT", "value": "PENDING+987", "domain": ".google.com", "path": "/"},
+]
+
+
+@pytest.fixture
+def now(monkeypatch):
+    clock = {"now": 1.7e9}
+    monkeypatch.setattr(consent.time, "time", lambda: clock["now"])
+    return clock
+
+
+def test_make_key():
+    assert ConsentStore.make_key("de", None) == "de|direct"
+    assert ConsentStore.make_key("de", "10.0.0.1:8080") == "de|10.0.0.1:8080"
+
+
+def test_only_consent_cookies_are_kept(now):
+    store = ConsentStore(ttl=3600)
+    store.set("us|direct", COOKIES)
+
+    # Without CDP-only fields that Network.setCookies rejects
+    assert store.get("us|direct") == [
+        {"name": "SOCS", "value": "CAISHAgB", "domain": ".google.com", "path": "/", "secure": True, "expires": 2e9},
+        {"name": "CONSENT", "value": "PENDING+987", "domain": ".google.com", "path": "/"},
+    ]
+    assert store.get("de|direct") is None
+
+
+def test_no_consent_required_is_remembered(now):
+    store = ConsentStore(ttl=3600)
+    store.set("us|direct", [{"name": "NID", "value": "511=tracking"}])
+    assert store.get("us|direct") == []
+
+
+def test_entries_expire_after_the_ttl(now):
+    store = ConsentStore(ttl=3600)
+    store.set("us|direct", COOKIES)
+
+    now["now"] += 3599
+    assert store.get("us|direct") is not None
+    now["now"] += 2
+    assert store.get("us|direct") is None
+
+
+def test_entries_expire_with_their_cookies(now):
+    store = ConsentStore(ttl=10 * 24 * 3600)
+    store.set("us|direct", [{**COOKIES[0], "expires": now["now"] + 60}])
+
+    now["now"] += 61
+    assert store.get("us|direct") is None
+
+
+def test_invalidate(now):
+    store = ConsentStore(ttl=3600)
+    store.set("us|direct", COOKIES)
+    store.invalidate("us|direct")
+    store.invalidate("de|direct")
+    assert store.get("us|direct") is None
+
+
+def test_persisted_between_processes(now, tmp_path):
+    path = tmp_path / "consent" / "store.json"
+    ConsentStore(ttl=3600, path=str(path)).set("us|direct", COOKIES)
+
+    assert [cookie["name"] for cookie in ConsentStore(ttl=3600, path=str(path)).get("us|direct")] == ["SOCS", "CONSENT"]
+
+
+def test_unreadable_store_starts_empty(tmp_path):
+    path = tmp_path / "store.json"
+    path.write_text("{not json", encoding="utf-8")
+    assert ConsentStore(ttl=3600, path=str(path)).get("us|direct") is None
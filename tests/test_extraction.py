@@ -0,0 +1,59 @@
+from google_shopping_scraper.extraction import parse_price, product_fingerprint, select_image_url, shopping_item_from_card
+from google_shopping_scraper.models import ShoppingItem
+
+
+def make_item(**fields):
+    return ShoppingItem(**{
+        "title": "Purina ONE Chicken & Rice",
+        "price": "$24.98",
+        "delivery_price": "N/A",
+        "review": None,
+        "url": "N/A",
+        "image_url": None,
+        "saved_image_path": None,
+        **fields,
+    })
+
+
+def test_fingerprint_prefers_the_docid():
+    by_card = make_item(docid="1234567890", url="https://www.chewy.com/purina-one/dp/52")
+    by_url = make_item(url="https://www.google.com/shopping/product/1234567890?q=cat+food")
+    by_query_param = make_item(url="https://www.google.com/search?tbm=shop&docid=1234567890&q=cat")
+    assert product_fingerprint(by_card) == product_fingerprint(by_url) == product_fingerprint(by_query_param)
+    assert product_fingerprint(by_card) != product_fingerprint(make_item(docid="987"))
+
+
+def test_fingerprint_ignores_tracking_parameters():
+    first = make_item(url="https://www.chewy.com/purina-one/dp/52?utm=1&ved=0ahUKEwi&sa=X")
+    second = make_item(url="https://www.chewy.com/purina-one/dp/52?utm=1&ved=2ahUKEwj#reviews", title="Other title")
+    assert product_fingerprint(first) == product_fingerprint(second)
+    assert product_fingerprint(first) != product_fingerprint(make_item(url="https://www.chewy.com/purina-one/dp/53?utm=1"))
+
+
+def test_fingerprint_falls_back_to_title_and_price():
+    assert product_fingerprint(make_item(title="  Purina ONE   chicken & rice ")) == product_fingerprint(make_item())
+    assert product_fingerprint(make_item(price="$19.99")) != product_fingerprint(make_item())
+
+
+def test_card_docid_is_kept():
+    card = {"title": "Purina ONE", "price": "$24.98", "docid": "1234567890", "href": None, "images": []}
+    assert shopping_item_from_card(card).docid == "1234567890"
+    assert shopping_item_from_card({**card, "docid": ""}).docid is None
+    assert shopping_item_from_card({**card, "price": ""}) is None
+
+
+def test_parse_price():
+    assert parse_price("$24.98", None) == "$24.98"
+    assert parse_price("", "Current price: €39,99") == "€39,99"
+    assert parse_price("", "Rated 4.5 out of 5") is None
+
+
+def test_select_image_url_priority():
+    images = [
+        {"src": "https://www.google.com/favicon.ico", "data_src": None},
+        {"src": None, "data_src": "https://encrypted-tbn2.gstatic.com/images?q=tbn:3"},
+        {"src": "data:image/webp;base64,AAAA", "data_src": None},
+    ]
+    assert select_image_url(images) == "data:image/webp;base64,AAAA"
+    assert select_image_url(images[:2]) == "https://encrypted-tbn2.gstatic.com/images?q=tbn:3"
+    assert select_image_url(images[:1]) is None
@@ -0,0 +1,117 @@
+import json
+import logging
+import os
+
+import pytest
+
+from google_shopping_scraper.html_parser import parse_shopping_html, parse_shopping_html_file
+from scrape_to_json import parse_saved_pages, results_filename
+
+
+pytest.importorskip("lxml")
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "shopping_results.html")
+BASE_URL = "https://www.google.com/search?tbm=shop&q=cat+food"
+
+
+@pytest.fixture
+def items():
+    return parse_shopping_html_file(FIXTURE, base_url=BASE_URL)
+
+
+def test_parses_product_cards_in_page_order(items):
+    assert [item.title for item in items] == [
+        "Purina ONE Chicken & Rice Dry Cat Food, 16 lb",
+        "Meow Mix Original Choice",
+        "Fancy Feast Gravy Lovers, 24 cans",
+        "Blue Buffalo Tastefuls Indoor Natural Adult Dry Cat Food",
+    ]
+
+
+def test_card_fields(items):
+    purina = items[0]
+    assert purina.price == "$24.98"
+    assert purina.delivery_price == "Free delivery"
+    assert purina.review == "4.7"
+    assert purina.url == "https://www.google.com/shopping/product/1234567890?q=cat+food&ved=0ahUKEwi"
+    assert purina.saved_image_path is None
+
+
+def test_card_docid(items):
+    assert items[0].docid == "1234567890"
+    assert items[1].docid is None
+
+
+def test_products_listed_twice_are_parsed_once():
+    card = (
+        '<div data-docid="{docid}"><a href="/shopping/product/{docid}?ved={ved}">'
+        '<div class="gkQHve SsM98d RmEs5b">{title}</div></a><span class="lmQWe">$9.99</span></div>'
+    )
+    html = "<div id='res'>{}</div>".format("".join([
+        card.format(docid="111", ved="sponsored", title="Purina ONE"),
+        card.format(docid="222", ved="a", title="Meow Mix"),
+        # The same product as an organic result, with another title and tracking parameters
+        card.format(docid="111", ved="organic", title="Purina ONE Chicken & Rice"),
+    ]))
+    assert [item.title for item in parse_shopping_html(html)] == ["Purina ONE", "Meow Mix"]
+
+
+def test_price_falls_back_to_aria_label(items):
+    meow_mix = items[1]
+    assert meow_mix.price == "$12.49"
+    assert meow_mix.delivery_price == "N/A"
+    assert meow_mix.review is None
+    assert meow_mix.url == "https://www.chewy.com/meow-mix-original/dp/2345"
+
+
+def test_non_numeric_review_is_dropped(items):
+    assert items[2].review is None
+    assert items[2].delivery_price == "+$4.99 delivery"
+
+
+def test_image_priority(items):
+    # Base64 thumbnails win over encrypted-tbn URLs of sibling elements
+    assert items[0].image_url.startswith("data:image/webp;base64,")
+    assert items[1].image_url == "https://encrypted-tbn1.gstatic.com/shopping?q=tbn:ANd9GcQ2"
+    # Lazy loaded images only have a data-src
+    assert items[2].image_url == "https://encrypted-tbn2.gstatic.com/images?q=tbn:ANd9GcQ3"
+    assert items[3].image_url is None
+
+
+def test_max_items():
+    with open(FIXTURE, encoding="utf-8") as f:
+        html = f.read()
+    assert [item.title for item in parse_shopping_html(html, max_items=2)] == [
+        "Purina ONE Chicken & Rice Dry Cat Food, 16 lb",
+        "Meow Mix Original Choice",
+    ]
+
+
+def test_page_without_products():
+    assert parse_shopping_html("<html><body><div id='res'></div></body></html>") == []
+    # A title without a price is not a product card
+    assert parse_shopping_html("<div><div><div class='gkQHve SsM98d RmEs5b'>Cat food deals</div></div></div>") == []
+
+
+@pytest.mark.parametrize("query, filename", [
+    ("cat food", "shopping_results_cat_food.json"),
+    ("../../etc/passwd", "shopping_results_etc_passwd.json"),
+    ("a/b\\c", "shopping_results_a_b_c.json"),
+    ("..", "shopping_results_query.json"),
+])
+def test_results_filename_stays_in_the_working_directory(query, filename):
+    assert results_filename(query) == filename
+
+
+def test_parse_saved_pages(tmp_path, monkeypatch):
+    page = tmp_path / "debug_google_shopping_cat_food.html"
+    with open(FIXTURE, encoding="utf-8") as f:
+        page.write_text(f.read(), encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+
+    parse_saved_pages([str(page)], logging.getLogger(__name__))
+
+    with open(tmp_path / "shopping_results_cat_food.json", encoding="utf-8") as f:
+        results = json.load(f)
+    assert results["query"] == "cat food"
+    assert results["total_items"] == 4
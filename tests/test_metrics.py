@@ -0,0 +1,78 @@
+import pytest
+
+from google_shopping_scraper.metrics import METRIC_PREFIX, MetricsRegistry, PhaseTimings, percentile
+
+
+PHASE_METRIC = f"{METRIC_PREFIX}_phase_duration_seconds"
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    for seconds in (0.004, 0.05, 0.3, 100.0):
+        registry.observe("navigate", seconds)
+
+    lines = registry.render_prometheus().splitlines()
+
+    assert f'{PHASE_METRIC}_bucket{{phase="navigate",le="0.005"}} 1' in lines
+    # An observation on a bucket bound counts towards that bucket
+    assert f'{PHASE_METRIC}_bucket{{phase="navigate",le="0.05"}} 2' in lines
+    assert f'{PHASE_METRIC}_bucket{{phase="navigate",le="0.5"}} 3' in lines
+    assert f'{PHASE_METRIC}_bucket{{phase="navigate",le="60.0"}} 3' in lines
+    assert f'{PHASE_METRIC}_bucket{{phase="navigate",le="+Inf"}} 4' in lines
+    assert f'{PHASE_METRIC}_count{{phase="navigate"}} 4' in lines
+    assert any(line.startswith(f'{PHASE_METRIC}_sum{{phase="navigate"}} 100.35') for line in lines)
+
+
+def test_render_prometheus_format():
+    registry = MetricsRegistry()
+    registry.observe("query", 1.0)
+    registry.increment("retries")
+    registry.increment("items_found", 5)
+
+    text = registry.render_prometheus()
+
+    assert text.endswith("\n")
+    lines = text.splitlines()
+    assert lines[:2] == [
+        f"# HELP {PHASE_METRIC} Duration of scrape phases in seconds",
+        f"# TYPE {PHASE_METRIC} histogram",
+    ]
+    assert f"# TYPE {METRIC_PREFIX}_retries_total counter" in lines
+    assert f"{METRIC_PREFIX}_retries_total 1" in lines
+    assert f"{METRIC_PREFIX}_items_found_total 5" in lines
+    # Known counters are exported before their first event
+    assert f"{METRIC_PREFIX}_captcha_detections_total 0" in lines
+
+
+def test_reset():
+    registry = MetricsRegistry()
+    with registry.timed("query"):
+        pass
+    registry.increment("retries")
+
+    registry.reset()
+
+    text = registry.render_prometheus()
+    assert 'phase="query"' not in text
+    assert f"{METRIC_PREFIX}_retries_total 0" in text.splitlines()
+
+
+def test_phase_timings_summary():
+    timings = PhaseTimings()
+    timings.add("navigate", 1.0)
+    timings.add("navigate", 3.0)
+    timings.add("extract", 0.5)
+
+    assert timings.summary() == {
+        "navigate": {"count": 2, "total": 4.0, "max": 3.0},
+        "extract": {"count": 1, "total": 0.5, "max": 0.5},
+    }
+
+
+@pytest.mark.parametrize("fraction, expected", [(0.0, 1.0), (0.5, 5.0), (0.95, 10.0), (0.99, 10.0), (1.0, 10.0)])
+def test_nearest_rank_percentile(fraction, expected):
+    assert percentile([float(value) for value in range(1, 11)], fraction) == expected
+
+
+def test_percentile_of_no_values():
+    assert percentile([], 0.5) == 0.0
@@ -0,0 +1,136 @@
+import pytest
+
+from google_shopping_scraper import pacing
+from google_shopping_scraper.conf import google_shopping_scraper_settings
+from google_shopping_scraper.pacing import NORMAL_DELAYS, PACING_PROFILES, NavigationBudget, Pacer
+from google_shopping_scraper.scraper import GoogleShoppingScraper
+
+
+class FakeSleep:
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.sleeps = []
+
+    def time(self) -> float:
+        return self.now
+
+    monotonic = time
+
+    def __call__(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def sleep(monkeypatch):
+    sleep = FakeSleep()
+    monkeypatch.setattr(pacing.time, "time", sleep.time)
+    monkeypatch.setattr(pacing.time, "monotonic", sleep.monotonic)
+    return sleep
+
+
+def test_profiles_cover_every_delay_point():
+    for profile, delays in PACING_PROFILES.items():
+        assert set(delays) == set(NORMAL_DELAYS), profile
+    assert PACING_PROFILES["stealth"]["retry"] == (10.0, 20.0)
+    assert all(high == 0 for _, high in PACING_PROFILES["zero"].values())
+
+
+def test_unknown_profile():
+    with pytest.raises(ValueError):
+        Pacer("turbo")
+
+
+def test_pause_draws_within_the_range(sleep):
+    pacer = Pacer("normal", sleep=sleep)
+    for _ in range(50):
+        assert 0.3 <= pacer.pause("scroll_pause") <= 0.7
+    assert len(sleep.sleeps) == 50
+    assert pacer.total_slept == pytest.approx(sum(sleep.sleeps))
+
+
+def test_zero_profile_never_sleeps(sleep):
+    pacer = Pacer("zero", sleep=sleep)
+    assert pacer.pause("retry") == 0
+    assert pacer.wait_for_request_slot() == 0
+    assert sleep.sleeps == []
+
+
+def test_overrides(sleep):
+    pacer = Pacer("fast", overrides={"retry": (2.0, 2.0)}, sleep=sleep)
+    assert pacer.pause("retry") == 2.0
+    # Points without an override keep the delays of the profile
+    assert pacer.delays["request"] == pytest.approx((0.3, 0.9))
+
+
+def test_wait_for_request_slot_keeps_the_minimum_interval(sleep):
+    pacer = Pacer("normal", overrides={"request": (0.0, 0.0), "min_request_interval": (5.0, 5.0)}, sleep=sleep)
+
+    # No previous query to keep a distance to
+    assert pacer.wait_for_request_slot() == 0
+    sleep.now += 2.0
+    assert pacer.wait_for_request_slot() == pytest.approx(3.0)
+    sleep.now += 10.0
+    assert pacer.wait_for_request_slot() == 0
+    assert sleep.sleeps == [pytest.approx(3.0)]
+
+
+def test_disabled_navigation_budget(sleep):
+    budget = NavigationBudget(rate=0, sleep=sleep)
+    assert not budget.enabled
+    assert [budget.acquire() for _ in range(10)] == [0.0] * 10
+    assert sleep.sleeps == []
+
+
+def test_navigation_budget_allows_bursts(sleep):
+    budget = NavigationBudget(rate=2, burst=3, sleep=sleep)
+
+    assert [budget.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    # Then one navigation every 1 / rate seconds
+    assert budget.acquire() == pytest.approx(0.5)
+    assert budget.acquire() == pytest.approx(0.5)
+
+
+def test_navigation_budget_refills_up_to_the_burst(sleep):
+    budget = NavigationBudget(rate=1, burst=2, sleep=sleep)
+    budget.acquire()
+    budget.acquire()
+
+    sleep.now += 60
+    assert [budget.acquire() for _ in range(2)] == [0.0, 0.0]
+    assert budget.acquire() == pytest.approx(1.0)
+
+
+def test_navigation_budget_reserves_slots_in_arrival_order(sleep):
+    # Waiters reserve their slot before sleeping, so concurrent callers queue up behind each other
+    budget = NavigationBudget(rate=4, burst=1, sleep=lambda seconds: None)
+    waits = [budget.acquire() for _ in range(4)]
+    assert waits == [0.0, pytest.approx(0.25), pytest.approx(0.5), pytest.approx(0.75)]
+
+
+def test_switching_profiles_keeps_the_minimum_interval(sleep):
+    pacer = Pacer("normal", overrides={"request": (0.0, 0.0)}, sleep=sleep)
+    pacer.wait_for_request_slot()
+    sleep.now += 0.2
+
+    pacer.use_profile("fast", overrides={"request": (0.0, 0.0)})
+
+    assert pacer.profile == "fast"
+    # The fast profile still keeps half a second since the query before the switch
+    assert pacer.wait_for_request_slot() == pytest.approx(0.3)
+
+
+def test_fast_mode_switches_the_pacing_profile_of_a_session(monkeypatch):
+    monkeypatch.setattr(google_shopping_scraper_settings, "pacing_profile", "normal")
+    scraper = GoogleShoppingScraper()
+    pacer = scraper.pacer
+    pacer._last_request_time = 1234.0
+
+    scraper.fast_mode = True
+    scraper.fast_mode = True
+
+    assert scraper.pacer is pacer
+    assert pacer.profile == "fast"
+    assert pacer._last_request_time == 1234.0
+    scraper.fast_mode = False
+    assert pacer.profile == "normal"
@@ -0,0 +1,153 @@
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api
+from google_shopping_scraper.conf import google_shopping_scraper_settings
+from google_shopping_scraper.consent import ConsentStore, consent_store
+from google_shopping_scraper.pool import BrowserPool, BrowserPoolClosedError
+from google_shopping_scraper.scraper import GoogleShoppingScraper
+
+from fakes import CONSENT_PAGE, shopping_page
+
+
+CONSENT_COOKIES = [
+    {"name": "SOCS", "value": "CAISHAgB", "domain": ".google.com", "path": "/", "secure": True},
+    {"name": "NID", "value": "511=tracking", "domain": ".google.com", "path": "/"},
+]
+CONSENT_KEY = ConsentStore.make_key(google_shopping_scraper_settings.region, None)
+
+
+@pytest.fixture
+def drivers(fake_browsers):
+    return fake_browsers(lambda url: CONSENT_PAGE, consent_cookies=CONSENT_COOKIES)
+
+
+@pytest.fixture(autouse=True)
+def zero_pacing(monkeypatch):
+    monkeypatch.setattr(google_shopping_scraper_settings, "pacing_profile", "zero")
+
+
+def test_pool_sessions_are_consent_ready(drivers):
+    pool = BrowserPool(min_size=2, max_size=2)
+    pool.start()
+    try:
+        # The first session accepts the consent form once and stores its consent cookie
+        assert drivers[0].clicks == 1
+        assert [url for _, url in drivers[0].navigations] == [google_shopping_scraper_settings.get_shopping_url("")]
+        assert [cookie["name"] for cookie in consent_store.get(CONSENT_KEY)] == ["SOCS"]
+        # Later sessions restore it without loading a page
+        assert drivers[1].clicks == 0
+        assert drivers[1].navigations == []
+        assert [cookie["name"] for cookie in drivers[1].cookies] == ["SOCS"]
+        assert pool.stats()["idle"] == 2
+    finally:
+        pool.close()
+    assert all(driver.quit_called for driver in drivers)
+
+
+def test_warm_up_survives_a_blocked_consent_page(fake_browsers):
+    drivers = fake_browsers(lambda url: "<html><body><form id='captcha-form'></form></body></html>")
+    scraper = GoogleShoppingScraper(keep_browser_open=True)
+
+    scraper.warm_up()
+
+    assert scraper.is_browser_alive()
+    assert drivers[0].clicks == 0
+    assert consent_store.get(CONSENT_KEY) is None
+
+
+def test_warm_up_requires_a_persistent_browser():
+    with pytest.raises(ValueError):
+        GoogleShoppingScraper().warm_up()
+
+
+def test_checkout_from_closed_pool():
+    pool = BrowserPool(min_size=0, max_size=1)
+    pool.close()
+    with pytest.raises(BrowserPoolClosedError):
+        pool.checkout()
+
+
+def test_api_scrapes_on_the_pool_by_default(monkeypatch):
+    # A pool closed while the API shuts down
+    pool = BrowserPool(min_size=0, max_size=1)
+    pool.close()
+    monkeypatch.setattr(api, "_browser_pool", pool)
+
+    response = TestClient(api.app).get("/scrape", params={"query": "cat food", "use_cache": False})
+
+    assert response.status_code == 503
+    assert response.json()["detail"] == BrowserPoolClosedError.message
+
+
+def test_health_check_replaces_crashed_idle_sessions(drivers):
+    pool = BrowserPool(min_size=2, max_size=2)
+    pool.start()
+    try:
+        drivers[0].crashed = True
+
+        assert pool.health_check() == 1
+
+        assert drivers[0].quit_called
+        assert len(drivers) == 3
+        assert pool.stats()["idle"] == 2
+    finally:
+        pool.close()
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_api_replaces_crashed_idle_sessions_in_the_background(drivers, monkeypatch):
+    monkeypatch.setattr(google_shopping_scraper_settings, "pool_min_size", 1)
+    monkeypatch.setattr(google_shopping_scraper_settings, "pool_health_check_interval", 0.05)
+
+    with TestClient(api.app):
+        wait_until(lambda: api._browser_pool is not None and api._browser_pool.stats()["idle"] == 1)
+        drivers[0].crashed = True
+
+        wait_until(lambda: len(drivers) == 2 and api._browser_pool.stats()["idle"] == 1)
+        assert drivers[0].quit_called
+
+    assert api._pool_health_checks is None
+    assert drivers[1].quit_called
+
+
+def test_concurrent_workers_create_one_pool(monkeypatch):
+    created = []
+
+    class SlowPool:
+        def __init__(self, logger=None):
+            created.append(self)
+            time.sleep(0.05)
+
+    monkeypatch.setattr(api, "BrowserPool", SlowPool)
+    monkeypatch.setattr(api, "_browser_pool", None)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        pools = list(executor.map(lambda _: api.get_browser_pool(), range(4)))
+
+    assert len(created) == 1
+    assert all(pool is created[0] for pool in pools)
+
+
+def test_headed_requests_do_not_use_the_pool(fake_browsers, monkeypatch):
+    drivers = fake_browsers(lambda url: shopping_page(["Purina ONE"]))
+    pool = BrowserPool(min_size=0, max_size=1)
+    pool.close()
+    monkeypatch.setattr(api, "_browser_pool", pool)
+
+    response = TestClient(api.app).get("/scrape", params={"query": "cat food", "headless": False, "use_cache": False})
+
+    # A closed pool would reject the scrape, so it ran on a browser of its own
+    assert response.status_code == 200
+    assert [item["title"] for item in response.json()["items"]] == ["Purina ONE"]
+    assert len(drivers) == 1 and drivers[0].quit_called
@@ -0,0 +1,125 @@
+import json
+import sys
+
+import pytest
+
+import scrape_to_json
+from google_shopping_scraper.models import ShoppingItem
+from google_shopping_scraper.pool import BrowserPoolTimeoutError
+from google_shopping_scraper.scraper import BlockedPageError
+from scrape_to_json import load_queries, scrape_in_batch_worker
+
+
+ITEM = ShoppingItem(price="$9.99", delivery_price="N/A", title="Cat food", review=None, url="N/A", image_url=None, saved_image_path=None)
+
+
+class StubScraper:
+    def __init__(self, outcome) -> None:
+        self.outcome = outcome
+        self.calls = []
+
+    def get_shopping_data_for_query(self, query, **options):
+        self.calls.append((query, options))
+        if isinstance(self.outcome, list):
+            return self.outcome
+        raise self.outcome
+
+
+@pytest.fixture
+def worker(monkeypatch):
+    def install(outcome):
+        scraper = StubScraper(outcome)
+        monkeypatch.setattr(scrape_to_json, "_worker_scraper", scraper)
+        monkeypatch.setattr(scrape_to_json, "_worker_options", {"headless": True, "max_items": 5})
+        return scraper
+
+    return install
+
+
+def test_load_plain_text_queries(tmp_path):
+    path = tmp_path / "queries.txt"
+    path.write_text("cat food\n\n# comment\n  dog toys  \n", encoding="utf-8")
+    assert load_queries(path) == ["cat food", "dog toys"]
+
+
+def test_load_jsonl_queries(tmp_path):
+    path = tmp_path / "queries.jsonl"
+    path.write_text('{"query": "cat food"}\n{"title": "Dog Toys", "id": 7}\nbird seed\n', encoding="utf-8")
+    assert load_queries(path) == ["cat food", "Dog Toys", "bird seed"]
+
+
+def test_jsonl_line_without_query(tmp_path):
+    path = tmp_path / "queries.jsonl"
+    path.write_text('{"query": "cat food"}\n{"id": 7}\n', encoding="utf-8")
+    with pytest.raises(ValueError, match="queries.jsonl:2"):
+        load_queries(path)
+
+
+def test_worker_record(worker):
+    scraper = worker([ITEM])
+
+    record = scrape_in_batch_worker("cat food")
+
+    assert scraper.calls == [("cat food", {"headless": True, "max_items": 5})]
+    assert record["query"] == "cat food"
+    assert record["error"] is None
+    assert record["total_items"] == 1
+    assert record["items"][0]["title"] == "Cat food"
+    json.dumps(record)
+
+
+@pytest.mark.parametrize("error, message", [
+    (BlockedPageError, BlockedPageError.message),
+    # Errors of the package derive from BaseException, not only the ones the worker names
+    (BrowserPoolTimeoutError, BrowserPoolTimeoutError.message),
+    (RuntimeError("chrome crashed"), "chrome crashed"),
+    (RuntimeError(), "RuntimeError"),
+])
+def test_worker_error_record(worker, error, message):
+    worker(error)
+
+    record = scrape_in_batch_worker("cat food")
+
+    assert record["error"] == message
+    assert record["total_items"] == 0
+    assert record["items"] == []
+
+
+def test_worker_does_not_swallow_interrupts(worker):
+    worker(KeyboardInterrupt)
+    with pytest.raises(KeyboardInterrupt):
+        scrape_in_batch_worker("cat food")
+
+
+class ClosableStubScraper(StubScraper):
+    closed = False
+
+    def close_browser(self) -> None:
+        self.closed = True
+
+
+def run_cli(monkeypatch, scraper, *argv):
+    monkeypatch.setattr(sys, "argv", ["scrape_to_json.py", *argv])
+    monkeypatch.setattr(scrape_to_json, "GoogleShoppingScraper", scraper if callable(scraper) else lambda **options: scraper)
+    scrape_to_json.main()
+
+
+def test_cli_reports_scraper_errors(monkeypatch, caplog):
+    scraper = ClosableStubScraper(BlockedPageError())
+    with pytest.raises(SystemExit) as exit_info:
+        run_cli(monkeypatch, scraper, "cat food")
+
+    assert exit_info.value.code == 1
+    assert f"Error during scraping: {BlockedPageError.message}" in caplog.text
+    assert scraper.closed
+
+
+def test_cli_reports_invalid_scraper_options(monkeypatch, caplog):
+    def invalid_options(**options):
+        raise ValueError("Unknown extraction mode 'regex'")
+
+    with pytest.raises(SystemExit) as exit_info:
+        run_cli(monkeypatch, invalid_options, "cat food")
+
+    assert exit_info.value.code == 1
+    assert "Error during scraping: Unknown extraction mode 'regex'" in caplog.text
@@ -0,0 +1,311 @@
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from google_shopping_scraper.conf import google_shopping_scraper_settings
+from google_shopping_scraper.readiness import READY_BLOCKED, READY_PRODUCTS, READY_TIMEOUT
+from google_shopping_scraper.scraper import DriverGetShoppingDataError, GoogleShoppingScraper
+
+from fakes import FakeDriver, shopping_page
+
+
+TITLES = [f"Cat food {i}" for i in range(8)]
+
+
+@pytest.fixture(autouse=True)
+def zero_pacing(monkeypatch):
+    monkeypatch.setattr(google_shopping_scraper_settings, "pacing_profile", "zero")
+
+
+def test_retry_streams_only_the_items_of_the_successful_attempt(fake_browsers):
+    # The first browser gets an empty results page, the retry a full one
+    drivers = fake_browsers(lambda url: shopping_page(TITLES if len(drivers) > 1 else []))
+    streamed = []
+
+    items = GoogleShoppingScraper().get_shopping_data_for_query("cat food", max_retries=3, on_item=streamed.append, max_items=3, max_pages=1)
+
+    assert len(drivers) == 2
+    assert [item.title for item in items] == TITLES[:3]
+    assert streamed == items
+
+
+def test_failure_after_streaming_items_is_not_retried(fake_browsers, monkeypatch):
+    drivers = fake_browsers(lambda url: shopping_page(TITLES))
+    iter_items = GoogleShoppingScraper._iter_items_for_query
+
+    def failing_iter_items(self, *args, **kwargs):
+        yield from iter_items(self, *args, **kwargs)
+        raise RuntimeError("renderer crashed")
+
+    monkeypatch.setattr(GoogleShoppingScraper, "_iter_items_for_query", failing_iter_items)
+    streamed = []
+
+    with pytest.raises(DriverGetShoppingDataError):
+        GoogleShoppingScraper().get_shopping_data_for_query("cat food", max_retries=3, on_item=streamed.append, max_items=3, max_pages=1)
+
+    # Items already handed out are not streamed again by another attempt
+    assert len(drivers) == 1
+    assert [item.title for item in streamed] == TITLES[:3]
+
+
+@pytest.mark.parametrize("page, signal", [
+    (shopping_page(TITLES), READY_PRODUCTS),
+    ("<html><body><form id='captcha-form'></form></body></html>", READY_BLOCKED),
+    # The search header carries tracking ids long before the first product renders
+    ("<html><body><div data-hveid='CAEQAA'>Shopping</div><div data-hveid='CAIQAA'>Filters</div></body></html>", READY_TIMEOUT),
+])
+def test_readiness_signal(page, signal):
+    driver = FakeDriver(lambda url: page)
+    driver.get("https://www.google.com/search?tbm=shop&q=cat+food")
+    assert GoogleShoppingScraper()._wait_for_readiness(driver, timeout=0.3) == signal
+
+
+def query_pages(url):
+    """Results pages whose product titles name the query they were loaded for"""
+    query = parse_qs(urlparse(url).query).get("q", [""])[0]
+    return shopping_page([f"{query} {i}" for i in range(3)])
+
+
+@pytest.mark.parametrize("navigation_delay", [0, 6])
+def test_refilled_tab_delivers_the_items_of_its_new_query(fake_browsers, navigation_delay):
+    # Script navigations commit a few round trips late, like in Chrome
+    drivers = fake_browsers(query_pages, navigation_delay=navigation_delay)
+    queries = ["cat food", "dog toys", "bird seed"]
+
+    results = GoogleShoppingScraper().get_shopping_data_for_queries(queries, pipeline_depth=1, max_items=3)
+
+    for query in queries:
+        assert [item.title for item in results[query]] == [f"{query} {i}" for i in range(3)]
+    # A single tab was refilled with every query
+    assert list(drivers[0].tabs) == ["main"]
+
+
+def paginated_pages(total):
+    """Results pages of results_page_size products from the start= offset, until total products ran out"""
+    def pages(url):
+        params = parse_qs(urlparse(url).query)
+        start = int(params.get("start", ["0"])[0])
+        end = min(start + google_shopping_scraper_settings.results_page_size, total)
+        return shopping_page([f"Cat food {i}" for i in range(start, end)])
+
+    return pages
+
+
+@pytest.fixture
+def small_pages(monkeypatch):
+    monkeypatch.setattr(google_shopping_scraper_settings, "results_page_size", 4)
+
+
+def loaded_starts(driver):
+    return [parse_qs(urlparse(url).query).get("start", ["0"])[0] for _, url in driver.navigations if url != "about:blank"]
+
+
+@pytest.mark.parametrize("deep_fetch", [False, True])
+def test_max_items_follows_start_pagination(fake_browsers, small_pages, deep_fetch):
+    drivers = fake_browsers(paginated_pages(total=20))
+
+    items = GoogleShoppingScraper().get_shopping_data_for_query("cat food", max_items=10, max_pages=5, deep_fetch=deep_fetch)
+
+    assert [item.title for item in items] == [f"Cat food {i}" for i in range(10)]
+    assert sorted(loaded_starts(drivers[0])) == ["0", "4", "8"]
+
+
+def test_max_pages_caps_pagination(fake_browsers, small_pages):
+    drivers = fake_browsers(paginated_pages(total=20))
+
+    items = GoogleShoppingScraper().get_shopping_data_for_query("cat food", max_items=10, max_pages=2)
+
+    assert len(items) == 8
+    assert loaded_starts(drivers[0]) == ["0", "4"]
+
+
+def test_pagination_stops_when_the_results_run_out(fake_browsers, small_pages):
+    drivers = fake_browsers(paginated_pages(total=6))
+
+    items = GoogleShoppingScraper().get_shopping_data_for_query("cat food", max_items=20, max_pages=5)
+
+    assert len(items) == 6
+    assert loaded_starts(drivers[0]) == ["0", "4", "8"]
+
+
+def test_products_repeated_on_a_later_page_are_skipped(fake_browsers, small_pages):
+    # Every page shows the same products
+    fake_browsers(lambda url: shopping_page([f"Cat food {i}" for i in range(4)]))
+
+    items = GoogleShoppingScraper().get_shopping_data_for_query("cat food", max_items=10, max_pages=3)
+
+    assert [item.title for item in items] == [f"Cat food {i}" for i in range(4)]
+
+
+@pytest.mark.parametrize("limits", [{"max_items": 0}, {"max_pages": 0}])
+def test_invalid_result_limits(limits):
+    with pytest.raises(ValueError):
+        GoogleShoppingScraper().get_shopping_data_for_query("cat food", **limits)
+
+
+@pytest.mark.parametrize("limits", [{"max_items": 0}, {"pipeline_depth": 0}])
+def test_invalid_pipeline_limits(limits):
+    # Zero is rejected rather than replaced by the default
+    with pytest.raises(ValueError):
+        GoogleShoppingScraper().get_shopping_data_for_queries(["cat food"], **limits)
+
+
+def test_second_scroll_pass_over_known_cards_costs_one_round_trip():
+    driver = FakeDriver(lambda url: shopping_page(TITLES))
+    driver.get("https://www.google.com/search?tbm=shop&q=cat+food")
+    scraper = GoogleShoppingScraper(extraction_mode="webdriver")
+    item_data, seen, visited = [], set(), set()
+
+    first = list(scraper._extract_visible_items_with_webdriver(driver, item_data, seen, visited, max_items=len(TITLES)))
+    calls = driver.calls
+    # Nothing new rendered since the first pass
+    item_data.clear()
+    second = list(scraper._extract_visible_items_with_webdriver(driver, item_data, seen, visited, max_items=len(TITLES)))
+
+    assert [item.title for item in first] == TITLES
+    assert second == []
+    assert driver.calls - calls == 1
+
+
+def docid_pages(url):
+    """The same products on every results page, with their docid on the card but a page-specific link"""
+    start = parse_qs(urlparse(url).query).get("start", ["0"])[0]
+    cards = "".join(
+        f'<div data-docid="{i}"><a href="https://www.chewy.com/p/{i}?page={start}">'
+        f'<div class="gkQHve SsM98d RmEs5b">Cat food {i}</div></a><span class="lmQWe">$9.99</span></div>'
+        for i in range(4)
+    )
+    return f"<html><body><div class='sh-dgr__content'>{cards}</div></body></html>"
+
+
+@pytest.mark.parametrize("extraction_mode", ["webdriver", "javascript", "html"])
+def test_products_are_deduplicated_by_card_docid_across_pages(fake_browsers, small_pages, extraction_mode):
+    fake_browsers(docid_pages)
+
+    items = GoogleShoppingScraper(extraction_mode=extraction_mode).get_shopping_data_for_query("cat food", max_items=10, max_pages=3)
+
+    assert [item.title for item in items] == [f"Cat food {i}" for i in range(4)]
+    assert [item.docid for item in items] == ["0", "1", "2", "3"]
+
+
+class StabilityDriver(FakeDriver):
+    """A FakeDriver whose stability script returns a fixed result, or raises it if it is an exception"""
+
+    def __init__(self, page, result) -> None:
+        super().__init__(lambda url: page)
+        self.result = result
+        self.get("https://www.google.com/search?tbm=shop&q=cat+food")
+        self.calls = 0
+
+    def execute_async_script(self, script, *args):
+        self._command()
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+def test_dom_quiet_result():
+    result = {"stable": True, "waited_ms": 150, "mutations": 3, "count": 8}
+    driver = StabilityDriver(shopping_page(TITLES), result)
+    assert GoogleShoppingScraper()._wait_for_dom_quiet(driver, ".gkQHve", 3) == result
+
+
+@pytest.mark.parametrize("result", ["not a dict", None, RuntimeError("javascript error")])
+def test_dom_quiet_without_observer(result):
+    driver = StabilityDriver(shopping_page(TITLES), result)
+    assert GoogleShoppingScraper()._wait_for_dom_quiet(driver, ".gkQHve", 3) is None
+
+
+def test_stable_products_end_the_stability_check():
+    driver = StabilityDriver(shopping_page(TITLES), {"stable": True, "waited_ms": 150, "mutations": 0, "count": 8})
+    GoogleShoppingScraper()._quick_stability_check(driver)
+    assert driver.calls == 1
+
+
+@pytest.mark.parametrize("result", [
+    RuntimeError("javascript error"),
+    # No product node exists yet, even though the page went quiet
+    {"stable": False, "waited_ms": 3000, "mutations": 0, "count": 0},
+    {"stable": True, "waited_ms": 150, "mutations": 0, "count": 0},
+])
+def test_stability_check_falls_back_to_polling_the_product_count(result):
+    driver = StabilityDriver(shopping_page(TITLES), result)
+    GoogleShoppingScraper()._quick_stability_check(driver)
+    # The observer, then two product counts that agree
+    assert driver.calls == 3
+
+
+def context_commands(driver):
+    return [cmd.removeprefix("Target.") for cmd in driver.cdp_commands if cmd.endswith("BrowserContext")]
+
+
+def navigated_contexts(driver):
+    """Browser contexts of the tabs of every navigation, in order"""
+    return [handle.split("/")[0] if "/" in handle else None for handle, _ in driver.navigations]
+
+
+@pytest.fixture
+def context_isolation(monkeypatch):
+    monkeypatch.setattr(google_shopping_scraper_settings, "isolation_mode", "context")
+
+
+def test_every_query_runs_in_its_own_browser_context(fake_browsers, context_isolation):
+    drivers = fake_browsers(lambda url: shopping_page(TITLES))
+    scraper = GoogleShoppingScraper(keep_browser_open=True)
+
+    for query in ["cat food", "dog food"]:
+        assert len(scraper.get_shopping_data_for_query(query, max_items=3, max_pages=1)) == 3
+
+    driver = drivers[0]
+    assert context_commands(driver) == ["createBrowserContext", "disposeBrowserContext"] * 2
+    assert driver.browser_contexts == []
+    # Every query navigated in a tab of its context, which was closed with it
+    assert navigated_contexts(driver) == ["context-1", "context-3"]
+    assert driver.window_handles == ["main"] and driver.current_window_handle == "main"
+
+
+def test_browser_context_is_disposed_when_extraction_fails(fake_browsers, context_isolation, monkeypatch):
+    drivers = fake_browsers(lambda url: shopping_page(TITLES))
+
+    def failing_result_pages(self, *args):
+        raise RuntimeError("renderer crashed")
+        yield
+
+    monkeypatch.setattr(GoogleShoppingScraper, "_iter_result_pages", failing_result_pages)
+
+    with pytest.raises(DriverGetShoppingDataError):
+        GoogleShoppingScraper(keep_browser_open=True).get_shopping_data_for_query("cat food", max_retries=2)
+
+    driver = drivers[0]
+    assert context_commands(driver) == ["createBrowserContext", "disposeBrowserContext"] * 2
+    assert driver.browser_contexts == []
+    assert driver.current_window_handle == "main"
+
+
+def test_batches_on_a_reused_browser_run_in_their_own_browser_context(fake_browsers, context_isolation):
+    drivers = fake_browsers(query_pages)
+    scraper = GoogleShoppingScraper(keep_browser_open=True)
+    batches = [["cat food", "dog toys", "bird seed"], ["fish food", "hamster bedding"]]
+
+    for queries in batches:
+        results = scraper.get_shopping_data_for_queries(queries, pipeline_depth=2, max_items=3)
+        assert all(len(results[query]) == 3 for query in queries)
+
+    driver = drivers[0]
+    assert context_commands(driver) == ["createBrowserContext", "disposeBrowserContext"] * 2
+    assert driver.browser_contexts == []
+    # The pipeline tabs of a batch were opened in its context
+    contexts = navigated_contexts(driver)
+    assert None not in contexts and len(set(contexts)) == 2
+    assert driver.window_handles == ["main"]
+
+
+def test_batches_on_a_reused_browser_start_from_wiped_cookies(fake_browsers):
+    drivers = fake_browsers(query_pages)
+    scraper = GoogleShoppingScraper(keep_browser_open=True)
+    scraper.get_shopping_data_for_queries(["cat food"], max_items=3)
+    drivers[0].cookies.append({"name": "tracking", "value": "1", "domain": ".google.com"})
+
+    scraper.get_shopping_data_for_queries(["dog toys", "bird seed"], max_items=3)
+
+    assert "tracking" not in [cookie["name"] for cookie in drivers[0].cookies]
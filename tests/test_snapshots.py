@@ -0,0 +1,107 @@
+import os
+import threading
+
+from google_shopping_scraper.snapshots import SNAPSHOT_PREFIX, SnapshotWriter
+
+
+def snapshot_files(directory):
+    return sorted(name for name in os.listdir(directory) if name.startswith(SNAPSHOT_PREFIX))
+
+
+def test_snapshots_are_written_in_the_background(tmp_path):
+    writer = SnapshotWriter(str(tmp_path), max_bytes=1024)
+
+    assert writer.submit("cat food", "<html>cat</html>")
+    writer.flush()
+
+    with open(tmp_path / "debug_google_shopping_cat_food.html", encoding="utf-8") as f:
+        assert f.read() == "<html>cat</html>"
+    assert writer.written == 1
+
+
+def test_oldest_snapshots_are_deleted_beyond_the_quota(tmp_path):
+    writer = SnapshotWriter(str(tmp_path), max_bytes=25)
+
+    for mtime, query in enumerate(["a", "b", "c"]):
+        writer.submit(query, "x" * 10)
+        writer.flush()
+        # Distinct modification times so that eviction order is deterministic
+        os.utime(tmp_path / f"{SNAPSHOT_PREFIX}{query}.html", (mtime, mtime))
+
+    assert snapshot_files(tmp_path) == [f"{SNAPSHOT_PREFIX}b.html", f"{SNAPSHOT_PREFIX}c.html"]
+
+
+def test_existing_snapshots_count_towards_the_quota(tmp_path):
+    old = tmp_path / f"{SNAPSHOT_PREFIX}old.html"
+    old.write_text("x" * 20)
+    os.utime(old, (0, 0))
+
+    writer = SnapshotWriter(str(tmp_path), max_bytes=25)
+    writer.submit("new", "x" * 10)
+    writer.flush()
+
+    assert snapshot_files(tmp_path) == [f"{SNAPSHOT_PREFIX}new.html"]
+
+
+def test_overwriting_a_snapshot_does_not_evict_others(tmp_path):
+    writer = SnapshotWriter(str(tmp_path), max_bytes=25)
+    writer.submit("a", "x" * 10)
+    writer.submit("b", "x" * 10)
+    writer.submit("b", "y" * 10)
+    writer.flush()
+
+    assert snapshot_files(tmp_path) == [f"{SNAPSHOT_PREFIX}a.html", f"{SNAPSHOT_PREFIX}b.html"]
+
+
+def test_snapshot_larger_than_the_quota_is_skipped(tmp_path):
+    writer = SnapshotWriter(str(tmp_path), max_bytes=5)
+    writer.submit("big", "x" * 10)
+    writer.flush()
+
+    assert snapshot_files(tmp_path) == []
+    assert writer.dropped == 1
+
+
+def test_full_queue_drops_snapshots_without_blocking(tmp_path):
+    writer = SnapshotWriter(str(tmp_path), max_bytes=1024, max_pending=1)
+    writing, release = threading.Event(), threading.Event()
+    write = writer._write
+
+    def slow_write(path, html):
+        writing.set()
+        release.wait()
+        write(path, html)
+
+    writer._write = slow_write
+    assert writer.submit("a", "x")
+    assert writing.wait(timeout=5)
+
+    # The writer thread is busy with the first snapshot, so the queue holds only one more
+    assert writer.submit("b", "x")
+    assert not writer.submit("c", "x")
+    assert writer.dropped == 1
+
+    release.set()
+    writer.flush()
+    assert snapshot_files(tmp_path) == [f"{SNAPSHOT_PREFIX}a.html", f"{SNAPSHOT_PREFIX}b.html"]
+
+
+def test_sampling(tmp_path):
+    writer = SnapshotWriter(str(tmp_path), max_bytes=1024, sample_rate=0.0)
+    assert not writer.should_capture()
+    assert writer.should_capture(force=True)
+
+
+def test_snapshots_stay_in_their_directory(tmp_path):
+    directory = tmp_path / "debug"
+    writer = SnapshotWriter(str(directory), max_bytes=1024)
+
+    for query in ["../cat/food", "c:\\dog food", ".."]:
+        writer.submit(query, "<html></html>")
+    writer.flush()
+
+    assert writer.written == 3
+    assert snapshot_files(directory) == [
+        f"{SNAPSHOT_PREFIX}c_dog_food.html", f"{SNAPSHOT_PREFIX}cat_food.html", f"{SNAPSHOT_PREFIX}query.html",
+    ]
+    assert os.listdir(tmp_path) == ["debug"]
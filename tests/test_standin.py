@@ -0,0 +1,49 @@
+import re
+from urllib.request import Request, urlopen
+
+import pytest
+
+from google_shopping_scraper.standin import CONSENT_COOKIE, StandInServer
+
+
+TITLE_PATTERN = re.compile(r'class=\\"gkQHve SsM98d RmEs5b\\">([^<]+)<')
+
+
+@pytest.fixture
+def standin():
+    server = StandInServer(latency=0, jitter=0, render_delay=0, consent_rate=0, seed=7, results_per_page=20, total_results=50).start()
+    yield server
+    server.stop()
+
+
+def fetch(url):
+    request = Request(url, headers={"Cookie": f"{CONSENT_COOKIE}=accepted"})
+    with urlopen(request) as response:
+        return response.read().decode("utf-8")
+
+
+def titles(page):
+    return TITLE_PATTERN.findall(page)
+
+
+def test_results_pages_follow_start(standin):
+    first = titles(fetch(f"{standin.url}&q=cat+food"))
+    second = titles(fetch(f"{standin.url}&q=cat+food&start=20"))
+    last = titles(fetch(f"{standin.url}&q=cat+food&start=40"))
+
+    assert [title.rsplit(" ", 1)[1] for title in first] == [str(i) for i in range(1, 21)]
+    assert [title.rsplit(" ", 1)[1] for title in second] == [str(i) for i in range(21, 41)]
+    # The results of a query run out after total_results products
+    assert [title.rsplit(" ", 1)[1] for title in last] == [str(i) for i in range(41, 51)]
+    assert titles(fetch(f"{standin.url}&q=cat+food&start=60")) == []
+
+
+def test_results_pages_are_stable(standin):
+    assert standin._products("cat food", 20) == standin._products("cat food", 20)
+    first_ids = {product["product_id"] for product in standin._products("cat food")}
+    second_ids = {product["product_id"] for product in standin._products("cat food", 20)}
+    assert not first_ids & second_ids
+
+
+def test_invalid_start_serves_the_first_page(standin):
+    assert titles(fetch(f"{standin.url}&q=cat+food&start=abc")) == titles(fetch(f"{standin.url}&q=cat+food"))
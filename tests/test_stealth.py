@@ -0,0 +1,70 @@
+import pytest
+
+from google_shopping_scraper.conf import google_shopping_scraper_settings
+from google_shopping_scraper.scraper import GoogleShoppingScraper
+from google_shopping_scraper.stealth import STEALTH_PATCHES, build_stealth_script
+
+
+class CdpDriver:
+    def __init__(self, cdp_error: Exception | None = None) -> None:
+        self.cdp_error = cdp_error
+        self.cdp_commands = []
+        self.scripts = []
+
+    def execute_cdp_cmd(self, cmd, params):
+        if self.cdp_error:
+            raise self.cdp_error
+        self.cdp_commands.append((cmd, params))
+        return {}
+
+    def execute_script(self, script, *args):
+        self.scripts.append(script)
+
+
+@pytest.fixture
+def stealth_profile(monkeypatch):
+    def set_profile(profile):
+        monkeypatch.setattr(google_shopping_scraper_settings, "stealth_profile", profile)
+    return set_profile
+
+
+def test_profiles():
+    assert build_stealth_script("off") == ""
+    assert build_stealth_script("minimal") == f"try {{ {STEALTH_PATCHES['webdriver']} }} catch (e) {{}}"
+    standard = build_stealth_script("standard")
+    assert all(patch in standard for patch in STEALTH_PATCHES.values())
+    # Every patch is wrapped on its own
+    assert standard.count("try {") == len(STEALTH_PATCHES)
+
+
+def test_unknown_profile():
+    with pytest.raises(ValueError, match="Unknown stealth profile"):
+        build_stealth_script("paranoid")
+
+
+def test_script_is_registered_once_for_every_new_document(stealth_profile):
+    stealth_profile("standard")
+    driver = CdpDriver()
+
+    GoogleShoppingScraper()._inject_stealth_script(driver)
+
+    assert driver.cdp_commands == [("Page.addScriptToEvaluateOnNewDocument", {"source": build_stealth_script("standard")})]
+    assert driver.scripts == []
+
+
+def test_current_page_is_patched_without_cdp(stealth_profile):
+    stealth_profile("minimal")
+    driver = CdpDriver(cdp_error=RuntimeError("CDP not supported"))
+
+    GoogleShoppingScraper()._inject_stealth_script(driver)
+
+    assert driver.scripts == [build_stealth_script("minimal")]
+
+
+def test_nothing_is_injected_when_off(stealth_profile):
+    stealth_profile("off")
+    driver = CdpDriver()
+
+    GoogleShoppingScraper()._inject_stealth_script(driver)
+
+    assert driver.cdp_commands == [] and driver.scripts == []